@@ -34,6 +34,10 @@ class AbstactButton(Clickable, TooltipOwner):
                 return True
         return False
 
+    def getDrawBounds(self) -> tuple:
+        x, y = self.position
+        return x - self.margin, y - self.margin, x + self.imageWidth + self.margin, y + self.imageHeight + self.margin
+
     # Get the image surface to draw it
     @abstractmethod
     def getImage(self) -> pygame.Surface:
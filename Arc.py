@@ -1,22 +1,32 @@
 from SingletonState.ReferenceFrame import PointRef, Ref, ScalarRef
 from dataclasses import dataclass
 import Utility, math
+import numpy as np
 
+# Utility approximates pi as 3.1415, so the batch kernels wrap angles the same way to stay consistent with Arc
+TWO_PI = 3.1415 * 2
+
+# The fields have no class defaults, which __slots__ can't have, so __init__ sets all of them
 @dataclass
 class Arc:
-    fro: PointRef = None
-    to: PointRef = None
-    center: PointRef = None
-    theta1: float = None
-    theta2: float = None
-    radius: ScalarRef = None
-    heading1: float = None
-    heading2: float = None
-    parity: bool = None
-    isStraight: bool = None
-    arcLengthField: float = None
+    __slots__ = ("fro", "to", "center", "theta1", "theta2", "radius", "heading1", "heading2", "parity", "isStraight", "arcLengthField")
+
+    fro: PointRef
+    to: PointRef
+    center: PointRef
+    theta1: float
+    theta2: float
+    radius: ScalarRef
+    heading1: float
+    heading2: float
+    parity: bool
+    isStraight: bool
+    arcLengthField: float
 
     def __init__(self, fro: PointRef = None, to: PointRef = None, heading1: float = None, isStraight: bool = False):
+        self.fro = self.to = self.center = self.radius = None
+        self.theta1 = self.theta2 = self.heading1 = self.heading2 = None
+        self.parity = self.arcLengthField = None
         self.isStraight = isStraight
 
         if fro is not None and to is not None and heading1 is not None:
@@ -27,7 +37,8 @@ class Arc:
         self.fro = fro
         self.to = to
 
-        if math.isclose(Utility.thetaTwoPoints(fro.fieldRef, to.fieldRef), heading1):
+        # There is no circle through a zero-length edge, so it is a straight line of length 0
+        if fro.fieldRef == to.fieldRef or math.isclose(Utility.thetaTwoPoints(fro.fieldRef, to.fieldRef), heading1):
             self.isStraight = True
             self.center = None
             self.theta1 = None
@@ -36,7 +47,6 @@ class Arc:
             self.heading2 = heading1
             self.parity = None
             self.radius = None
-            self.radiusF = None
             
             self.arcLengthField = Utility.distanceTuples(fro.fieldRef, to.fieldRef)
             return
@@ -59,6 +69,40 @@ class Arc:
 
         self.arcLengthField = abs(self.radius.fieldRef * Utility.deltaInHeadingParity(self.theta2, self.theta1, self.parity))
 
+    # Return an (N,2) array of field points along the arc, split into the given number of equal line segments
+    def getFieldPoints(self, numberLines: int) -> np.ndarray:
+
+        if self.isStraight:
+            return np.array([self.fro.fieldRef, self.to.fieldRef])
+
+        sweep = Utility.deltaInHeadingParity(self.theta2, self.theta1, self.parity)
+        thetas = self.theta1 + sweep * np.arange(numberLines + 1) / numberLines
+        cx, cy = self.center.fieldRef
+        r = self.radius.fieldRef
+        return np.column_stack((cx + r * np.cos(thetas), cy + r * np.sin(thetas)))
+
+    # Screen-space bounding box (x1, y1, x2, y2) of the arc or line, expanded by margin pixels on every side
+    def getScreenBounds(self, margin: float) -> tuple:
+
+        if self.isStraight:
+            (xa, ya), (xb, yb) = self.fro.screenRef, self.to.screenRef
+            return min(xa, xb) - margin, min(ya, yb) - margin, max(xa, xb) + margin, max(ya, yb) + margin
+
+        cx, cy = self.center.screenRef
+        r = self.radius.screenRef
+        sweep = Utility.deltaInHeadingParity(self.theta2, self.theta1, self.parity)
+
+        # The box is spanned by the two endpoints and any axis-aligned extreme of the circle within the sweep
+        thetas = [self.theta1, self.theta1 + sweep]
+        for i in range(4):
+            extreme = i * math.pi / 2
+            if abs(Utility.deltaInHeadingParity(extreme, self.theta1, self.parity)) <= abs(sweep):
+                thetas.append(extreme)
+
+        xs = [cx + r * math.cos(theta) for theta in thetas]
+        ys = [cy - r * math.sin(theta) for theta in thetas] # screen y is flipped
+        return min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin
+
     def isTouching(self, pos: PointRef):
 
         # handle base case for straight line
@@ -82,3 +126,117 @@ class Arc:
             return d < c
 
 
+
+
+"""
+Arc geometry for a whole path at once. Each field is a numpy array with one entry per (fro, to, heading1) triple,
+matching the attributes Arc.set() would compute for that triple. For straight entries, center/radius/theta1/theta2
+are nan and parity is False.
+"""
+@dataclass
+class ArcBatch:
+    isStraight: np.ndarray
+    centerX: np.ndarray
+    centerY: np.ndarray
+    radius: np.ndarray
+    theta1: np.ndarray
+    theta2: np.ndarray
+    heading1: np.ndarray
+    heading2: np.ndarray
+    parity: np.ndarray
+    arcLength: np.ndarray
+
+    def __len__(self):
+        return len(self.isStraight)
+
+# Vectorized version of Arc.set() over arrays of arcs
+# fro and to are (N,2) arrays of field coordinates, and heading1 is an (N,) array of starting thetas
+def computeArcs(fro, to, heading1) -> ArcBatch:
+
+    fro = np.asarray(fro, dtype = float).reshape(-1, 2)
+    to = np.asarray(to, dtype = float).reshape(-1, 2)
+    heading1 = np.asarray(heading1, dtype = float).reshape(-1)
+
+    x1, y1 = fro[:,0], fro[:,1]
+    x2, y2 = to[:,0], to[:,1]
+    dx = x2 - x1
+    dy = y2 - y1
+
+    # same test as math.isclose() with its default relative tolerance. Zero-length arcs are straight, like in Arc.set()
+    straightHeading = np.arctan2(dy, dx) % TWO_PI
+    isStraight = np.abs(straightHeading - heading1) <= 1e-09 * np.maximum(np.abs(straightHeading), np.abs(heading1))
+    isStraight |= (dx == 0) & (dy == 0)
+
+    cos = np.cos(heading1)
+    sin = np.sin(heading1)
+
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+
+        # Utility.circleCenterFromTwoPointsAndTheta
+        a = (x1 - x2) * cos + (y1 - y2) * sin
+        b = (y1 - y2) * cos - (x1 - x2) * sin
+        c = a / (2 * b)
+        centerX = (x1 + x2) / 2 + c * (y1 - y2)
+        centerY = (y1 + y2) / 2 + c * (x2 - x1)
+
+        radius = np.hypot(x1 - centerX, y1 - centerY)
+        theta1 = np.arctan2(y1 - centerY, x1 - centerX) % TWO_PI
+        theta2 = np.arctan2(y2 - centerY, x2 - centerX) % TWO_PI
+
+        # Utility.thetaFromArc
+        heading2 = (2 * np.arctan2(dy, dx) - heading1) % TWO_PI
+
+        # Utility.lineParity of the end point relative to the line through the start point at heading1
+        parity = (cos * (y1 - sin - y2) - (x1 - cos - x2) * sin) >= 0
+
+        # Utility.deltaInHeadingParity
+        sweep = (theta2 - theta1) % TWO_PI
+        sweep = np.where(parity & (sweep > 0), sweep - TWO_PI, sweep)
+        arcLength = np.abs(radius * sweep)
+
+    nan = np.full(len(heading1), np.nan)
+    return ArcBatch(
+        isStraight = isStraight,
+        centerX = np.where(isStraight, nan, centerX),
+        centerY = np.where(isStraight, nan, centerY),
+        radius = np.where(isStraight, nan, radius),
+        theta1 = np.where(isStraight, nan, theta1),
+        theta2 = np.where(isStraight, nan, theta2),
+        heading1 = heading1,
+        heading2 = np.where(isStraight, heading1, heading2),
+        parity = np.where(isStraight, False, parity),
+        arcLength = np.where(isStraight, np.hypot(dx, dy), arcLength)
+    )
+
+# Scalar version of computeArcs() for a single arc that does not construct any PointRef/ScalarRef objects.
+# Used every frame while dragging, where only the arc length and resulting heading are needed
+# Returns (arcLengthField, heading2)
+def arcLengthAndHeading(x1: float, y1: float, x2: float, y2: float, heading1: float) -> tuple:
+
+    dx = x2 - x1
+    dy = y2 - y1
+    straightHeading = math.atan2(dy, dx) % TWO_PI
+
+    if (dx == 0 and dy == 0) or math.isclose(straightHeading, heading1):
+        return math.sqrt(dx*dx + dy*dy), heading1
+
+    cos = math.cos(heading1)
+    sin = math.sin(heading1)
+
+    a = (x1 - x2) * cos + (y1 - y2) * sin
+    b = (y1 - y2) * cos - (x1 - x2) * sin
+    c = a / (2 * b)
+    centerX = (x1 + x2) / 2 + c * (y1 - y2)
+    centerY = (y1 + y2) / 2 + c * (x2 - x1)
+
+    radius = math.sqrt((x1 - centerX) ** 2 + (y1 - centerY) ** 2)
+    theta1 = math.atan2(y1 - centerY, x1 - centerX) % TWO_PI
+    theta2 = math.atan2(y2 - centerY, x2 - centerX) % TWO_PI
+    parity = (cos * (y1 - sin - y2) - (x1 - cos - x2) * sin) >= 0
+
+    sweep = (theta2 - theta1) % TWO_PI
+    if parity and sweep > 0:
+        sweep -= TWO_PI
+
+    heading2 = (2 * math.atan2(dy, dx) - heading1) % TWO_PI
+    return abs(radius * sweep), heading2
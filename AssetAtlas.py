@@ -0,0 +1,124 @@
+import pygame, json, os
+
+"""
+One packed image holding every scaled image the program loads through graphics.getImage(), so startup decodes a single
+PNG instead of dozens, and does no smoothscaling. It is built by running this file from the repository root:
+
+    python AssetAtlas.py
+
+which loads and scales every (file, scale) in ATLAS_IMAGES exactly like getImage() does, packs them into ATLAS_IMAGE,
+and writes where each one is to ATLAS_INDEX, along with the size in bytes of its source file.
+
+getImage() takes an image from the atlas if the (file, scale) is in it and the source file still has the same size,
+and otherwise loads the file itself, so a missing or outdated atlas only makes startup slower. Rebuild the atlas after
+adding or changing images.
+"""
+
+ATLAS_IMAGE = "Images/atlas.png"
+ATLAS_INDEX = "Images/atlas.json"
+ATLAS_WIDTH = 256
+PADDING = 1 # pixels between images, so smoothscaling or rotating one never picks up its neighbors
+
+# Every (file, scale) passed to graphics.getImage()
+ATLAS_IMAGES = [
+    ("Images/robot.png", 0.1),
+    ("Images/trash.png", 0.05),
+    ("Images/trashH.png", 0.05),
+    ("Images/Buttons/hide.png", 0.05),
+    ("Images/Buttons/show.png", 0.05),
+    ("Images/Buttons/no_wheel.png", 0.05),
+    ("Images/Buttons/wheel.png", 0.05),
+    ("Images/Buttons/reset.png", 0.05),
+    ("Images/Buttons/save.png", 0.05),
+    ("Images/Buttons/textoff.png", 0.05),
+    ("Images/Buttons/texton.png", 0.05),
+    ("Images/Buttons/plus.png", 0.03),
+    ("Images/Buttons/plus2.png", 0.03),
+    ("Images/Buttons/PathButtons/start.png", 0.1),
+    ("Images/Buttons/PathButtons/clockwise.png", 0.07),
+    ("Images/Buttons/PathButtons/counterclockwise.png", 0.07),
+    ("Images/Buttons/MouseSelector/select.png", 0.1),
+    ("Images/Buttons/MouseSelector/straight.png", 0.1),
+    ("Images/Buttons/MouseSelector/curve.png", 0.1),
+    ("Images/Buttons/MouseSelector/play.png", 0.1),
+    ("Images/Commands/TurnLeft.png", 0.08),
+    ("Images/Commands/TurnRight.png", 0.08),
+    ("Images/Commands/StraightForward.png", 0.08),
+    ("Images/Commands/StraightReverse.png", 0.08),
+    ("Images/Commands/CurveLeftForward.png", 0.08),
+    ("Images/Commands/CurveRightForward.png", 0.08),
+    ("Images/Commands/CurveLeftReverse.png", 0.08),
+    ("Images/Commands/CurveRightReverse.png", 0.08),
+    ("Images/Commands/shoot.png", 0.15),
+    ("Images/Commands/Custom.png", 0.08),
+    ("Images/Commands/time.png", 0.08),
+    ("Images/Commands/intake.png", 0.08),
+    ("Images/Commands/roller.png", 0.07),
+    ("Images/Commands/flap.png", 0.07),
+]
+
+class AssetAtlas:
+
+    def __init__(self):
+        self.surface: pygame.Surface = None
+        self.entries: dict[tuple, tuple] = {} # (file, scale) -> (rect in the atlas, size of the source file in bytes)
+        self.isLoaded = False
+
+    # Load the atlas if it was built. Needs the display to be initialized
+    def load(self):
+
+        self.isLoaded = True
+        if not os.path.exists(ATLAS_IMAGE) or not os.path.exists(ATLAS_INDEX):
+            return
+
+        with open(ATLAS_INDEX) as file:
+            index = json.load(file)
+        self.surface = pygame.image.load(ATLAS_IMAGE).convert_alpha()
+        for entry in index:
+            self.entries[(entry["file"], entry["scale"])] = (pygame.Rect(entry["rect"]), entry["bytes"])
+
+    # Return the image for (filename, scale) from the atlas, or None if it is not in the atlas or is out of date.
+    # The image shares pixels with the atlas, so do not modify it
+    def get(self, filename: str, scale: float) -> pygame.Surface:
+
+        entry = self.entries.get((filename, scale))
+        if entry is None or not os.path.exists(filename) or os.path.getsize(filename) != entry[1]:
+            return None
+        return self.surface.subsurface(entry[0])
+
+
+# Load every image in ATLAS_IMAGES and pack them in rows of decreasing height
+def build():
+
+    import graphics
+
+    images = [(filename, scale, graphics.loadImage(filename, scale)) for filename, scale in ATLAS_IMAGES]
+    images.sort(key = lambda image: -image[2].get_height())
+
+    index = []
+    x, y, rowHeight = 0, 0, 0
+    for filename, scale, image in images:
+        width, height = image.get_size()
+        if x + width > ATLAS_WIDTH:
+            x, y, rowHeight = 0, y + rowHeight + PADDING, 0
+        index.append({"file": filename, "scale": scale, "rect": [x, y, width, height], "bytes": os.path.getsize(filename)})
+        x += width + PADDING
+        rowHeight = max(rowHeight, height)
+
+    atlas = pygame.Surface((ATLAS_WIDTH, y + rowHeight), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for (_, _, image), entry in zip(images, index):
+        atlas.blit(image, entry["rect"][:2], special_flags = pygame.BLEND_RGBA_MAX) # copy the alpha too, instead of blending
+
+    pygame.image.save(atlas, ATLAS_IMAGE)
+    with open(ATLAS_INDEX, "w") as file:
+        json.dump(index, file, indent = 1)
+
+    print(f"Packed {len(index)} images into {ATLAS_IMAGE} ({atlas.get_width()}x{atlas.get_height()})")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1)) # for convert_alpha()
+    build()
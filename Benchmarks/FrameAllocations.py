@@ -0,0 +1,108 @@
+from Benchmarks import SyntheticPath
+import time, tracemalloc
+
+"""
+Measures the reference-frame work in typical frames of a synthetic path:
+  - idle frame: resolve the hovered path object for a moving mouse, then draw the path and the command panel
+  - drag frame: move a node and recompute the path (as Node.beDraggedByMouse does), then draw
+
+For each, reports how many PointRef/VectorRef/ScalarRef objects are constructed, how many field->screen conversions
+read the FieldTransform, and the peak memory allocated within the frame. Also reports the size of a single PointRef.
+
+    python -m Benchmarks.FrameAllocations
+"""
+
+SEGMENTS = 100
+FRAMES = 50
+
+screen, fieldTransform = SyntheticPath.init()
+
+from SingletonState.FieldTransform import FieldTransform
+import SingletonState.ReferenceFrame as ReferenceFrame
+from SingletonState.ReferenceFrame import PointRef, Ref
+
+# Count constructions by wrapping each class's __init__
+counts = {}
+def countConstructions(cls):
+    init = cls.__init__
+    counts[cls.__name__] = 0
+    def countingInit(self, *args, **kwargs):
+        counts[cls.__name__] += 1
+        init(self, *args, **kwargs)
+    cls.__init__ = countingInit
+
+for cls in [ReferenceFrame.PointRef, ReferenceFrame.VectorRef, ReferenceFrame.ScalarRef]:
+    countConstructions(cls)
+
+# Every field->screen conversion reads FieldTransform.pan
+counts["pan reads"] = 0
+getPan = FieldTransform.pan.fget
+def countingGetPan(self):
+    counts["pan reads"] += 1
+    return getPan(self)
+FieldTransform.pan = property(countingGetPan, FieldTransform.pan.fset)
+
+program = SyntheticPath.buildProgram(SEGMENTS)
+state = program.state
+
+class MouseInput:
+    def __init__(self):
+        self.mousePosition = PointRef(Ref.SCREEN, (0, 0))
+    def isKeyPressing(self, key):
+        return False
+
+userInput = MouseInput()
+draggedNode = program.first.next.next.next.next
+
+def idleFrame(i: int):
+
+    userInput.mousePosition.screenRef = (50 + (i * 13) % 600, 50 + (i * 7) % 600)
+
+    for hoverable in program.getHoverablesPathAt(state, userInput.mousePosition):
+        if hoverable.checkIfHovering(userInput):
+            break
+
+    program.drawPath(screen, state)
+    program.drawCommands(screen)
+
+def dragFrame(i: int):
+    x, y = draggedNode.position.fieldRef
+    draggedNode.position.fieldRef = (x + (0.5 if i % 2 == 0 else -0.5), y)
+    program.recompute()
+    program.drawPath(screen, state)
+    program.drawCommands(screen)
+
+def measure(name, frame):
+
+    # warm up caches, then measure steady-state frames
+    for i in range(3):
+        frame(i)
+    for key in counts:
+        counts[key] = 0
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    peak = 0
+    for i in range(FRAMES):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        frame(i)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    print(f"{name} ({SEGMENTS} segments, {FRAMES} frames)")
+    for key, count in counts.items():
+        print(f"  {key} per frame: {count / FRAMES:.1f}")
+    print(f"  peak bytes allocated within a frame: {peak}")
+    print(f"  ms per frame (with tracemalloc): {elapsed / FRAMES * 1000:.2f}")
+
+measure("idle frame", idleFrame)
+measure("drag frame", dragFrame)
+
+tracemalloc.start()
+before = tracemalloc.get_traced_memory()[0]
+points = [PointRef(Ref.FIELD, (i, i)) for i in range(10000)]
+size = (tracemalloc.get_traced_memory()[0] - before) / len(points)
+tracemalloc.stop()
+print(f"bytes per PointRef (including list slot and coordinates): {size:.0f}")
@@ -0,0 +1,65 @@
+from Benchmarks import SyntheticPath
+import gc, sys, tracemalloc
+
+"""
+Measures the memory a path takes, in bytes per segment (one edge and the node after it, with everything they own),
+for synthetic paths of each size in SIZES. Memory is measured with tracemalloc as everything still allocated after
+building and recomputing the path, so it includes the geometry and the commands that are shown, but not the images
+they share. Paths are measured as built, and again after turning on shooting at every node, which creates every
+command a node can have.
+
+Also reports the size of a single instance of each path model class, including its __dict__ if it has one.
+
+    python -m Benchmarks.PathMemory
+"""
+
+SIZES = [100, 1000]
+
+screen, fieldTransform = SyntheticPath.init()
+
+# Bytes allocated by building a path with the given number of segments, and by then turning on shooting everywhere
+def measurePath(segments: int) -> tuple:
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    program = SyntheticPath.buildProgram(segments)
+    gc.collect()
+    built = tracemalloc.get_traced_memory()[0] - before
+
+    node = program.first.next.next
+    while node is not None:
+        node.shoot.active = True
+        node = node.next.next if node.next is not None else None
+    program.recompute()
+    gc.collect()
+    shooting = tracemalloc.get_traced_memory()[0] - before
+
+    tracemalloc.stop()
+    return program, built, shooting
+
+# Size of the object itself, plus its __dict__ if it has one
+def getInstanceSize(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+SyntheticPath.buildProgram(2) # load the images, fonts and other shared state first
+
+for segments in SIZES:
+    program, built, shooting = measurePath(segments)
+    print(f"{segments} segments")
+    print(f"  bytes per segment: {built / segments:.0f}")
+    print(f"  bytes per segment, shooting at every node: {shooting / segments:.0f}")
+
+edge = program.first.next
+node = edge.next
+command = edge.straightCommand
+objects = [program.first, node, node.shoot, edge, edge.headingPoint, edge.arc, command, command.toggle, command.speedSlider,
+    node.command, node.shoot.shootCommand]
+
+print("bytes per instance (including __dict__)")
+for obj in objects:
+    print(f"  {type(obj).__name__}: {getInstanceSize(obj)}")
@@ -0,0 +1,68 @@
+import os, math, tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # benchmarks run without a window
+
+import pygame
+
+"""
+Shared setup for the benchmarks. Initializes pygame and the singleton state the same way main.py does, and builds
+synthetic paths with a given number of segments, alternating straight and curved edges.
+
+Run benchmarks from the repository root as modules, ex:
+    python -m Benchmarks.FrameAllocations
+"""
+
+def init():
+
+    pygame.init()
+    screen = pygame.display.set_mode((1000, 700))
+
+    import Utility
+    from SingletonState.FieldTransform import FieldTransform
+    import SingletonState.ReferenceFrame as ReferenceFrame
+    import Commands.StartNode as StartNode
+    import Commands.TurnNode as TurnNode
+    import Commands.Between
+
+    # generated code is written on every recompute, so keep it out of the repository
+    Utility.setTarget(os.path.join(tempfile.gettempdir(), "Benchmark_Code.txt"))
+
+    fieldTransform = FieldTransform()
+    ReferenceFrame.initFieldTransform(fieldTransform)
+
+    StartNode.init()
+    TurnNode.init()
+    Commands.Between.init()
+
+    return screen, fieldTransform
+
+# Return a Program whose path has the given number of segments. Every other edge is curved
+def buildProgram(segments: int):
+
+    from SingletonState.SoftwareState import SoftwareState
+    from SingletonState.ReferenceFrame import PointRef, Ref
+    from Commands.Program import Program
+    from Commands.Edge import StraightEdge
+    from Commands.TurnNode import TurnNode
+    import Utility
+
+    state = SoftwareState()
+    program = Program(state)
+
+    for i in range(segments):
+
+        # wander around the field on a lissajous curve so that segments have varying lengths and directions
+        t = (i + 1) * 0.37
+        position = PointRef(Ref.FIELD, (72 + 55 * math.sin(1.3 * t), 72 + 55 * math.sin(t)))
+
+        heading = Utility.thetaTwoPoints(program.last.position.fieldRef, position.fieldRef)
+        if i % 2 == 1:
+            heading = (heading + 0.4) % (3.1415 * 2)
+
+        edge = StraightEdge(program, previous = program.last, heading1 = heading)
+        program.last.next = edge
+        node = TurnNode(program, position, previous = edge)
+        edge.next = node
+        program.last = node
+
+    program.recompute()
+    return program
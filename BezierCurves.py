@@ -1,47 +1,151 @@
 # Credits to Yusef Simsek for this code
 
+import numpy as np
+
 VECTOR_STRENGTH = 1.2 - 1 # The -1 is to make editing more intuitive. At a first value of 1, they're at 100%, 0.5 at 50% etc.
 
-# Returns the point on a bezier curve defined by the four points on location 0<=t<1.
-def getBezierPoint(t: float, p0: list, p1: list, p2: list, p3: list) -> list:
+"""A cubic bezier curve is defined by its two endpoints p0 and p3, and two control vectors p1 and p2 that are relative to
+p0 and p3 respectively and scaled by VECTOR_STRENGTH. getControlPoints() turns these into the four absolute control points,
+which the vectorized functions below take as a (4,2) array. Every function takes either a single t or an array of t.
+"""
+
+# Returns the (4,2) array of absolute control points. Does not modify the arguments
+def getControlPoints(p0: tuple, p1: tuple, p2: tuple, p3: tuple) -> np.ndarray:
+    p0 = np.asarray(p0, dtype = float)
+    p3 = np.asarray(p3, dtype = float)
+    scale = 1 + VECTOR_STRENGTH
+    return np.array([p0, p0 + np.asarray(p1, dtype = float) * scale, p3 + np.asarray(p2, dtype = float) * scale, p3])
+
+# Returns the points at every t, shape (..., 2)
+def getPoints(t, controlPoints: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype = float)[..., None]
+    inv_t = 1 - t
+    c = controlPoints
+    return inv_t ** 3 * c[0] + 3 * t * inv_t ** 2 * c[1] + 3 * inv_t * t ** 2 * c[2] + t ** 3 * c[3]
+
+# Returns the first derivative (the tangent, not normalized) at every t, shape (..., 2)
+def getGradients(t, controlPoints: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype = float)[..., None]
+    inv_t = 1 - t
+    d = np.diff(controlPoints, axis = 0)
+    return 3 * inv_t ** 2 * d[0] + 6 * inv_t * t * d[1] + 3 * t ** 2 * d[2]
+
+# Returns the second derivative at every t, shape (..., 2)
+def getSecondDerivatives(t, controlPoints: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype = float)[..., None]
+    dd = np.diff(controlPoints, n = 2, axis = 0)
+    return 6 * (1 - t) * dd[0] + 6 * t * dd[1]
+
+# Returns the signed curvature (1/radius, positive when turning counterclockwise) at every t
+def getCurvatures(t, controlPoints: np.ndarray) -> np.ndarray:
+    d1 = getGradients(t, controlPoints)
+    d2 = getSecondDerivatives(t, controlPoints)
+    cross = d1[...,0] * d2[...,1] - d1[...,1] * d2[...,0]
+    speed = np.hypot(d1[...,0], d1[...,1])
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        return np.where(speed > 1e-9, cross / speed ** 3, 0)
+
+# Returns the heading (radians, same convention as Utility.thetaTwoPoints) of the tangent at every t.
+# Where the first derivative is zero, such as at an end whose control vector is (0, 0), the tangent points along the
+# next nonzero derivative instead, so the heading at t=0 is towards p2 and at t=1 from p1
+def getHeadings(t, controlPoints: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype = float)
+    d1 = getGradients(t, controlPoints)
+    # just before t the curve moves along -d2, just after along +d2. Use the side that is on the curve
+    d2 = getSecondDerivatives(t, controlPoints) * np.where(t < 0.5, 1, -1)[..., None]
+    d3 = np.broadcast_to(np.diff(controlPoints, n = 3, axis = 0)[0], d1.shape)
+    for d in (d2, d3):
+        isZero = (np.hypot(d1[...,0], d1[...,1]) < 1e-9)[..., None]
+        d1 = np.where(isZero, d, d1)
+    return np.arctan2(d1[...,1], d1[...,0]) % (3.1415*2)
 
-    p1[0] += p0[0] + p1[0] * VECTOR_STRENGTH
-    p1[1] += p0[1] + p1[1] * VECTOR_STRENGTH
-    p2[0] += p3[0] + p2[0] * VECTOR_STRENGTH
-    p2[1] += p3[1] + p2[1] * VECTOR_STRENGTH
+# Split the curve at a single t with de Casteljau's algorithm. Returns the control points of the two halves, which
+# together trace the same curve
+def split(t: float, controlPoints: np.ndarray) -> tuple:
+    c = controlPoints
+    a = c[:-1] + (c[1:] - c[:-1]) * t
+    b = a[:-1] + (a[1:] - a[:-1]) * t
+    middle = b[0] + (b[1] - b[0]) * t
+    return np.array([c[0], a[0], b[0], middle]), np.array([middle, b[1], a[2], c[3]])
 
-    inv_t = 1-t
-    coefs = [inv_t ** 3,
-             3 * t * inv_t ** 2,
-             3 * inv_t * t ** 2,
-             t ** 3]
+# The control vectors relative to the endpoints that getControlPoints() turns into these control points
+def getControlVectors(controlPoints: np.ndarray) -> tuple:
+    scale = 1 + VECTOR_STRENGTH
+    return tuple(((controlPoints[1] - controlPoints[0]) / scale).tolist()), tuple(((controlPoints[2] - controlPoints[3]) / scale).tolist())
 
-    tx = coefs[0] * p0[0] + coefs[1] * p1[0] + \
-         coefs[2] * p2[0] + coefs[3] * p3[0]
-    ty = coefs[0] * p0[1] + coefs[1] * p1[1] + \
-         coefs[2] * p2[1] + coefs[3] * p3[1]
 
-    return [tx, ty]
+"""Maps distance along a bezier curve to t, so that the curve can be sampled at constant speed. The curve is sampled at
+numberSamples evenly spaced values of t, and the cumulative chord lengths between them are stored. Lookups
+linearly interpolate the table, so they work for a single distance or a whole array of them.
+"""
+class ArcLengthTable:
+    def __init__(self, controlPoints: np.ndarray, numberSamples: int = 256):
+        self.t = np.linspace(0, 1, numberSamples)
+        points = getPoints(self.t, controlPoints)
+        segments = np.hypot(*np.diff(points, axis = 0).T)
+        self.distance = np.concatenate(([0], np.cumsum(segments)))
+        self.length = self.distance[-1]
+
+    # t at each distance along the curve, clamped to [0, 1]
+    def tAtDistance(self, distance):
+        return np.interp(distance, self.distance, self.t)
+
+    # distance along the curve at each t
+    def distanceAtT(self, t):
+        return np.interp(t, self.t, self.distance)
+
+    # t values spaced evenly along the curve, including both endpoints
+    def evenlySpacedT(self, numberSegments: int) -> np.ndarray:
+        return self.tAtDistance(np.linspace(0, self.length, numberSegments + 1))
+
+
+# Returns the point on a bezier curve defined by the four points on location 0<=t<1.
+def getBezierPoint(t: float, p0: list, p1: list, p2: list, p3: list) -> list:
+    return getPoints(t, getControlPoints(p0, p1, p2, p3)).tolist()
 
 
 # returns the derivative on a bezier curve defined by the four points on location 0<=t<1
 def getBezierGradient(t: float, p0: tuple, p1: tuple, p2: tuple, p3: tuple) -> list:
+    return getGradients(t, getControlPoints(p0, p1, p2, p3)).tolist()
+
+
+# Testing code
+if __name__ == "__main__":
 
-    inv_t = 1-t
+    # Compare the vectorized functions against the original single-t formulas
+    def originalPoint(t, p0, p1, p2, p3):
+        p1 = [p0[0] + p1[0] * (1 + VECTOR_STRENGTH), p0[1] + p1[1] * (1 + VECTOR_STRENGTH)]
+        p2 = [p3[0] + p2[0] * (1 + VECTOR_STRENGTH), p3[1] + p2[1] * (1 + VECTOR_STRENGTH)]
+        inv_t = 1 - t
+        coefs = [inv_t ** 3, 3 * t * inv_t ** 2, 3 * inv_t * t ** 2, t ** 3]
+        return [sum(c * p[i] for c, p in zip(coefs, [p0, p1, p2, p3])) for i in range(2)]
 
-    p1[0] += p0[0] + p1[0] * VECTOR_STRENGTH
-    p1[1] += p0[1] + p1[1] * VECTOR_STRENGTH
-    p2[0] += p3[0] + p2[0] * VECTOR_STRENGTH
-    p2[1] += p3[1] + p2[1] * VECTOR_STRENGTH
+    p0, p1, p2, p3 = [10, 20], [40, 0], [0, -30], [100, 90]
+    controlPoints = getControlPoints(p0, p1, p2, p3)
+    ts = np.linspace(0, 1, 11)
+    error = max(np.abs(np.array(originalPoint(t, p0, p1, p2, p3)) - getPoints(t, controlPoints)).max() for t in ts)
+    print("max point error:", error)
+    print("arguments unchanged:", p1 == [40, 0] and p2 == [0, -30])
 
-    xs = [p1[0] - p0[0], p2[0] - p1[0], p3[0] - p2[0]]
-    ys = [p1[1] - p0[1], p2[1] - p1[1], p3[1] - p2[1]]
+    # Gradient against a finite difference
+    h = 1e-6
+    numeric = (getPoints(ts[1:-1] + h, controlPoints) - getPoints(ts[1:-1] - h, controlPoints)) / (2*h)
+    print("max gradient error:", np.abs(numeric - getGradients(ts[1:-1], controlPoints)).max())
 
-    coefs = [3 * inv_t ** 2,
-             6 * inv_t * t,
-             3 * t ** 2]
+    # Constant speed sampling
+    table = ArcLengthTable(controlPoints)
+    points = getPoints(table.evenlySpacedT(20), controlPoints)
+    spacing = np.hypot(*np.diff(points, axis = 0).T)
+    print("length:", round(table.length, 3), "spacing min/max:", round(spacing.min(), 3), round(spacing.max(), 3))
+    print("curvature at t=0, 0.5, 1:", getCurvatures([0, 0.5, 1], controlPoints))
 
-    tx = coefs[0] * xs[0] + coefs[1] * xs[1] + coefs[2] * xs[2]
-    ty = coefs[0] * ys[0] + coefs[1] * ys[1] + coefs[2] * ys[2]
+    # The two halves of a split should trace the original curve
+    left, right = split(0.3, controlPoints)
+    halves = np.concatenate((getPoints(ts, left), getPoints(ts, right)))
+    original = getPoints(np.concatenate((ts * 0.3, 0.3 + ts * 0.7)), controlPoints)
+    print("max split error:", np.abs(halves - original).max())
+    print("control vectors round trip:", np.allclose(getControlVectors(controlPoints), (p1, p2)))
 
-    return [tx, ty]
+    # A (0, 0) control vector still gives the heading the curve leaves or arrives with
+    degenerate = getControlPoints((0, 0), (0, 0), (-10, 10), (20, 0))
+    print("headings with a (0, 0) control vector:", np.round(getHeadings([0, 1], degenerate) * 180 / 3.1415, 1))
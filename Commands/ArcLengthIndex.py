@@ -0,0 +1,269 @@
+from SingletonState.ReferenceFrame import PointRef, Ref
+from Commands.Edge import BezierEdge
+import Utility, math, bisect, BezierCurves
+import numpy as np
+
+"""
+Cumulative arc length over every edge of the path, so that a distance s along the whole path can be turned into a pose
+(position and robot heading) and back.
+
+rebuild() walks the edges of the program and stores, for each one, its length and the parameters of its arc or line.
+Bezier curves are neither, so they are stored as samples instead: the distance, position, heading and curvature at
+each entry of the curve's ArcLengthTable, which are linearly interpolated. Edges whose shape and direction are
+unchanged since the last rebuild reuse their previous row and samples, so only the edges that moved are recomputed.
+
+poseAtDistance() finds the edge containing s by bisection of the cumulative lengths in O(log n), and distanceAtPoint()
+projects a point onto a given edge. sample() does the same as poseAtDistance() for a whole array of distances at once,
+and curvatureAt() gives the curvature there. The per-edge functions take an edge's index in self.edges, which
+getEdgeIndex() looks up in constant time.
+
+Headings are robot headings, the same as getPointOnEdge() returns: the path tangent, flipped for reversed edges.
+"""
+
+class ArcLengthIndex:
+
+    def __init__(self):
+        self.edges: list = []
+        self.indices: dict[int, int] = {} # id(edge) -> index of the edge in self.edges
+        self.rows: list[tuple] = []
+        self.samples: list[tuple] = [] # (distance, points, heading, curvature) arrays for sampled edges, None for the rest
+        self.sampled: list[int] = [] # indices of the sampled edges
+        self.start: list[float] = [] # distance along the path at the start of each edge
+        self.length = 0
+
+        self.cache: dict[int, tuple] = {} # id(edge) -> (key, row, samples)
+        self.arrays: dict = None # numpy columns of self.rows, built by _getArrays()
+
+    # Recompute the index from the linked list of edges starting at first.next
+    def rebuild(self, first):
+
+        self.edges = []
+        self.indices = {}
+        self.rows = []
+        self.samples = []
+        self.sampled = []
+        self.start = []
+        self.length = 0
+        self.arrays = None
+
+        cache = {}
+        edge = first.next
+        while edge is not None:
+
+            shape = (edge.controlVector1, edge.controlVector2) if isinstance(edge, BezierEdge) else edge.beforeHeading
+            key = (edge.previous.position.fieldRef, edge.next.position.fieldRef, shape, edge.reversed)
+            cached = self.cache.get(id(edge))
+            if cached is not None and cached[0] == key:
+                row, samples = cached[1], cached[2]
+            else:
+                row, samples = self._getRow(edge)
+            cache[id(edge)] = (key, row, samples)
+
+            if samples is not None:
+                self.sampled.append(len(self.edges))
+            self.indices[id(edge)] = len(self.edges)
+            self.edges.append(edge)
+            self.rows.append(row)
+            self.samples.append(samples)
+            self.start.append(self.length)
+            self.length += row[0]
+
+            edge = edge.next.next
+
+        self.cache = cache
+
+    # (length, isStraight, x1, y1, x2, y2, heading1, centerX, centerY, radius, theta1, direction, invert) for one edge,
+    # and its samples. direction is +1 for counterclockwise arcs and -1 for clockwise
+    # Sampled edges have the row of a line that is not straight, with a radius of 0, and their samples instead
+    def _getRow(self, edge) -> tuple:
+        x1, y1 = edge.previous.position.fieldRef
+        x2, y2 = edge.next.position.fieldRef
+        invert = 3.1415 if edge.reversed else 0
+
+        if isinstance(edge, BezierEdge):
+            table = edge.arcLengthTable
+            points = BezierCurves.getPoints(table.t, edge.controlPoints)
+            heading = np.unwrap(BezierCurves.getHeadings(table.t, edge.controlPoints), period = 3.1415 * 2)
+            curvature = BezierCurves.getCurvatures(table.t, edge.controlPoints)
+            samples = (table.distance, points, heading, curvature)
+            return (table.length, False, x1, y1, x2, y2, edge.beforeHeading, 0, 0, 0, 0, 0, invert), samples
+
+        arc = edge.arc
+        if arc.isStraight:
+            return (arc.arcLengthField, True, x1, y1, x2, y2, arc.heading1, 0, 0, 0, 0, 0, invert), None
+
+        sweep = Utility.deltaInHeadingParity(arc.theta2, arc.theta1, arc.parity)
+        direction = 1 if sweep >= 0 else -1
+        cx, cy = arc.center.fieldRef
+        return (arc.arcLengthField, False, x1, y1, x2, y2, arc.heading1, cx, cy, arc.radius.fieldRef, arc.theta1, direction, invert), None
+
+    # Index in self.edges of an edge of the path
+    def getEdgeIndex(self, edge) -> int:
+        return self.indices[id(edge)]
+
+    # Index of the edge that contains distance s, clamped to the path
+    def _getEdgeIndex(self, s: float) -> int:
+        return max(0, min(len(self.edges) - 1, bisect.bisect_right(self.start, s) - 1))
+
+    # Return (position, heading) at distance s along the path, or (None, None) for an empty path
+    def poseAtDistance(self, s: float) -> tuple:
+
+        if len(self.edges) == 0:
+            return None, None
+
+        s = Utility.clamp(s, 0, self.length)
+        i = self._getEdgeIndex(s)
+        return self.poseOnEdge(i, s - self.start[i])
+
+    # Return (position, heading) at distance local along the edge with index i
+    def poseOnEdge(self, i: int, local: float) -> tuple:
+
+        length, isStraight, x1, y1, x2, y2, heading1, cx, cy, radius, theta1, direction, invert = self.rows[i]
+        local = Utility.clamp(local, 0, length)
+
+        if self.samples[i] is not None:
+            distance, points, heading, curvature = self.samples[i]
+            position = (float(np.interp(local, distance, points[:,0])), float(np.interp(local, distance, points[:,1])))
+            return PointRef(Ref.FIELD, position), float(np.interp(local, distance, heading)) + invert
+
+        if isStraight:
+            fraction = local / length if length > 0 else 0
+            position = (x1 + (x2 - x1) * fraction, y1 + (y2 - y1) * fraction)
+            return PointRef(Ref.FIELD, position), heading1 + invert
+
+        theta = theta1 + direction * local / radius
+        position = (cx + radius * math.cos(theta), cy + radius * math.sin(theta))
+        return PointRef(Ref.FIELD, position), theta + direction * 3.1415 / 2 + invert
+
+    # Return the distance along the path of the point on edge closest to position
+    def distanceAtPoint(self, edge, position: PointRef) -> float:
+        i = self.getEdgeIndex(edge)
+        return self.start[i] + self.localDistanceAtPoint(i, *position.fieldRef)
+
+    # Return the distance along the edge with index i of the point on that edge closest to (x, y)
+    def localDistanceAtPoint(self, i: int, x: float, y: float) -> float:
+
+        length, isStraight, x1, y1, x2, y2, heading1, cx, cy, radius, theta1, direction, invert = self.rows[i]
+
+        if self.samples[i] is not None:
+            distance, points = self.samples[i][:2]
+            index, fraction, _ = Utility.closestPointOnPolyline(points, x, y)
+            local = distance[index] + fraction * (distance[index+1] - distance[index])
+        elif isStraight:
+            local = ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / length if length > 0 else 0
+        else:
+            # angle from the start of the arc in the direction of travel. Points beyond either end of the arc go
+            # to whichever end is angularly closer, which is also the closer one in distance
+            theta = Utility.thetaTwoPoints((cx, cy), (x, y))
+            angle = (direction * (theta - theta1)) % (3.1415 * 2)
+            if angle * radius > length:
+                angle = 0 if (3.1415 * 2 - angle) * radius < angle * radius - length else length / radius
+            local = angle * radius
+
+        return Utility.clamp(local, 0, length)
+
+    # Field bounding box (x1, y1, x2, y2) of the edge with index i
+    def getEdgeBounds(self, i: int) -> tuple:
+
+        length, isStraight, x1, y1, x2, y2, heading1, cx, cy, radius, theta1, direction, invert = self.rows[i]
+        xs = [x1, x2]
+        ys = [y1, y2]
+
+        if self.samples[i] is not None:
+            points = self.samples[i][1]
+            xs += [points[:,0].min(), points[:,0].max()]
+            ys += [points[:,1].min(), points[:,1].max()]
+        elif not isStraight:
+            # include the leftmost/rightmost/top/bottom points of the circle that lie within the arc
+            for k in range(4):
+                angle = (direction * (k * math.pi / 2 - theta1)) % (math.pi * 2)
+                if angle * radius < length:
+                    xs.append(cx + radius * math.cos(k * math.pi / 2))
+                    ys.append(cy + radius * math.sin(k * math.pi / 2))
+
+        return min(xs), min(ys), max(xs), max(ys)
+
+    # Sample the whole path every spacing inches (the end of the path is always included)
+    # Returns arrays (s, x, y, heading)
+    def sample(self, spacing: float) -> tuple:
+
+        if len(self.edges) == 0:
+            empty = np.zeros(0)
+            return empty, empty, empty, empty
+
+        s = np.append(np.arange(0, self.length, spacing), self.length)
+        return (s, *self.sampleAt(s))
+
+    # Vectorized poseAtDistance() for an array of distances. Returns arrays (x, y, heading)
+    def sampleAt(self, s) -> tuple:
+
+        a = self._getArrays()
+
+        s = np.clip(np.asarray(s, dtype = float), 0, self.length)
+        i = np.clip(np.searchsorted(a["start"], s, side = "right") - 1, 0, len(self.edges) - 1)
+        local = np.clip(s - a["start"][i], 0, a["length"][i])
+        isStraight = a["isStraight"][i] != 0
+
+        # straight edges
+        length = a["length"][i]
+        fraction = np.divide(local, length, out = np.zeros_like(local), where = length > 0)
+        xLine = a["x1"][i] + (a["x2"][i] - a["x1"][i]) * fraction
+        yLine = a["y1"][i] + (a["y2"][i] - a["y1"][i]) * fraction
+
+        # arcs. radius is 0 for straight and sampled rows, so divide by 1 there instead
+        radius = a["radius"][i]
+        direction = a["direction"][i]
+        theta = a["theta1"][i] + direction * local / np.where(radius > 0, radius, 1)
+        xArc = a["cx"][i] + radius * np.cos(theta)
+        yArc = a["cy"][i] + radius * np.sin(theta)
+
+        x = np.where(isStraight, xLine, xArc)
+        y = np.where(isStraight, yLine, yArc)
+        heading = np.where(isStraight, a["heading1"][i], theta + direction * 3.1415 / 2)
+
+        # sampled edges, one at a time
+        for j in self._getSampledEdges(i):
+            distance, points, headings, curvature = self.samples[j]
+            mask = i == j
+            x[mask] = np.interp(local[mask], distance, points[:,0])
+            y[mask] = np.interp(local[mask], distance, points[:,1])
+            heading[mask] = np.interp(local[mask], distance, headings)
+
+        return x, y, heading + a["invert"][i]
+
+    # Vectorized curvature of the path (1/radius, positive counterclockwise) at an array of distances
+    def curvatureAt(self, s) -> np.ndarray:
+
+        a = self._getArrays()
+
+        s = np.clip(np.asarray(s, dtype = float), 0, self.length)
+        i = np.clip(np.searchsorted(a["start"], s, side = "right") - 1, 0, len(self.edges) - 1)
+        radius = a["radius"][i]
+        curvature = np.where(radius > 0, a["direction"][i] / np.where(radius > 0, radius, 1), 0)
+
+        for j in self._getSampledEdges(i):
+            distance, curvatures = self.samples[j][0], self.samples[j][3]
+            mask = i == j
+            curvature[mask] = np.interp(s[mask] - a["start"][j], distance, curvatures)
+
+        return curvature
+
+    # Largest curvature magnitude along the edge with index i
+    def getMaxCurvature(self, i: int) -> float:
+        if self.samples[i] is not None:
+            return float(np.abs(self.samples[i][3]).max())
+        radius = self.rows[i][9]
+        return 1 / radius if radius > 0 else 0
+
+    # The indices of the sampled edges that are among the edge indices i
+    def _getSampledEdges(self, i: np.ndarray) -> list[int]:
+        return [j for j in self.sampled if np.any(i == j)]
+
+    # Numpy columns of self.rows, built the first time they are needed after a rebuild
+    def _getArrays(self) -> dict:
+        if self.arrays is None:
+            columns = np.array(self.rows, dtype = float).T
+            names = ("length", "isStraight", "x1", "y1", "x2", "y2", "heading1", "cx", "cy", "radius", "theta1", "direction", "invert")
+            self.arrays = dict(zip(names, columns))
+            self.arrays["start"] = np.array(self.start)
+        return self.arrays
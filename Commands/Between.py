@@ -42,14 +42,21 @@ class Plus(Clickable, TooltipOwner):
     def checkIfHovering(self, userInput: UserInput) -> bool:
         return Utility.distanceTuples(userInput.mousePosition.screenRef, (self.x, self.between.y)) < 10
 
+    # All the plusses are drawn while any of them is hovered
+    def getDrawBounds(self) -> tuple:
+        return self.between.getDrawBounds()
+
+    def getLinkedHoverables(self) -> list[Hoverable]:
+        return [self.between]
+
     # insert custom command after the previous command
     def click(self) -> None:
 
         self.between.beforeCommand.nextCustomCommand = self.CommandClass(self.program, self.between.beforeCommand.nextCustomCommand)
         self.program.recomputeCommands()
 
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
-        self.tooltip.draw(screen, mousePosition)
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
+        return self.tooltip.draw(screen, mousePosition)
 
     def draw(self, screen: pygame.Surface):
         graphics.drawCircle(screen, self.x, self.between.y, self.color, self.radius)
@@ -100,6 +107,10 @@ class Between(Hoverable):
             return False
         return True
 
+    # The bar and plusses, and the outline drawn when it is the drop target for a dragged command
+    def getDrawBounds(self) -> tuple:
+        return self.hoverX1, self.y - 27, Utility.SCREEN_SIZE + Utility.PANEL_WIDTH, self.y + 27
+
     def getHoverables(self) -> Iterable[Hoverable]:
         for plus in self.plusses:
             yield plus
@@ -0,0 +1,117 @@
+from Commands.Scroller import Scroller
+import Utility, pygame, graphics, colors, threading
+
+"""
+The generated code as shown in the command panel when code view is on. All of the code is rendered once into a tall
+surface, and drawing the view is a single blit of the part of that surface under its own scroller, so routines of any
+length can be scrolled through.
+
+The surface is only rendered while code view is shown, and again after the code changes (setLines() is called by
+Program.recomputeGeneratedCode()). Code longer than BACKGROUND_LINES is rendered on a background thread, which posts a
+RENDERED_EVENT when it is done so the main loop wakes up to draw it. Until then, the previous code stays on screen.
+"""
+
+LINE_HEIGHT = 11
+BACKGROUND_LINES = 300 # render code longer than this many lines on a background thread
+RENDERED_EVENT = pygame.event.custom_type()
+
+class CodeView:
+
+    def __init__(self, program):
+
+        self.program = program
+
+        self.scroller: Scroller = Scroller(program, Utility.SCREEN_SIZE + Utility.PANEL_WIDTH - 19, 10, 13, Utility.SCREEN_SIZE - 20, onScroll = self.onScroll)
+
+        # the viewport extends a little past the scroller so the first and last lines are not cut off
+        self.x = Utility.SCREEN_SIZE + 10
+        self.y = self.scroller.y - LINE_HEIGHT // 2
+        self.width = self.scroller.x - 4 - self.x
+        self.height = self.scroller.displayHeight + LINE_HEIGHT
+
+        self.lines: list[str] = []
+        self.surface: pygame.Surface = None
+        self.isStale = True
+        self.version = 0 # incremented whenever the rendered surface changes or is scrolled
+
+        # a separate font for the background thread, so it never renders at the same time as the main thread's font.
+        # Loaded the first time it is needed
+        self.backgroundFont: pygame.font.Font = None
+        self.thread: threading.Thread = None
+        self.renderedSurface: pygame.Surface = None # finished by the background thread, not yet shown
+
+    # Called whenever the generated code changes
+    def setLines(self, lines: list[str]):
+        self.lines = lines
+        self.isStale = True
+
+    # Scrolling only moves the viewport, since draw() blits from the scroller's contentY, but the panel still has to be
+    # redrawn
+    def onScroll(self):
+        self.version += 1
+
+    # Called every frame. Show a surface finished in the background, and start rendering if the code changed while
+    # code view is shown
+    def update(self, isShown: bool):
+
+        if self.renderedSurface is not None and not self.isRendering():
+            self._setSurface(self.renderedSurface)
+            self.renderedSurface = None
+
+        if not isShown or not self.isStale or self.isRendering():
+            return
+        self.isStale = False
+
+        if len(self.lines) <= BACKGROUND_LINES:
+            self._setSurface(self._render(self.lines, graphics.FONTCODE))
+        else:
+            if self.backgroundFont is None:
+                self.backgroundFont = pygame.font.SysFont("arial", 8)
+            self.thread = threading.Thread(target = self._renderInBackground, args = (self.lines,), daemon = True)
+            self.thread.start()
+
+    def isRendering(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def _renderInBackground(self, lines: list[str]):
+        self.renderedSurface = self._render(lines, self.backgroundFont)
+        pygame.event.post(pygame.event.Event(RENDERED_EVENT))
+
+    # Render all the lines into one surface, each line centered vertically in a LINE_HEIGHT row
+    def _render(self, lines: list[str], font: pygame.font.Font) -> pygame.Surface:
+
+        surface = pygame.Surface((self.width, max(1, len(lines) * LINE_HEIGHT)))
+        surface.fill(colors.PANEL_GREY)
+
+        y = 0
+        for text in lines:
+            if text != "":
+                line = font.render(text, True, colors.BLACK, colors.PANEL_GREY)
+                surface.blit(line, (0, y + (LINE_HEIGHT - line.get_height()) // 2))
+            y += LINE_HEIGHT
+
+        return surface
+
+    def _setSurface(self, surface: pygame.Surface):
+        self.surface = surface
+        self.version += 1
+        self.scroller.update(surface.get_height())
+        self.scroller._update() # keep the scroll position within the new content
+
+    def draw(self, screen: pygame.Surface):
+
+        if self.surface is not None:
+            screen.blit(self.surface, (self.x, self.y), (0, self.scroller.contentY, self.width, self.height))
+
+        self.scroller.draw(screen)
+
+
+# Testing code
+if __name__ == "__main__":
+    pygame.init()
+    view = CodeView(None)
+    view.setLines([f"line {i}" for i in range(1000)])
+    view.update(True)
+    view.thread.join()
+    view.update(True)
+    print(view.surface.get_size(), view.scroller.barHeight)
@@ -16,12 +16,17 @@ from Simulation.SimulationState import SimulationState
 from Simulation.Simulator import Simulator
 from Simulation.PID import PID
 from typing import Iterable
+from dataclasses import dataclass
 import Utility, texteditor
+import Export.RouteFile as RouteFile
 
 class CommandAddon:
-    pass
+    __slots__ = ()
 
 class CommandSlider(Slider, CommandAddon):
+
+    __slots__ = ("dy", "dx", "parent", "program")
+
     def __init__(self, parent, min: float, max: float, step: float, text: str, default: float = 0, dy = 0, dx = 0, program = None, color = None):
         
         self.min = min
@@ -64,9 +69,19 @@ class CommandSlider(Slider, CommandAddon):
     def compute(self):
         self.x = self.getX()
         self.y = self.getY()
+
+    def getDrawBounds(self) -> tuple:
+        return self.parent.getDrawBounds()
+
+    def getLinkedHoverables(self) -> list[Hoverable]:
+        return [self.parent]
         
 
 class CommandToggle(Clickable, TooltipOwner, CommandAddon):
+
+    __slots__ = ("parent", "options", "tooltips", "text", "N", "activeOption", "hoveringOption", "disabled", "disabledH",
+        "enabled", "enabledH", "centerX", "width", "height")
+
     def __init__(self, parent: 'Command', options: list[str], text: list[str] = None, width = 35, dx = 0):
 
         self.parent = parent
@@ -118,6 +133,12 @@ class CommandToggle(Clickable, TooltipOwner, CommandAddon):
         self.hoveringOption = Utility.clamp(int(ratio * self.N), 0, self.N-1)
         return True
 
+    def getDrawBounds(self) -> tuple:
+        return self.parent.getDrawBounds()
+
+    def getLinkedHoverables(self) -> list[Hoverable]:
+        return [self.parent]
+
     def click(self):
 
         if self.hoveringOption == -1:
@@ -128,8 +149,8 @@ class CommandToggle(Clickable, TooltipOwner, CommandAddon):
         if changed:
             self.parent.onToggleClick()
 
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
-        self.tooltips[self.tooltipOption].draw(screen, mousePosition)
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
+        return self.tooltips[self.hoveringOption].draw(screen, mousePosition)
 
     def draw(self, screen: pygame.Surface):
 
@@ -137,17 +158,20 @@ class CommandToggle(Clickable, TooltipOwner, CommandAddon):
         y = self.parent.y + self.parent.height/2 - self.height/2
         dx = self.width / self.N
 
+        # hoveringOption is only updated while the mouse is over the toggle, so ignore it otherwise
+        hoveringOption = self.hoveringOption if self.isHovering else -1
+
         # draw backdrop
         pygame.draw.rect(screen, self.disabled, [x, y, self.width, self.height])
 
         for i in range(self.N):
 
             # get color based on whether enabled and/or hovered
-            if self.activeOption == i or self.hoveringOption == i:
+            if self.activeOption == i or hoveringOption == i:
 
                 if self.activeOption == i:
-                    color = self.enabledH if self.hoveringOption == i else self.enabled
-                elif self.hoveringOption == i:
+                    color = self.enabledH if hoveringOption == i else self.enabled
+                elif hoveringOption == i:
                     color = self.disabledH
                 # draw filled rect3
                 pygame.draw.rect(screen, color, [x, y, dx, self.height])
@@ -165,17 +189,29 @@ class CommandToggle(Clickable, TooltipOwner, CommandAddon):
         pygame.draw.rect(screen, [0,0,0], [x0, y, dx + (1 if (self.activeOption == self.N-1) else 0), self.height], 1)
 
 
-        # kinda bad to do this here, but reset which one was hovered
-        self.tooltipOption = self.hoveringOption
-        self.hoveringOption = -1
-
+# The parameters of a command as plain data. Edges and nodes keep a record for each command they could have, and only
+# create the command itself (with its toggle, sliders, tooltips and images) once it is shown in the command list. A
+# command copies its record into its widgets when created, and back into the record whenever they change, so the
+# record is always up to date and is what the Serializer saves
+@dataclass
+class CommandRecord:
+    toggle: int = 0 # active option of the toggle
+    slider: float = None # value of the slider
+    slider2: float = None # value of the second slider, for commands that have one
+    commented: bool = False
+    nextCustomCommand: 'CustomCommand' = None # first of the custom commands that follow this command
 
 class Command(Hoverable, ABC):
 
+    __slots__ = ("parent", "program", "width", "height", "x", "y", "colors", "margin", "INFO_DX", "toggle", "slider",
+        "DELTA_SLIDER_Y", "record")
+
     COMMAND_HEIGHT = 60
     COMMAND_WIDTH = 260
 
-    def __init__(self, parent, colors, toggle: CommandToggle = None, slider: CommandSlider = None, program = None, nextCustomCommand: 'CustomCommand' = None, commented = False):
+    OPCODE = None # identifies the subclass in the binary route file
+
+    def __init__(self, parent, colors, toggle: CommandToggle = None, slider: CommandSlider = None, program = None, nextCustomCommand: 'CustomCommand' = None, commented = False, record: CommandRecord = None):
 
         super().__init__()
 
@@ -195,16 +231,52 @@ class Command(Hoverable, ABC):
 
         self.DELTA_SLIDER_Y = 14
 
-        self.nextCustomCommand: 'CustomCommand' = nextCustomCommand
-        
-        self.commented = commented
+        # the record of the edge or node this command belongs to, or a record of its own
+        self.record: CommandRecord = CommandRecord(commented = commented, nextCustomCommand = nextCustomCommand) if record is None else record
+
+    # The parameters of a new command of this type
+    @staticmethod
+    def newRecord() -> CommandRecord:
+        return CommandRecord()
+
+    @property
+    def commented(self) -> bool:
+        return self.record.commented
+
+    @commented.setter
+    def commented(self, commented: bool):
+        self.record.commented = commented
+
+    @property
+    def nextCustomCommand(self) -> 'CustomCommand':
+        return self.record.nextCustomCommand
+
+    @nextCustomCommand.setter
+    def nextCustomCommand(self, command: 'CustomCommand'):
+        self.record.nextCustomCommand = command
+
+    # Set the toggle and slider from the record. Called by subclasses once they have created them
+    def loadRecord(self):
+        if self.toggle is not None:
+            self.toggle.activeOption = self.record.toggle
+        if self.slider is not None and self.record.slider is not None:
+            self.slider.setValue(self.record.slider, disableCallback = True)
+
+    # Copy the toggle and slider into the record. Called whenever either changes
+    def saveRecord(self):
+        if self.toggle is not None:
+            self.record.toggle = self.toggle.activeOption
+        if self.slider is not None:
+            self.record.slider = self.slider.getValue()
 
     # called by the toggle owned by this command when toggle is toggled
     def onToggleClick(self):
+        self.saveRecord()
         self.program.recomputeGeneratedCode()
 
     # called by the slider owned by this command when slider is dragged
     def onSliderUpdate(self):
+        self.saveRecord()
         self.program.recomputeGeneratedCode()
 
     def updatePosition(self, x, y):
@@ -221,6 +293,14 @@ class Command(Hoverable, ABC):
             return False
         return True
 
+    # The command's row, including the hover border and the slider labels that stick out above it
+    def getDrawBounds(self) -> tuple:
+        return self.x - self.margin, self.y - 15, self.x + self.width + self.margin, self.y + self.height + self.margin
+
+    # The edge or node the command belongs to is highlighted while the command is hovered
+    def getLinkedHoverables(self) -> list[Hoverable]:
+        return [self.parent] if isinstance(self.parent, Hoverable) else []
+
     def getHoverables(self) -> Iterable[Hoverable]:
 
         if not self.program.state.mode == Mode.PLAYBACK:
@@ -282,6 +362,21 @@ class Command(Hoverable, ABC):
     def getCode(self) -> str:
         pass
 
+    # override with subclasses. Return the fixed-point (flags, speed, a, b, c) of this command's record in the binary
+    # route file (see Export/RouteFile.py), or None to leave the command out
+    def getRouteRecord(self) -> tuple:
+        return None
+
+    # The (opcode, flags, speed, a, b, c) records of this command in the route file. Override with subclasses that are
+    # driven as several commands
+    def getRouteRecords(self) -> list[tuple]:
+        record = self.getRouteRecord()
+        return [] if record is None else [(self.OPCODE, *record)]
+
+    # override with subclasses that store text in the route file instead of a and b
+    def getRouteText(self) -> str:
+        return None
+
     # subclasses can initialize anything needed before running simulation
     def initSimulationController(self, simulationState: SimulationState):
         pass
@@ -292,14 +387,20 @@ class Command(Hoverable, ABC):
         pass
 
 class TurnCommand(Command):
-    def __init__(self, parent, isShoot = False):
+
+    __slots__ = ("isShoot", "imageLeft", "imageRight", "pid")
+
+    OPCODE = RouteFile.OPCODE_TURN
+
+    def __init__(self, parent, isShoot = False, record: CommandRecord = None):
 
         self.isShoot = isShoot
 
         BLUE = [[57, 126, 237], [122, 169, 245]]
-        super().__init__(parent, BLUE)
+        super().__init__(parent, BLUE, record = record)
 
         self.toggle = CommandToggle(self, ["Tuned for precision", "Tuned for speed"], ["Precise", "Fast"], width = 135, dx = 47)
+        self.loadRecord()
 
         self.imageLeft = graphics.getImage("Images/Commands/TurnLeft.png", 0.08)
         self.imageRight = graphics.getImage("Images/Commands/TurnRight.png", 0.08)
@@ -325,6 +426,14 @@ class TurnCommand(Command):
             num = round(self.parent.goalHeading * 180 / 3.1415, 2)
             return f"goTurnU(robot, {mode}, getRadians({num}));"
 
+    # a: heading. With FLAG_ODOM, (a, b) is the point to turn towards
+    def getRouteRecord(self) -> tuple:
+        option = self.toggle.get(int)
+        if self.parent.program.state.useOdom:
+            x, y = self.parent.next.next.position.fieldRef
+            return option | RouteFile.FLAG_ODOM, 0, RouteFile.toDistance(x), RouteFile.toDistance(y), 0
+        return option, 0, RouteFile.toAngle(self.parent.goalHeading), 0, 0
+
     def initSimulationController(self, simulationState: SimulationState):
         tolerance = 5 # tolerance interval in degrees
         self.pid = PID(12, 0, 0.2, tolerance = tolerance * 3.1415 / 180)
@@ -337,17 +446,26 @@ class TurnCommand(Command):
 
 
 class StraightCommand(Command):
-    def __init__(self, parent):
+
+    __slots__ = ("speedSlider", "timeSlider", "isTime", "imageForward", "imageReverse", "distancePID", "turnPID", "startPosition")
+
+    OPCODE = RouteFile.OPCODE_STRAIGHT
+
+    DEFAULT_SPEED = 1
+    DEFAULT_TIME = 1
+
+    def __init__(self, parent, record: CommandRecord = None):
 
         RED = [[245, 73, 73], [237, 119, 119]]
-        super().__init__(parent, RED)
+        super().__init__(parent, RED, record = record)
 
         toggle = CommandToggle(self, ["Tuned for precision", "Tuned for speed", "No slowdown", "Timed"])
-        self.speedSlider = CommandSlider(self, 0, 1, 0.01, "Speed", 1, 0)
-        self.timeSlider = CommandSlider(self, 0.1, 5, 0.01, "Time (s)", 1, self.DELTA_SLIDER_Y)
+        self.speedSlider = CommandSlider(self, 0, 1, 0.01, "Speed", self.DEFAULT_SPEED, 0)
+        self.timeSlider = CommandSlider(self, 0.1, 5, 0.01, "Time (s)", self.DEFAULT_TIME, self.DELTA_SLIDER_Y)
 
         self.toggle = toggle
         self.isTime: bool = False
+        self.loadRecord()
 
         self.imageForward = graphics.getImage("Images/Commands/StraightForward.png", 0.08)
         self.imageReverse = graphics.getImage("Images/Commands/StraightReverse.png", 0.08)
@@ -363,9 +481,32 @@ class StraightCommand(Command):
 
         yield self
 
+    @staticmethod
+    def newRecord() -> CommandRecord:
+        return CommandRecord(slider = StraightCommand.DEFAULT_SPEED, slider2 = StraightCommand.DEFAULT_TIME)
+
+    # slider is the speed, and slider2 the time of the timed option
+    def loadRecord(self):
+        self.toggle.activeOption = self.record.toggle
+        if self.record.slider is not None:
+            self.speedSlider.setValue(self.record.slider, disableCallback = True)
+        if self.record.slider2 is not None:
+            self.timeSlider.setValue(self.record.slider2, disableCallback = True)
+        if self.toggle.get(int) == 3: # already laid out for the other options
+            self._updateMode()
+
+    def saveRecord(self):
+        self.record.toggle = self.toggle.activeOption
+        self.record.slider = self.speedSlider.getValue()
+        self.record.slider2 = self.timeSlider.getValue()
+
     # called by the toggle owned by this command when toggle is toggled
     def onToggleClick(self):
         super().onToggleClick()
+        self._updateMode()
+
+    # Show the time slider below the speed slider for the timed option
+    def _updateMode(self):
         if self.toggle.get(int) == 3:
             self.slider = self.timeSlider
             self.isTime = True
@@ -428,6 +569,16 @@ class StraightCommand(Command):
             else:
                 return f"goForwardU(robot, {mode}({speed}), GFU_TURN, {distance}, getRadians({heading}));"
 
+    # a: signed distance, b: heading, c: time for the timed option. With FLAG_ODOM, (a, b) is the point to go to
+    def getRouteRecord(self) -> tuple:
+        option = self.toggle.get(int)
+        speed = RouteFile.toSpeed(self.speedSlider.getValue())
+        time = RouteFile.toMilliseconds(self.timeSlider.getValue())
+        if self.program.state.useOdom and option != 3:
+            x, y = self.parent.next.position.fieldRef
+            return option | RouteFile.FLAG_ODOM, speed, RouteFile.toDistance(x), RouteFile.toDistance(y), time
+        return option, speed, RouteFile.toDistance(self.parent.distance), RouteFile.toAngle(self.parent.goalHeading), time
+
     def initSimulationController(self, simulationState: SimulationState):
         minSpeed = Simulator.MAX_VELOCITY * 0.05
         self.distancePID = PID(4, 0, 0.2, min = minSpeed, tolerance = 0.3, toleranceRepeated = 3)
@@ -447,10 +598,17 @@ class StraightCommand(Command):
         return ControllerInputState(left, right, self.distancePID.isDone())
 
 class CurveCommand(Command):
-    def __init__(self, parent):
+
+    __slots__ = ("imageLeftForward", "imageRightForward", "imageLeftReverse", "imageRightReverse", "idleTicks", "maxIdleTicks")
+
+    OPCODE = RouteFile.OPCODE_CURVE
+
+    DEFAULT_SPEED = 1
+
+    def __init__(self, parent, record: CommandRecord = None):
 
         GREEN = [[80, 217, 87], [149, 230, 153]]
-        super().__init__(parent, GREEN)
+        super().__init__(parent, GREEN, record = record)
 
         self.imageLeftForward = graphics.getImage("Images/Commands/CurveLeftForward.png", 0.08)
         self.imageRightForward = graphics.getImage("Images/Commands/CurveRightForward.png", 0.08)
@@ -458,8 +616,12 @@ class CurveCommand(Command):
         self.imageRightReverse = graphics.getImage("Images/Commands/CurveRightReverse.png", 0.08)
 
         self.toggle = CommandToggle(self, ["Tuned for precision", "Tuned for speed", "No slowdown"])
-        self.slider = CommandSlider(self, 0, 1, 0.01, "Speed", 1)
-        
+        self.slider = CommandSlider(self, 0, 1, 0.01, "Speed", self.DEFAULT_SPEED)
+        self.loadRecord()
+
+    @staticmethod
+    def newRecord() -> CommandRecord:
+        return CommandRecord(slider = CurveCommand.DEFAULT_SPEED)
 
     def getIcon(self) -> pygame.Surface:
         clockwise = self.parent.arc.parity
@@ -493,6 +655,11 @@ class CurveCommand(Command):
         
         return f"goCurveU(robot, {mode}({speed}), GCU_CURVE, getRadians({deg1}), getRadians({deg2}), {r});"
 
+    # a: signed radius, b: starting heading, c: ending heading
+    def getRouteRecord(self) -> tuple:
+        return (self.toggle.get(int), RouteFile.toSpeed(self.slider.getValue()), RouteFile.toDistance(self.parent.goalRadius),
+            RouteFile.toAngle(self.parent.goalBeforeHeading), RouteFile.toAngle(self.parent.goalHeading))
+
     def initSimulationController(self, simulationState: SimulationState):
         # temporarily, this controller just does nothing for 20 ticks
         self.idleTicks = 0
@@ -502,20 +669,147 @@ class CurveCommand(Command):
         self.idleTicks += 1
         return ControllerInputState(0, 0, self.idleTicks >= self.maxIdleTicks)
 
+# Drives a bezier curve as the straight pieces the parent BezierEdge splits it into, without slowing down between them
+class BezierCommand(Command):
+
+    __slots__ = ("imageLeftForward", "imageRightForward", "imageLeftReverse", "imageRightReverse", "pieceIndex",
+        "distancePID", "turnPID", "startPosition")
+
+    OPCODE = RouteFile.OPCODE_STRAIGHT # stored as the straight pieces it is driven as
+
+    DEFAULT_SPEED = 1
+    MODES = ["GFU_DIST_PRECISE", "GFU_DIST", "NO_SLOWDOWN"]
+
+    def __init__(self, parent, record: CommandRecord = None):
+
+        PURPLE = [[160, 90, 230], [196, 152, 240]]
+        super().__init__(parent, PURPLE, record = record)
+
+        self.imageLeftForward = graphics.getImage("Images/Commands/CurveLeftForward.png", 0.08)
+        self.imageRightForward = graphics.getImage("Images/Commands/CurveRightForward.png", 0.08)
+        self.imageLeftReverse = graphics.getImage("Images/Commands/CurveLeftReverse.png", 0.08)
+        self.imageRightReverse = graphics.getImage("Images/Commands/CurveRightReverse.png", 0.08)
+
+        self.toggle = CommandToggle(self, ["Tuned for precision", "Tuned for speed", "No slowdown"])
+        self.slider = CommandSlider(self, 0, 1, 0.01, "Speed", self.DEFAULT_SPEED)
+        self.loadRecord()
+
+    @staticmethod
+    def newRecord() -> CommandRecord:
+        return CommandRecord(slider = BezierCommand.DEFAULT_SPEED)
+
+    def getIcon(self) -> pygame.Surface:
+        clockwise = self.parent.turn < 0
+        if clockwise:
+            return self.imageRightReverse if self.parent.reversed else self.imageRightForward
+        else:
+            return self.imageLeftReverse if self.parent.reversed else self.imageLeftForward
+
+    def drawInfo(self, screen: pygame.Surface):
+        x = self.x + self.INFO_DX
+        dy = 12
+        y0 = self.y + self.height/2 - dy
+        y1 = self.y + self.height/2 + dy
+
+        graphics.drawText(screen, graphics.FONT15, self.parent.distanceStr, colors.BLACK, x, y0)
+        graphics.drawText(screen, graphics.FONT15, self.parent.goalHeadingStr, colors.BLACK, x, y1)
+
+    # The mode of each piece. Only the last one slows down, with the mode of the toggle
+    def _getModes(self) -> list[int]:
+        n = len(self.parent.pieces)
+        return [2] * (n - 1) + [self.toggle.get(int)]
+
+    # One goForwardU (or goToPoint with odometry) per piece
+    def getCode(self) -> str:
+
+        speed = round(self.slider.getValue(), 2)
+        lines = []
+        for (distance, heading, (x, y)), option in zip(self.parent.pieces, self._getModes()):
+            mode = self.MODES[option]
+            if self.program.state.useOdom:
+                lines.append(f"goToPoint(robot, {mode}, GFU_TURN, {round(x, 2)}, {round(y, 2)});")
+            else:
+                degrees = round(heading * 180 / 3.1415, 2)
+                lines.append(f"goForwardU(robot, {mode}({speed}), GFU_TURN, {round(distance, 2)}, getRadians({degrees}));")
+        return "\n".join(lines)
+
+    # One straight record per piece, with the same fields as StraightCommand.getRouteRecord()
+    def getRouteRecords(self) -> list[tuple]:
+        speed = RouteFile.toSpeed(self.slider.getValue())
+        records = []
+        for (distance, heading, (x, y)), option in zip(self.parent.pieces, self._getModes()):
+            if self.program.state.useOdom:
+                records.append((self.OPCODE, option | RouteFile.FLAG_ODOM, speed, RouteFile.toDistance(x), RouteFile.toDistance(y), 0))
+            else:
+                records.append((self.OPCODE, option, speed, RouteFile.toDistance(distance), RouteFile.toAngle(heading), 0))
+        return records
+
+    # Same controller as StraightCommand, run for each piece in turn
+    def initSimulationController(self, simulationState: SimulationState):
+        self.pieceIndex = 0
+        self._initPiece(simulationState)
+
+    def _initPiece(self, simulationState: SimulationState):
+        minSpeed = Simulator.MAX_VELOCITY * 0.05
+        self.distancePID = PID(4, 0, 0.2, min = minSpeed, tolerance = 0.3, toleranceRepeated = 3)
+        self.turnPID = PID(0.1, 0, 0)
+        self.startPosition = simulationState.robotPosition
+
+    def simulateTick(self, simulationState: SimulationState) -> ControllerInputState:
+        distance, heading, _ = self.parent.pieces[self.pieceIndex]
+
+        currentDistance = (simulationState.robotPosition - self.startPosition).magnitude(Ref.FIELD)
+        currentDistance *= -1 if self.parent.reversed else 1
+        velocity = self.distancePID.tick(distance - currentDistance)
+
+        headingError = Utility.deltaInHeading(heading, simulationState.robotHeading)
+        deltaVelocity = self.turnPID.tick(headingError)
+
+        isDone = False
+        if self.distancePID.isDone():
+            self.pieceIndex += 1
+            isDone = self.pieceIndex == len(self.parent.pieces)
+            if not isDone:
+                self._initPiece(simulationState)
+
+        return ControllerInputState(velocity + deltaVelocity, velocity - deltaVelocity, isDone)
+
 class ShootCommand(Command):
-    def __init__(self, parent):
+
+    __slots__ = ("image", "numSlider", "idleTicks", "maxIdleTicks")
+
+    OPCODE = RouteFile.OPCODE_SHOOT
+
+    DEFAULT_RPM = 3200
+    DEFAULT_DISKS = 3
+
+    def __init__(self, parent, record: CommandRecord = None):
 
         YELLOW = [[255, 235, 41], [240, 232, 145]]
-        super().__init__(parent, YELLOW)
+        super().__init__(parent, YELLOW, record = record)
 
         self.image = graphics.getImage("Images/Commands/shoot.png", 0.15)
 
         self.toggle = CommandToggle(self, ["Flywheel", "Cata"])
 
-        self.slider = CommandSlider(self, 2600, 3600, 1, "+/- RPM", 3200, -self.DELTA_SLIDER_Y)
+        self.slider = CommandSlider(self, 2600, 3600, 1, "+/- RPM", self.DEFAULT_RPM, -self.DELTA_SLIDER_Y)
 
-        self.numSlider = CommandSlider(self, 0, 3, 1, "# of disks", 3, self.DELTA_SLIDER_Y)
-        
+        self.numSlider = CommandSlider(self, 0, 3, 1, "# of disks", self.DEFAULT_DISKS, self.DELTA_SLIDER_Y)
+        self.loadRecord()
+
+    @staticmethod
+    def newRecord() -> CommandRecord:
+        return CommandRecord(slider = ShootCommand.DEFAULT_RPM, slider2 = ShootCommand.DEFAULT_DISKS)
+
+    # slider is the rpm, and slider2 the number of disks
+    def loadRecord(self):
+        super().loadRecord()
+        if self.record.slider2 is not None:
+            self.numSlider.setValue(self.record.slider2, disableCallback = True)
+
+    def saveRecord(self):
+        super().saveRecord()
+        self.record.slider2 = self.numSlider.getValue()
 
     def getIcon(self) -> pygame.Surface:
         return self.image
@@ -536,6 +830,10 @@ class ShootCommand(Command):
         else:
             return f"shoot(robot, {self.numSlider.getValue()});"
 
+    # a: number of disks, c: flywheel rpm
+    def getRouteRecord(self) -> tuple:
+        return self.toggle.get(int), 0, int(self.numSlider.getValue()), 0, int(self.slider.getValue())
+
     def initSimulationController(self, simulationState: SimulationState):
         # temporarily, this controller just does nothing for 20 ticks
         self.idleTicks = 0
@@ -4,6 +4,7 @@ from MouseInterfaces.Hoverable import Hoverable
 from Commands.Command import Command, CommandSlider, CommandToggle, CommandAddon
 from SingletonState.UserInput import UserInput
 import graphics, Utility, pygame, colors, texteditor
+import Export.RouteFile as RouteFile
 from typing import Iterable
 
 from Simulation.ControllerInputState import ControllerInputState
@@ -30,6 +31,12 @@ class DeleteButton(Clickable, CommandAddon):
         self.x = x + self.dx
         self.y = y + self.dy
 
+    def getDrawBounds(self) -> tuple:
+        return self.parent.getDrawBounds()
+
+    def getLinkedHoverables(self) -> list[Hoverable]:
+        return [self.parent]
+
     def click(self):
         #print(type(self.parent))
         self.program.deleteCommand(self.parent)
@@ -118,6 +125,12 @@ class Textbox(Clickable, CommandAddon):
         self.x = commandX + 70
         self.y = commandY + Command.COMMAND_HEIGHT // 2 - self.height / 2
 
+    def getDrawBounds(self) -> tuple:
+        return self.parent.getDrawBounds()
+
+    def getLinkedHoverables(self) -> list[Hoverable]:
+        return [self.parent]
+
     def checkIfHovering(self, userInput: UserInput) -> bool:
 
         mx, my = userInput.mousePosition.screenRef
@@ -182,6 +195,7 @@ class CodeCommand(CustomCommand):
 
     commandColors = [[181, 51, 255], [209, 160, 238]]
     text = "code"
+    OPCODE = RouteFile.OPCODE_CODE
 
     def __init__(self, program, nextCustomCommand = None, text = "// [insert code here]"):
 
@@ -203,6 +217,13 @@ class CodeCommand(CustomCommand):
     def getCode(self) -> str:
         return "\n" + self.textbox.code + "\n"
 
+    # a and b are filled in with the position of the text in the route file
+    def getRouteRecord(self) -> tuple:
+        return 0, 0, 0, 0, 0
+
+    def getRouteText(self) -> str:
+        return self.textbox.code
+
     def isAddOnsHovering(self) -> bool:
         return super().isAddOnsHovering() or self.textbox.isHovering
 
@@ -211,6 +232,7 @@ class TimeCommand(CustomCommand):
 
     commandColors = [[120, 120, 120], [195, 195, 195]]
     text = "time"
+    OPCODE = RouteFile.OPCODE_TIME
 
     def __init__(self, program, nextCustomCommand = None, time = 1):
 
@@ -237,10 +259,15 @@ class TimeCommand(CustomCommand):
         num = int(self.slider.getValue() * 1000)
         return f"pros::delay({num});"
 
+    # a: delay
+    def getRouteRecord(self) -> tuple:
+        return 0, 0, RouteFile.toMilliseconds(self.slider.getValue()), 0, 0
+
 class IntakeCommand(CustomCommand):
 
     commandColors = [[248, 128, 34], [251, 172, 110]]
     text = "intake"
+    OPCODE = RouteFile.OPCODE_INTAKE
 
     def __init__(self, program, nextCustomCommand = None, intakeSpeed = 1):
 
@@ -260,11 +287,15 @@ class IntakeCommand(CustomCommand):
     def getCode(self) -> str:
         return f"setEffort(*robot.intake, {round(self.slider.getValue(), 2)});"
 
+    def getRouteRecord(self) -> tuple:
+        return 0, RouteFile.toSpeed(self.slider.getValue()), 0, 0, 0
+
 
 class RollerCommand(CustomCommand):
 
     commandColors = [[255, 86, 242], [251, 147, 243]]
     text = "roller"
+    OPCODE = RouteFile.OPCODE_ROLLER
 
     def __init__(self, program, nextCustomCommand = None, rollerSpeed = 0):
 
@@ -285,10 +316,15 @@ class RollerCommand(CustomCommand):
         else:   
             return f"\nrobot.roller->move_velocity({self.slider.getValue() * 100});\n"
 
+    # speed 0 brakes the roller
+    def getRouteRecord(self) -> tuple:
+        return 0, RouteFile.toSpeed(self.slider.getValue()), 0, 0, 0
+
 class FlapCommand(CustomCommand):
 
     commandColors = [[34, 245, 231], [152, 237, 232]]
     text = "flap"
+    OPCODE = RouteFile.OPCODE_FLAP
 
     def __init__(self, program, nextCustomCommand = None, flapUp = 0):
 
@@ -312,11 +348,16 @@ class FlapCommand(CustomCommand):
 
         return f"\nrobot.shooterFlap->set_value({value});"
 
+    # option 1 is up
+    def getRouteRecord(self) -> tuple:
+        return self.toggle.activeOption, 0, 0, 0, 0
+
 
 class DoRollerCommand(CustomCommand):
 
     commandColors = [[117, 61, 61], [201, 167, 167]]
     text = "backIntoRoller"
+    OPCODE = RouteFile.OPCODE_DO_ROLLER
 
     def __init__(self, program, nextCustomCommand = None):
 
@@ -349,4 +390,8 @@ class DoRollerCommand(CustomCommand):
 
         return string
 
+    # a: extra time to keep backing into the roller after it is detected
+    def getRouteRecord(self) -> tuple:
+        return 0, 0, RouteFile.toMilliseconds(self.slider.getValue()), 0, 0
+
 
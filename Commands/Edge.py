@@ -1,15 +1,19 @@
 from abc import ABC, abstractmethod
-from SingletonState.ReferenceFrame import PointRef, Ref, VectorRef
+from SingletonState.ReferenceFrame import PointRef, Ref, VectorRef, ScalarRef
 from SingletonState.UserInput import UserInput
 from MouseInterfaces.Hoverable import Hoverable
 from MouseInterfaces.Draggable import Draggable
-from Commands.Command import Command, StraightCommand, CurveCommand
+from Commands.Command import Command, CommandRecord, StraightCommand, CurveCommand, BezierCommand
 from Commands.Node import Node
-import pygame, pygame.gfxdraw, colors, graphics, Utility, math, Arc
+import pygame, pygame.gfxdraw, colors, graphics, Utility, math, Arc, BezierCurves
+import numpy as np
 from typing import Tuple
 
 # Edges are not draggable. even curved edges are completely determined by node positions and starting theta
 class Edge(Hoverable, ABC):
+
+    __slots__ = ("program", "previous", "next", "beforeHeading", "afterHeading", "command")
+
     def __init__(self, program, command: Command, previous: Node = None, next: Node = None):
         super().__init__()
         self.program = program
@@ -30,6 +34,13 @@ class Edge(Hoverable, ABC):
     def drawHovered(self, screen: pygame.Surface):
         pass
 
+    def getLinkedHoverables(self) -> list[Hoverable]:
+        return [] if self.command is None else [self.command]
+
+    # Whether the edge is a straight line. Dragging its nodes keeps straight edges straight
+    def isStraight(self) -> bool:
+        return False
+
     @abstractmethod
     def draw(screen: pygame.Surface):
         pass
@@ -37,6 +48,8 @@ class Edge(Hoverable, ABC):
 # A draggable point used to set heading1 of StraightEge
 class HeadingPoint(Draggable):
 
+    __slots__ = ("program", "edge", "drawRadius", "drawRadiusBig", "hoverRadius", "distanceToNode", "heading", "position", "isDragging")
+
     def __init__(self, program, edge, heading = None):
         super().__init__()
 
@@ -66,8 +79,11 @@ class HeadingPoint(Draggable):
         
         self.heading = Utility.thetaTwoPoints(self.edge.previous.position.fieldRef, userInput.mousePosition.fieldRef)
 
+        fro = self.edge.previous.position.fieldRef
+        to = self.edge.next.position.fieldRef
+
         # limit maximum arc length to 300 inches
-        if Arc.Arc(self.edge.previous.position, self.edge.next.position, self.heading).arcLengthField > 300:
+        if Arc.arcLengthAndHeading(*fro, *to, self.heading)[0] > 300:
             return
 
         # Snap to straight edge if sufficiently close
@@ -84,15 +100,13 @@ class HeadingPoint(Draggable):
 
         # Snap to heading of next edge if suffiently close
         nextEdge: 'StraightEdge' = self.edge.next.next
-        heading2 = Arc.Arc(self.edge.previous.position, self.edge.next.position, self.heading).heading2
+        heading2 = Arc.arcLengthAndHeading(*fro, *to, self.heading)[1]
         if not shiftPressed and nextEdge is not None:
+            dx = to[0] - fro[0]
+            dy = to[1] - fro[1]
             if Utility.headingDiff(nextEdge.beforeHeading, heading2) < 0.12:
-                dx = self.edge.next.position.fieldRef[0] - self.edge.previous.position.fieldRef[0]
-                dy = self.edge.next.position.fieldRef[1] - self.edge.previous.position.fieldRef[1]
                 self.heading = Utility.thetaFromArc(nextEdge.beforeHeading, dx, dy)
             elif Utility.headingDiff(nextEdge.beforeHeading + 3.1415, heading2) < 0.12:
-                dx = self.edge.next.position.fieldRef[0] - self.edge.previous.position.fieldRef[0]
-                dy = self.edge.next.position.fieldRef[1] - self.edge.previous.position.fieldRef[1]
                 self.heading = Utility.thetaFromArc(nextEdge.beforeHeading + 3.1415, dx, dy)
         
         self.compute()
@@ -101,6 +115,13 @@ class HeadingPoint(Draggable):
     def checkIfHovering(self, userInput: UserInput) -> bool:
         return Utility.distanceTuples(self.position.screenRef, userInput.mousePosition.screenRef) < self.hoverRadius
 
+    def getHoverBounds(self) -> tuple:
+        x, y = self.position.screenRef
+        return x - self.hoverRadius, y - self.hoverRadius, x + self.hoverRadius, y + self.hoverRadius
+
+    def getDrawBounds(self) -> tuple:
+        return graphics.getLineBounds(*self.edge.previous.position.screenRef, *self.position.screenRef, self.drawRadiusBig + 1)
+
     def draw(self, screen: pygame.Surface):
         graphics.drawThinLine(screen, colors.RED, *self.edge.previous.position.screenRef, *self.position.screenRef)
         r = self.drawRadiusBig if self.isHovering else self.drawRadius
@@ -110,13 +131,23 @@ class HeadingPoint(Draggable):
 
 # linear
 class StraightEdge(Edge):
+
+    __slots__ = ("straightRecord", "curveRecord", "_straightCommand", "_curveCommand", "distance", "distanceStr", "arc",
+        "headingPoint", "reversed", "straightHeading", "goalBeforeHeading", "goalBeforeHeadingStr", "goalHeading",
+        "goalHeadingStr", "goalRadius", "goalRadiusStr", "arcFieldPoints", "arcFieldPointsZoom", "arcPoints", "arcPointsVersion")
+
     def __init__(self, program, previous: Node = None, next: Node = None, heading1: float = None):
 
         self.program = program
-        self.straightCommand: StraightCommand = StraightCommand(self)
-        self.curveCommand: CurveCommand = CurveCommand(self)
 
-        super().__init__(program, self.straightCommand, previous = previous, next = next)
+        # Only the command for whether the arc is straight or curved is created, in compute(). The parameters of both
+        # are kept in their records, so switching back and forth keeps them
+        self.straightRecord: CommandRecord = StraightCommand.newRecord()
+        self.curveRecord: CommandRecord = CurveCommand.newRecord()
+        self._straightCommand: StraightCommand = None
+        self._curveCommand: CurveCommand = None
+
+        super().__init__(program, None, previous = previous, next = next)
         self.distance: float = None
         self.arc: Arc.Arc = Arc.Arc()
         self.headingPoint: HeadingPoint = HeadingPoint(program, self, heading1)
@@ -126,6 +157,27 @@ class StraightEdge(Edge):
         self.distance = None
         self.straightHeading = None
 
+        # Cached tessellation of the arc. The field points only depend on the geometry and zoom (which sets the number
+        # of segments), while the screen points are reconverted whenever the FieldTransform version changes.
+        # Cleared whenever the geometry is recomputed
+        self.arcFieldPoints = None
+        self.arcFieldPointsZoom = None
+        self.arcPoints = None
+        self.arcPointsVersion = None
+
+
+    # Created the first time it is needed
+    @property
+    def straightCommand(self) -> StraightCommand:
+        if self._straightCommand is None:
+            self._straightCommand = StraightCommand(self, self.straightRecord)
+        return self._straightCommand
+
+    @property
+    def curveCommand(self) -> CurveCommand:
+        if self._curveCommand is None:
+            self._curveCommand = CurveCommand(self, self.curveRecord)
+        return self._curveCommand
 
     def getMidpoint(self) -> PointRef:
         return self.previous.position + (self.next.position - self.previous.position) * 0.5
@@ -134,6 +186,9 @@ class StraightEdge(Edge):
         self.reversed = not self.reversed
         self.program.recompute()
 
+    def isStraight(self) -> bool:
+        return self.arc.isStraight
+
     def compute(self) -> float:
 
         self.straightHeading = Utility.thetaTwoPoints(self.previous.position.fieldRef, self.next.position.fieldRef)
@@ -157,11 +212,44 @@ class StraightEdge(Edge):
 
         self.command = self.straightCommand if self.arc.isStraight else self.curveCommand
 
+        self.arcFieldPoints = None
+        self.arcPoints = None
+
         return self.afterHeading
 
+    # Return the tessellated arc in screen coordinates, only recomputing it after the geometry, zoom or pan changes
+    def getArcPoints(self):
+
+        transform = self.previous.position.transform
+
+        if self.arcFieldPoints is None or self.arcFieldPointsZoom != transform.zoom:
+            sweep = Utility.deltaInHeadingParity(self.arc.theta2, self.arc.theta1, self.arc.parity)
+            self.arcFieldPoints = self.arc.getFieldPoints(graphics.getArcSegmentCount(self.arc.radius.screenRef, sweep))
+            self.arcFieldPointsZoom = transform.zoom
+            self.arcPoints = None
+
+        if self.arcPoints is None or self.arcPointsVersion != transform.version:
+            self.arcPoints = transform.fieldToScreen(self.arcFieldPoints)
+            self.arcPointsVersion = transform.version
+
+        return self.arcPoints
+
     def checkIfHovering(self, userInput: UserInput) -> bool:
         return self.arc.isTouching(userInput.mousePosition)
 
+    def getHoverBounds(self) -> tuple:
+        return self.arc.getScreenBounds(13) # same hitbox thickness as Arc.isTouching()
+
+    # The arc, heading point and distance label, and the guide lines when hovered
+    def getDrawBounds(self) -> tuple:
+        x, y = self.getMidpoint().screenRef
+        LABEL_SIZE = 30
+        bounds = [self.arc.getScreenBounds(4), self.headingPoint.getDrawBounds(), (x - LABEL_SIZE, y - LABEL_SIZE, x + LABEL_SIZE, y + LABEL_SIZE)]
+        if self.isHovering:
+            bounds.append(graphics.getGuideLineBounds(*self.next.position.screenRef, self.afterHeading))
+            bounds.append(graphics.getGuideLineBounds(*self.previous.position.screenRef, self.beforeHeading))
+        return graphics.unionBounds(*bounds)
+
     def getClosestPoint(self, position: PointRef) -> PointRef:
         positionOnSegment = Utility.pointOnLineClosestToPoint(*position.fieldRef, *self.previous.position.fieldRef, *self.next.position.fieldRef)
         return PointRef(Ref.FIELD, positionOnSegment)
@@ -191,7 +279,7 @@ class StraightEdge(Edge):
         if self.arc.isStraight: # draw line
             graphics.drawLine(screen, color, *self.previous.position.screenRef, *self.next.position.screenRef, thick)
         else: # draw curve
-            graphics.drawArc(screen, color, self.arc.center.screenRef, self.arc.radius.screenRef, self.arc.theta1, self.arc.theta2, self.arc.parity, thick+1)
+            graphics.drawPolyline(screen, color, self.getArcPoints(), thick+1)
 
         if drawHeadingPoint:
             self.headingPoint.draw(screen)
@@ -201,3 +289,262 @@ class StraightEdge(Edge):
             midpoint = self.getMidpoint().screenRef
             heading = (self.beforeHeading + self.afterHeading) / 2
             graphics.drawTextRotate(screen, graphics.FONT15, self.distanceStr, colors.BLACK, *midpoint, heading)
+
+
+# A draggable point at the end of one of the control vectors of a BezierEdge, off the node that vector is relative to
+class ControlPoint(Draggable):
+
+    __slots__ = ("program", "edge", "index", "drawRadius", "drawRadiusBig", "hoverRadius", "position", "isDragging")
+
+    def __init__(self, program, edge, index: int):
+        super().__init__()
+
+        self.program = program
+        self.edge: 'BezierEdge' = edge
+        self.index = index # 1 for controlVector1 off edge.previous, 2 for controlVector2 off edge.next
+
+        self.drawRadius = 4
+        self.drawRadiusBig = 5
+        self.hoverRadius = 20
+
+    def getNode(self) -> Node:
+        return self.edge.previous if self.index == 1 else self.edge.next
+
+    def compute(self):
+        self.position: PointRef = PointRef(Ref.FIELD, tuple(self.edge.controlPoints[self.index].tolist()))
+
+    def beDraggedByMouse(self, userInput: UserInput):
+
+        shiftPressed = userInput.isKeyPressing(pygame.K_LSHIFT)
+
+        node = self.getNode()
+        other = self.edge.next if self.index == 1 else self.edge.previous
+        vector = userInput.mousePosition - node.position
+        heading = Utility.thetaTwoPoints(node.position.fieldRef, userInput.mousePosition.fieldRef)
+        snappedHeading = None
+
+        # Snap to pointing straight at the other node if sufficiently close
+        straightHeading = Utility.thetaTwoPoints(node.position.fieldRef, other.position.fieldRef)
+        if not shiftPressed and Utility.headingDiff(straightHeading, heading) < 0.12:
+            snappedHeading = straightHeading
+
+        # Snap to the heading of the edge on the other side of the node, so the path is smooth through it
+        if self.index == 1:
+            neighbor: Edge = node.previous
+            neighborHeading = None if neighbor is None else neighbor.afterHeading
+        else:
+            neighbor: Edge = node.next
+            neighborHeading = None if neighbor is None else neighbor.beforeHeading + 3.1415
+        if not shiftPressed and neighborHeading is not None:
+            if Utility.headingDiff(neighborHeading, heading) < 0.12:
+                snappedHeading = neighborHeading
+            elif Utility.headingDiff(neighborHeading + 3.1415, heading) < 0.12:
+                snappedHeading = neighborHeading + 3.1415
+
+        # Keep the handle off the node, so it can still be grabbed and still shows which way the curve leaves
+        magnitude = vector.magnitude(Ref.FIELD)
+        if snappedHeading is not None or magnitude < BezierEdge.MIN_HANDLE_LENGTH:
+            heading = heading if snappedHeading is None else snappedHeading
+            vector = VectorRef(Ref.FIELD, magnitude = max(magnitude, BezierEdge.MIN_HANDLE_LENGTH), heading = heading)
+
+        scale = 1 + BezierCurves.VECTOR_STRENGTH
+        vector = (vector.fieldRef[0] / scale, vector.fieldRef[1] / scale)
+        if self.index == 1:
+            self.edge.controlVector1 = vector
+        else:
+            self.edge.controlVector2 = vector
+
+        self.program.recompute()
+
+    def checkIfHovering(self, userInput: UserInput) -> bool:
+        return Utility.distanceTuples(self.position.screenRef, userInput.mousePosition.screenRef) < self.hoverRadius
+
+    def getHoverBounds(self) -> tuple:
+        x, y = self.position.screenRef
+        return x - self.hoverRadius, y - self.hoverRadius, x + self.hoverRadius, y + self.hoverRadius
+
+    def getDrawBounds(self) -> tuple:
+        return graphics.getLineBounds(*self.getNode().position.screenRef, *self.position.screenRef, self.drawRadiusBig + 1)
+
+    def draw(self, screen: pygame.Surface):
+        graphics.drawThinLine(screen, colors.RED, *self.getNode().position.screenRef, *self.position.screenRef)
+        r = self.drawRadiusBig if self.isHovering else self.drawRadius
+        graphics.drawCircle(screen, *self.position.screenRef, colors.RED, r)
+
+
+# Cubic bezier curve from previous to next, shaped by two control vectors (field inches) relative to each node.
+# Created from a StraightEdge with Program.toggleBezier(), and driven as a sequence of straight pieces by BezierCommand
+class BezierEdge(Edge):
+
+    __slots__ = ("bezierRecord", "_bezierCommand", "controlVector1", "controlVector2", "controlPoint1", "controlPoint2",
+        "controlPoints", "arcLengthTable", "distance", "distanceStr", "maxCurvature", "turn", "pieces", "reversed",
+        "goalBeforeHeading", "goalHeading", "goalHeadingStr", "fieldPoints", "fieldPointsZoom", "points", "pointsVersion")
+
+    HOVER_DISTANCE = 13 # same hitbox thickness as Arc.isTouching()
+    MAX_PIECE_TURN = 0.26 # most the heading changes along one of the straight pieces the curve is driven as, in radians
+    MIN_HANDLE_LENGTH = 1 # shortest distance in inches from a node to its control point, when dragged or created
+
+    def __init__(self, program, previous: Node = None, next: Node = None, controlVector1: tuple = (0, 0), controlVector2: tuple = (0, 0)):
+
+        self.program = program
+
+        # Like the commands of StraightEdge, created the first time it is needed
+        self.bezierRecord: CommandRecord = BezierCommand.newRecord()
+        self._bezierCommand: BezierCommand = None
+
+        super().__init__(program, None, previous = previous, next = next)
+
+        self.controlVector1 = controlVector1
+        self.controlVector2 = controlVector2
+        self.controlPoint1: ControlPoint = ControlPoint(program, self, 1)
+        self.controlPoint2: ControlPoint = ControlPoint(program, self, 2)
+
+        self.reversed = False
+
+        self.controlPoints: np.ndarray = None
+        self.arcLengthTable: BezierCurves.ArcLengthTable = None
+        self.distance: float = None
+        self.maxCurvature: float = None
+        self.turn: float = None # total change in heading along the curve, positive counterclockwise
+        self.pieces: list[tuple] = None
+
+        # Cached tessellation, same scheme as StraightEdge: field points per zoom, screen points per FieldTransform version
+        self.fieldPoints = None
+        self.fieldPointsZoom = None
+        self.points = None
+        self.pointsVersion = None
+
+    @property
+    def bezierCommand(self) -> BezierCommand:
+        if self._bezierCommand is None:
+            self._bezierCommand = BezierCommand(self, self.bezierRecord)
+        return self._bezierCommand
+
+    def toggleReversed(self):
+        self.reversed = not self.reversed
+        self.program.recompute()
+
+    def compute(self) -> float:
+
+        self.controlPoints = BezierCurves.getControlPoints(self.previous.position.fieldRef, self.controlVector1, self.controlVector2, self.next.position.fieldRef)
+        self.arcLengthTable = BezierCurves.ArcLengthTable(self.controlPoints)
+        self.distance = (-1 if self.reversed else 1) * self.arcLengthTable.length
+        self.distanceStr = str(round(self.distance,1)) + "\""
+
+        self.controlPoint1.compute()
+        self.controlPoint2.compute()
+
+        # curvature between each pair of samples of the arc length table, to add up how much the heading changes
+        curvatures = BezierCurves.getCurvatures(self.arcLengthTable.t, self.controlPoints)
+        self.maxCurvature = float(np.abs(curvatures).max())
+        turns = (curvatures[1:] + curvatures[:-1]) / 2 * np.diff(self.arcLengthTable.distance)
+        self.turn = float(turns.sum())
+
+        self.beforeHeading, self.afterHeading = BezierCurves.getHeadings([0, 1], self.controlPoints).tolist()
+
+        invert = 3.1415 if self.reversed else 0
+        self.goalBeforeHeading = self.beforeHeading + invert
+        self.goalHeading = self.afterHeading + invert
+        self.goalHeadingStr = Utility.headingToString(self.goalHeading)
+
+        # (signed distance, goal heading, end point) of each straight piece, evenly spaced along the curve
+        numberPieces = max(1, math.ceil(float(np.abs(turns).sum()) / self.MAX_PIECE_TURN))
+        points = BezierCurves.getPoints(self.arcLengthTable.evenlySpacedT(numberPieces), self.controlPoints).tolist()
+        self.pieces = []
+        for start, end in zip(points[:-1], points[1:]):
+            distance = (-1 if self.reversed else 1) * Utility.distanceTuples(start, end)
+            self.pieces.append((distance, Utility.thetaTwoPoints(start, end) + invert, tuple(end)))
+
+        self.command = self.bezierCommand
+
+        self.fieldPoints = None
+        self.points = None
+
+        return self.afterHeading
+
+    # Field points evenly spaced along the curve, with enough segments to stay within graphics.ARC_TOLERANCE pixels at this zoom
+    def getFieldPoints(self) -> np.ndarray:
+
+        zoom = self.previous.position.transform.zoom
+        if self.fieldPoints is None or self.fieldPointsZoom != zoom:
+            if self.maxCurvature > 1e-9:
+                # treat the whole curve as if it were an arc of its tightest radius
+                radius = ScalarRef(Ref.FIELD, 1 / self.maxCurvature).screenRef
+                numberLines = graphics.getArcSegmentCount(radius, self.arcLengthTable.length * self.maxCurvature)
+            else:
+                numberLines = 1
+            self.fieldPoints = BezierCurves.getPoints(self.arcLengthTable.evenlySpacedT(numberLines), self.controlPoints)
+            self.fieldPointsZoom = zoom
+            self.points = None
+
+        return self.fieldPoints
+
+    # Return the tessellated curve in screen coordinates, only recomputing it after the geometry, zoom or pan changes
+    def getPoints(self) -> np.ndarray:
+
+        transform = self.previous.position.transform
+        fieldPoints = self.getFieldPoints()
+        if self.points is None or self.pointsVersion != transform.version:
+            self.points = transform.fieldToScreen(fieldPoints)
+            self.pointsVersion = transform.version
+
+        return self.points
+
+    def getMidpoint(self) -> PointRef:
+        t = self.arcLengthTable.tAtDistance(self.arcLengthTable.length / 2)
+        return PointRef(Ref.FIELD, tuple(BezierCurves.getPoints(t, self.controlPoints).tolist()))
+
+    def checkIfHovering(self, userInput: UserInput) -> bool:
+        return Utility.closestPointOnPolyline(self.getPoints(), *userInput.mousePosition.screenRef)[2] <= self.HOVER_DISTANCE
+
+    def getHoverBounds(self) -> tuple:
+        points = self.getPoints()
+        x1, y1 = points.min(axis = 0)
+        x2, y2 = points.max(axis = 0)
+        return x1 - self.HOVER_DISTANCE, y1 - self.HOVER_DISTANCE, x2 + self.HOVER_DISTANCE, y2 + self.HOVER_DISTANCE
+
+    # The curve lies within the convex hull of its control points, which are also where the handles are drawn
+    def getDrawBounds(self) -> tuple:
+        controlPoints = self.previous.position.transform.fieldToScreen(self.controlPoints)
+        x1, y1 = controlPoints.min(axis = 0)
+        x2, y2 = controlPoints.max(axis = 0)
+        x, y = self.getMidpoint().screenRef
+        LABEL_SIZE = 30
+        bounds = [(x1 - 6, y1 - 6, x2 + 6, y2 + 6), self.getHoverBounds(), (x - LABEL_SIZE, y - LABEL_SIZE, x + LABEL_SIZE, y + LABEL_SIZE)]
+        if self.isHovering:
+            bounds.append(graphics.getGuideLineBounds(*self.next.position.screenRef, self.afterHeading))
+            bounds.append(graphics.getGuideLineBounds(*self.previous.position.screenRef, self.beforeHeading))
+        return graphics.unionBounds(*bounds)
+
+    def getClosestPoint(self, position: PointRef) -> PointRef:
+        points = self.getFieldPoints()
+        index, fraction, distance = Utility.closestPointOnPolyline(points, *position.fieldRef)
+        return PointRef(Ref.FIELD, tuple((points[index] + fraction * (points[index+1] - points[index])).tolist()))
+
+    def drawHovered(self, screen: pygame.Surface):
+        graphics.drawGuideLine(screen, colors.GREEN, *self.next.position.screenRef, self.afterHeading)
+        graphics.drawGuideLine(screen, colors.RED, *self.previous.position.screenRef, self.beforeHeading)
+
+    def draw(self, screen: pygame.Surface, drawHeadingPoint: bool):
+
+        isHovering = self.isHovering or self.command.isAnyHovering()
+
+        if isHovering:
+            color = [120, 60, 0] if self.reversed else [0,0,100]
+            thick = 4
+        else:
+            color = [220, 110, 0] if self.reversed else [0, 0, 200]
+            thick = 3
+
+        graphics.drawPolyline(screen, color, self.getPoints(), thick+1)
+
+        # Draw the control points as handles off each node
+        if drawHeadingPoint:
+            self.controlPoint1.draw(screen)
+            self.controlPoint2.draw(screen)
+
+        # Draw distance label text
+        if isHovering:
+            midpoint = self.getMidpoint().screenRef
+            heading = (self.beforeHeading + self.afterHeading) / 2
+            graphics.drawTextRotate(screen, graphics.FONT15, self.distanceStr, colors.BLACK, *midpoint, heading)
@@ -3,10 +3,13 @@ from SingletonState.ReferenceFrame import PointRef, Ref, VectorRef
 from SingletonState.UserInput import UserInput
 from MouseInterfaces.Draggable import Draggable
 import pygame, graphics, Utility, colors, math
-from Commands.Command import Command, TurnCommand, ShootCommand
+from Commands.Command import Command, CommandRecord, TurnCommand, ShootCommand
 
 class Node(Draggable, ABC):
 
+    __slots__ = ("previous", "next", "program", "position", "hoverRadius", "commandRecord", "_command", "direction",
+        "goalHeading", "goalHeadingStr", "startMousePosition", "startNodePosition", "isDragging")
+
     def __init__(self, program, position: PointRef, hoverRadius: int, previous: 'Edge' = None, next: 'Edge' = None):
 
         super().__init__()
@@ -18,15 +21,44 @@ class Node(Draggable, ABC):
         self.position: PointRef = position.copy()
         self.hoverRadius = hoverRadius
 
+        # The turn command is only created once it is shown, when the node turns. Until then its parameters are kept
+        # in the record
+        self.commandRecord: CommandRecord = TurnCommand.newRecord()
+        self._command: TurnCommand = None
 
-        self.command: Command = TurnCommand(self)
+    @property
+    def command(self) -> TurnCommand:
+        if self._command is None:
+            self._command = TurnCommand(self, record = self.commandRecord)
+        return self._command
 
+    # Whether the turn command or its toggle is hovered, without creating it
+    def isCommandHovering(self) -> bool:
+        return self._command is not None and self._command.isAnyHovering()
 
     # Called to determine if the mouse is touching this object (and if is the first object touched, would be considered hovered)
     def checkIfHovering(self, userInput: UserInput) -> bool:
         distance = Utility.distanceTuples(self.position.screenRef, userInput.mousePosition.screenRef)
         return distance < self.hoverRadius
 
+    def getHoverBounds(self) -> tuple:
+        x, y = self.position.screenRef
+        return x - self.hoverRadius, y - self.hoverRadius, x + self.hoverRadius, y + self.hoverRadius
+
+    # The node itself, and its guide lines when hovered
+    def getDrawBounds(self) -> tuple:
+        bounds = [self.getHoverBounds()]
+        if self.isHovering:
+            x, y = self.position.screenRef
+            if self.next is not None:
+                bounds.append(graphics.getGuideLineBounds(x, y, self.next.beforeHeading))
+            if self.previous is not None:
+                bounds.append(graphics.getGuideLineBounds(x, y, self.previous.afterHeading))
+        return graphics.unionBounds(*bounds)
+
+    def getLinkedHoverables(self) -> list:
+        return [] if self._command is None else [self._command]
+
     # Callback when the dragged object was just released
     def stopDragging(self):
         pass
@@ -65,18 +97,18 @@ class Node(Draggable, ABC):
         snapped = False
 
         # For straight edges only, snap to shoot heading of previous node
-        if not shiftPressed and self.previous is not None and self.previous.arc.isStraight:
+        if not shiftPressed and self.previous is not None and self.previous.isStraight():
             node: Node = self.previous.previous
             if node.previous is not None and node.shoot.active:
                 snapped = snapped or self._snapToPosition(node, node.shoot.heading)
 
         # For straight edges only, snap to shoot heading of next node
-        if not shiftPressed and self.next is not None and self.next.arc.isStraight and self.next.next.shoot.active:
+        if not shiftPressed and self.next is not None and self.next.isStraight() and self.next.next.shoot.active:
             nextNode = self.next.next
             snapped = snapped or self._snapToPosition(nextNode, nextNode.shoot.heading)
 
         # For straight edges only, snap to previous heading if close. Only for third node onward
-        if not shiftPressed and self.previous is not None and self.previous.arc.isStraight:
+        if not shiftPressed and self.previous is not None and self.previous.isStraight():
             prevNode: Node = self.previous.previous
             if prevNode.previous is not None:
                 snapped = snapped or self._snapToPosition(prevNode, prevNode.previous.afterHeading)
@@ -84,7 +116,7 @@ class Node(Draggable, ABC):
                 snapped = snapped or self._snapToPosition(prevNode, prevNode.startHeading)
 
         # For straight edges only, snap to next heading if close
-        if not shiftPressed and self.next is not None and self.next.arc.isStraight:
+        if not shiftPressed and self.next is not None and self.next.isStraight():
 
             nextNode = self.next.next
 
@@ -95,22 +127,22 @@ class Node(Draggable, ABC):
         if not shiftPressed and not snapped:
 
             # Snap previous edge to cardinal direction
-            if self.previous is not None and self.previous.arc.isStraight:
+            if self.previous is not None and self.previous.isStraight():
                 prevNode = self.previous.previous
                 snapped = snapped or self._snapToPosition(prevNode, 0)
                 snapped = snapped or self._snapToPosition(prevNode, 3.1415/2)
 
             # Snap next edge to cardinal direction
-            if not snapped and self.next is not None and self.next.arc.isStraight:
+            if not snapped and self.next is not None and self.next.isStraight():
                 nextNode = self.next.next
                 snapped = snapped or self._snapToPosition(nextNode, 0)
                 snapped = snapped or self._snapToPosition(nextNode, 3.1415/2)
 
         # For straight edges, change the heading of the edge rather than the arc's curvature (to maintain straightness)
-        if self.previous is not None and self.previous.arc.isStraight:
+        if self.previous is not None and self.previous.isStraight():
             self.previous.headingPoint.setStraight()
             
-        if self.next is not None and self.next.arc.isStraight:
+        if self.next is not None and self.next.isStraight():
             self.next.headingPoint.setStraight()
 
         self.program.recompute()
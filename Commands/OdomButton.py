@@ -27,5 +27,5 @@ class OdomButton(FlipFlopButton):
         self.program.state.useOdom = not self.program.state.useOdom
         self.program.recomputeGeneratedCode()
 
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
-        self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
+        return self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
@@ -0,0 +1,103 @@
+from Commands.ArcLengthIndex import ArcLengthIndex
+import math, heapq
+
+"""
+A bounding volume hierarchy over the edges of the path, for finding the point on the whole path closest to a point.
+
+Each edge (line, arc or sampled curve) is boxed with ArcLengthIndex.getEdgeBounds(), and the boxes are recursively
+split in half along their longer axis until at most LEAF_SIZE edges remain. nearest() visits boxes closest-first and
+stops as soon as the nearest remaining box is farther than the best point found, so a query only tests the few edges
+near the point.
+
+Like HoverGrid, the tree does not know when the path changes. The owner passes a key describing the path it was built
+from and calls rebuild() whenever isValid() returns false.
+"""
+
+class PathBVH:
+
+    LEAF_SIZE = 4
+
+    def __init__(self):
+        self.key = None
+        self.index: ArcLengthIndex = None
+
+        # each node is (x1, y1, x2, y2, left, right, edges). Leaves have a list of edge indices, other nodes have children
+        self.nodes: list[tuple] = []
+
+    # Whether the tree was built from the path described by key
+    def isValid(self, key) -> bool:
+        return self.key is not None and self.key == key
+
+    def rebuild(self, index: ArcLengthIndex, key):
+
+        self.key = key
+        self.index = index
+        self.nodes = []
+
+        bounds = [index.getEdgeBounds(i) for i in range(len(index.edges))]
+        if len(bounds) > 0:
+            self._build(list(range(len(bounds))), bounds)
+
+    # Recursively add the node containing the given edges, and return its index in self.nodes
+    def _build(self, edges: list[int], bounds: list[tuple]) -> int:
+
+        x1 = min(bounds[i][0] for i in edges)
+        y1 = min(bounds[i][1] for i in edges)
+        x2 = max(bounds[i][2] for i in edges)
+        y2 = max(bounds[i][3] for i in edges)
+
+        node = len(self.nodes)
+        self.nodes.append(None)
+
+        if len(edges) <= self.LEAF_SIZE:
+            self.nodes[node] = (x1, y1, x2, y2, None, None, edges)
+            return node
+
+        # split at the median of the box centers along the longer axis
+        axis = 0 if x2 - x1 > y2 - y1 else 1
+        edges = sorted(edges, key = lambda i: bounds[i][axis] + bounds[i][axis+2])
+        middle = len(edges) // 2
+        left = self._build(edges[:middle], bounds)
+        right = self._build(edges[middle:], bounds)
+
+        self.nodes[node] = (x1, y1, x2, y2, left, right, None)
+        return node
+
+    # Distance from (x, y) to the box of a node, 0 if inside
+    def _boxDistance(self, node: int, x: float, y: float) -> float:
+        x1, y1, x2, y2 = self.nodes[node][:4]
+        return math.hypot(max(x1 - x, 0, x - x2), max(y1 - y, 0, y - y2))
+
+    # Return (edge index, distance along that edge, distance from (x, y)) for the closest point on the path,
+    # or None if the path is empty or no point is within maxDistance
+    def nearest(self, x: float, y: float, maxDistance: float = math.inf) -> tuple:
+
+        if len(self.nodes) == 0:
+            return None
+
+        best = None
+        bestDistance = maxDistance
+        heap = [(self._boxDistance(0, x, y), 0)]
+
+        while len(heap) > 0:
+
+            boxDistance, node = heapq.heappop(heap)
+            if boxDistance >= bestDistance:
+                break
+
+            x1, y1, x2, y2, left, right, edges = self.nodes[node]
+
+            if edges is None:
+                heapq.heappush(heap, (self._boxDistance(left, x, y), left))
+                heapq.heappush(heap, (self._boxDistance(right, x, y), right))
+                continue
+
+            for i in edges:
+                local = self.index.localDistanceAtPoint(i, x, y)
+                position = self.index.poseOnEdge(i, local)[0].fieldRef
+                distance = math.hypot(position[0] - x, position[1] - y)
+                if distance < bestDistance:
+                    best = (i, local, distance)
+                    bestDistance = distance
+
+        return best
@@ -0,0 +1,122 @@
+from Commands.Edge import StraightEdge
+import Commands.TurnNode as TurnNode
+from SingletonState.SoftwareState import SoftwareState, Mode
+import SingletonState.ReferenceFrame as ReferenceFrame
+import pygame, graphics, colors
+
+"""
+Draws the whole path for Program.drawPath() in a few batched calls, instead of calling draw() on every edge and node.
+
+The screen geometry of the path is computed all at once whenever the path or the FieldTransform changes: the outline
+of every straight edge from one vectorized pass over the node positions, and where every heading point and node marker
+goes. Drawing is then a loop of polygon calls for the edges and a single screen.blits() for each kind of marker.
+
+Anything hovered (or whose command is hovered) looks different, as do the start node and nodes that shoot, so those
+are left out of the batches and drawn with their own draw() on top.
+"""
+
+EDGE_THICKNESS = 3
+EDGE_COLOR = (0, 0, 200)
+REVERSED_EDGE_COLOR = (220, 110, 0)
+NODE_RADIUS = 5
+HEADING_POINT_RADIUS = 4
+
+class PathRenderer:
+
+    def __init__(self, program):
+        self.program = program
+        self.key = None
+
+    # Recompute the screen geometry of every edge and node
+    def _tessellate(self):
+
+        self.straightEdges: list[StraightEdge] = []
+        self.curvedEdges: list[StraightEdge] = []
+        self.otherEdges = [] # like BezierEdge, drawn with their own draw()
+        self.nodes = []
+
+        edge = self.program.first.next
+        while edge is not None:
+            if not isinstance(edge, StraightEdge):
+                self.otherEdges.append(edge)
+            elif edge.arc.isStraight:
+                self.straightEdges.append(edge)
+            else:
+                self.curvedEdges.append(edge)
+            self.nodes.append(edge.next)
+            edge = edge.next.next
+
+        # outlines of all the straight edges at once
+        transform = ReferenceFrame.transform
+        if len(self.straightEdges) > 0:
+            starts = transform.fieldToScreen([edge.previous.position.fieldRef for edge in self.straightEdges])
+            ends = transform.fieldToScreen([edge.next.position.fieldRef for edge in self.straightEdges])
+            self.quads = graphics.getThickLineQuads(starts, ends, EDGE_THICKNESS).tolist()
+        else:
+            self.quads = []
+        self.edgeColors = [REVERSED_EDGE_COLOR if edge.reversed else EDGE_COLOR for edge in self.straightEdges]
+
+        # heading points are drawn from the start of each edge
+        edges = self.straightEdges + self.curvedEdges
+        self.headingLines = [(edge.previous.position.screenRef, edge.headingPoint.position.screenRef) for edge in edges]
+        self.headingDots = [(int(x) - HEADING_POINT_RADIUS, int(y) - HEADING_POINT_RADIUS) for _, (x, y) in self.headingLines]
+
+        # (surface, top left corner) of the marker of each node: its turn direction, or a dot if it does not turn
+        self.markers = []
+        for node in self.nodes:
+            x, y = node.position.screenRef
+            if node.direction == 0:
+                self.markers.append((graphics.getDotSprite(colors.BLACK, NODE_RADIUS), (int(x) - NODE_RADIUS, int(y) - NODE_RADIUS)))
+            else:
+                image = TurnNode.turnCImage if node.direction == 1 else TurnNode.turnCCImage
+                self.markers.append((image, image.get_rect(center = (x, y)).topleft))
+
+    def _isEdgeHovering(self, edge) -> bool:
+        return edge.isHovering or edge.headingPoint.isHovering or edge.command.isAnyHovering()
+
+    def _isNodeSpecial(self, node) -> bool:
+        return node.isHovering or node.isCommandHovering() or node.shoot.active
+
+    def draw(self, screen: pygame.Surface, state: SoftwareState):
+
+        key = (self.program.pathVersion, ReferenceFrame.transform.version)
+        if key != self.key:
+            self._tessellate()
+            self.key = key
+
+        drawHeadingPoints = not state.mode == Mode.MOUSE_SELECT and not state.mode == Mode.PLAYBACK
+
+        # Draw the edges that are not hovered
+        edges = self.straightEdges + self.curvedEdges
+        hovered = [self._isEdgeHovering(edge) for edge in edges]
+        straightHovered = hovered[:len(self.straightEdges)]
+        graphics.drawPolygons(screen, [q for q, h in zip(self.quads, straightHovered) if not h], [c for c, h in zip(self.edgeColors, straightHovered) if not h])
+
+        for edge, isHovering in zip(self.curvedEdges, hovered[len(self.straightEdges):]):
+            if not isHovering:
+                color = REVERSED_EDGE_COLOR if edge.reversed else EDGE_COLOR
+                graphics.drawPolyline(screen, color, edge.getArcPoints(), EDGE_THICKNESS + 1)
+
+        if drawHeadingPoints:
+            for (start, end), isHovering in zip(self.headingLines, hovered):
+                if not isHovering:
+                    pygame.draw.aaline(screen, colors.RED, start, end)
+            dot = graphics.getDotSprite(colors.RED, HEADING_POINT_RADIUS)
+            screen.blits([(dot, position) for position, isHovering in zip(self.headingDots, hovered) if not isHovering], False)
+
+        # Draw the hovered edges, and the edges that can't be batched, on top
+        for edge, isHovering in zip(edges, hovered):
+            if isHovering:
+                edge.draw(screen, drawHeadingPoints)
+        for edge in self.otherEdges:
+            edge.draw(screen, drawHeadingPoints)
+
+        # Draw the nodes that don't look special, then the rest
+        self.program.first.draw(screen)
+
+        special = [self._isNodeSpecial(node) for node in self.nodes]
+        screen.blits([marker for marker, isSpecial in zip(self.markers, special) if not isSpecial], False)
+
+        for node, isSpecial in zip(self.nodes, special):
+            if isSpecial:
+                node.draw(screen)
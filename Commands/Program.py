@@ -1,21 +1,29 @@
-from Commands.Edge import Edge, StraightEdge
+from Commands.Edge import Edge, StraightEdge, BezierEdge
 from Commands.Node import *
 from Commands.StartNode import StartNode
 from Commands.TurnNode import TurnNode
 from Commands.Scroller import Scroller
+from Commands.CodeView import CodeView
+from Commands.PathRenderer import PathRenderer
 from Commands.TextButton import TextButton
 from Commands.Between import Between
+from Commands.ArcLengthIndex import ArcLengthIndex
+from Commands.PathBVH import PathBVH
+import Export.RouteFile as RouteFile
 from Commands.CustomCommand import FlapCommand
 import Commands.Serializer as Serializer
 from MouseInterfaces.Hoverable import Hoverable
+from MouseInterfaces.HoverGrid import HoverGrid
 from SingletonState.ReferenceFrame import PointRef, Ref, VectorRef
+import SingletonState.ReferenceFrame as ReferenceFrame
 from SingletonState.SoftwareState import SoftwareState, Mode
 from SingletonState.UserInput import UserInput
 from Simulation.ControllerInputState import ControllerInputState
 from Simulation.SimulationState import SimulationState
 from Simulation.Simulator import Simulator
 from RobotImage import RobotImage
-import pygame, Utility, math, os, os.path, pickle
+import pygame, Utility, math, os, os.path, pickle, colors, Profiler, BezierCurves
+import numpy as np
 from typing import Iterator
 from timeit import default_timer as timer
 from time import ctime
@@ -35,6 +43,31 @@ class Program:
 
         self.state = state
 
+        # incremented every time the path geometry is recomputed
+        self.pathVersion = 0
+
+        # incremented every time the command list, its positions or the generated code are recomputed
+        self.commandsVersion = 0
+
+        # cumulative arc length along the path, rebuilt whenever the path is recomputed
+        self.arcLengthIndex: ArcLengthIndex = ArcLengthIndex()
+
+        # nearest-point queries over the whole path, rebuilt on the first query after the path changes
+        self.pathBVH: PathBVH = PathBVH()
+
+        # spatial index of the path hoverables, rebuilt whenever the path or the field transform changes
+        self.hoverGrid: HoverGrid = HoverGrid(Utility.SCREEN_SIZE, Utility.SCREEN_SIZE)
+
+        # batched drawing of the path, retessellated whenever the path or the field transform changes
+        self.pathRenderer: PathRenderer = PathRenderer(self)
+
+        # state of the robot at every simulation tick, their field positions, and those in screen coordinates at a
+        # FieldTransform version
+        self.simulationList: list[SimulationState] = []
+        self.simulationTrail: np.ndarray = None
+        self.simulationTrailScreen: np.ndarray = None
+        self.simulationTrailVersion = None
+
         # linked list of nodes and edges. First element is the start node
         self.first: StartNode = StartNode(self)
         self.last: Node = self.first
@@ -43,6 +76,7 @@ class Program:
         
         self.code: str = ""
         self.codeLines: list[str] = []
+        self.codeView: CodeView = CodeView(self) # scrollable code, shown instead of the commands when state.isCode
 
         self.betweens: list[Between] = []
 
@@ -107,17 +141,25 @@ class Program:
         return position.copy(), False
 
     # split edge into two and insert node into linked list where original edge was
-    def insertNode(self, edge: StraightEdge, position: PointRef):
+    def insertNode(self, edge: Edge, position: PointRef):
         
         # add another edge after the original one
-        if edge.arc.isStraight:
-            heading = edge.beforeHeading
+        if isinstance(edge, BezierEdge):
+            # split the curve where the node goes, so that the two halves keep its shape
+            i = self.arcLengthIndex.getEdgeIndex(edge)
+            t = edge.arcLengthTable.tAtDistance(self.arcLengthIndex.localDistanceAtPoint(i, *position.fieldRef))
+            first, second = BezierCurves.split(t, edge.controlPoints)
+            position = PointRef(Ref.FIELD, tuple(first[3].tolist()))
+            edge.controlVector1, edge.controlVector2 = BezierCurves.getControlVectors(first)
+            newEdge: Edge = BezierEdge(self, None, edge.next, *BezierCurves.getControlVectors(second))
+        elif edge.arc.isStraight:
+            newEdge: Edge = StraightEdge(self, next = edge.next, heading1 = edge.beforeHeading)
         else:
             # calculate the heading that would result if the arc was unchanged with the new node's insertion
             dx = position.fieldRef[0] - edge.previous.position.fieldRef[0]
             dy = position.fieldRef[1] - edge.previous.position.fieldRef[1]
             heading = Utility.thetaFromArc(edge.beforeHeading, dx, dy)
-        newEdge: Edge = StraightEdge(self, next = edge.next, heading1 = heading)
+            newEdge: Edge = StraightEdge(self, next = edge.next, heading1 = heading)
         edge.next.previous = newEdge
         
         # Insert the node between the two edges
@@ -145,21 +187,57 @@ class Program:
             node.next.next.previous = node.previous
 
             # maintain straightness if edge was straight
-            if node.previous.arc.isStraight:
+            if node.previous.isStraight():
                 node.previous.headingPoint.setStraight()
 
+            # a merged curve ends the way the deleted one did
+            if isinstance(node.previous, BezierEdge) and isinstance(node.next, BezierEdge):
+                node.previous.controlVector2 = node.next.controlVector2
+
         # node parameter should be dereferenced after function scope ends
 
         self.recompute()
 
+    # Replace the edge with a bezier curve of about the same shape, or a bezier curve with an arc with the same starting
+    # heading. The direction of the edge and the custom commands after its command are kept. Returns the new edge
+    def toggleBezier(self, edge: Edge) -> Edge:
+
+        if isinstance(edge, BezierEdge):
+            newEdge: Edge = StraightEdge(self, edge.previous, edge.next, heading1 = edge.beforeHeading)
+        else:
+            # control vectors along the headings at each end, with the length of the usual bezier fit of an arc
+            length = edge.arc.arcLengthField / 3
+            if not edge.arc.isStraight:
+                sweep = abs(Utility.deltaInHeadingParity(edge.arc.theta2, edge.arc.theta1, edge.arc.parity))
+                length = 4 / 3 * math.tan(sweep / 4) * edge.arc.radius.fieldRef
+            magnitude = max(length, BezierEdge.MIN_HANDLE_LENGTH) / (1 + BezierCurves.VECTOR_STRENGTH)
+            vector1 = VectorRef(Ref.FIELD, magnitude = magnitude, heading = edge.beforeHeading).fieldRef
+            vector2 = VectorRef(Ref.FIELD, magnitude = magnitude, heading = edge.afterHeading + 3.1415).fieldRef
+            newEdge: Edge = BezierEdge(self, edge.previous, edge.next, vector1, vector2)
+
+        newEdge.reversed = edge.reversed
+        edge.previous.next = newEdge
+        edge.next.previous = newEdge
+
+        newEdge.compute() # to know which command the edge has
+        newEdge.command.commented = edge.command.commented
+        newEdge.command.nextCustomCommand = edge.command.nextCustomCommand
+
+        self.recompute()
+        return newEdge
+
 
     # recalculate all the state for each point/edge and command after the list of points is modified
+    @Profiler.timed("recompute")
     def recompute(self):
 
+        self.pathVersion += 1
+
         # only 1 node. return
         edge = self.first.next
         if edge is None:
             self.first.compute()
+            self.arcLengthIndex.rebuild(self.first)
             self.recomputeCommands()
             return
         
@@ -176,11 +254,14 @@ class Program:
             node = node.next.next
             node.compute()
 
+        self.arcLengthIndex.rebuild(self.first)
+
         # Since the number of edges or nodes may have changed, or a turn was added/removed, update commands
         self.recomputeCommands()
 
     def recomputeCommands(self, purelyVisual = False):
 
+        self.commandsVersion += 1
         self.betweens: list[Between] = []
 
         # recompute commands
@@ -203,13 +284,16 @@ class Program:
         if not purelyVisual:
             self.recomputeGeneratedCode(commands)
 
+    @Profiler.timed("recomputeGeneratedCode")
     def recomputeGeneratedCode(self, commands: list[Command] = None):
+        self.commandsVersion += 1
         if commands is None:
             commands = list(self.getHoverablesCommands())
 
         if self.first.next is None:
             self.code = "// (Empty path. no code generated)"
             self.codeLines = []
+            self.codeView.setLines(self.codeLines)
             return
 
         def setFlywheelSpeedCommand(code, commands, flapUp):
@@ -263,15 +347,22 @@ class Program:
 
         self.code = code + "// ================================================\n"
         self.codeLines = self.code.split("\n")
+        self.codeView.setLines(self.codeLines)
 
-        self.saveCode()
+        self.saveCode(commands)
 
-    def saveCode(self):
+    # Write the generated code and the route file for the given command list, or the current one if not given
+    def saveCode(self, commands: list[Command] = None):
         print("Saved generated code to target.")
         with open(Utility.SAVE_TARGET, "w") as file:
             for line in self.code.split("\n"):
                 file.write(line + "\n")
 
+        # binary version of the same commands, for loading from the robot's SD card
+        if commands is None:
+            commands = list(self.getHoverablesCommands())
+        RouteFile.saveRoute(self, commands)
+
     def getHoverablesPath(self, state: SoftwareState) -> Iterator[Hoverable]:
 
 
@@ -290,7 +381,11 @@ class Program:
         if not state.mode == Mode.MOUSE_SELECT and not state.mode == Mode.PLAYBACK:
             edge = self.first.next
             while edge is not None:
-                yield edge.headingPoint
+                if isinstance(edge, BezierEdge):
+                    yield edge.controlPoint1
+                    yield edge.controlPoint2
+                else:
+                    yield edge.headingPoint
                 edge = edge.next.next        
         
         # Yield edges next
@@ -302,6 +397,38 @@ class Program:
         return
         yield
 
+    # Same hoverables and order as getHoverablesPath(), but only the ones that could be touching the mouse
+    def getHoverablesPathAt(self, state: SoftwareState, mousePosition: PointRef) -> Iterator[Hoverable]:
+
+        key = (self.pathVersion, ReferenceFrame.transform.version, state.mode)
+        if not self.hoverGrid.isValid(key):
+            self.hoverGrid.rebuild(self.getHoverablesPath(state), key)
+
+        return self.hoverGrid.getCandidates(*mousePosition.screenRef)
+
+    # Return (point, edge, distance) for the point on the path closest to position, where distance is in inches
+    # Returns (None, None, None) if the path is empty or no point is within maxDistance inches
+    def getClosestPointOnPath(self, position: PointRef, maxDistance: float = math.inf) -> tuple:
+
+        if not self.pathBVH.isValid(self.pathVersion):
+            self.pathBVH.rebuild(self.arcLengthIndex, self.pathVersion)
+
+        closest = self.pathBVH.nearest(*position.fieldRef, maxDistance)
+        if closest is None:
+            return None, None, None
+
+        i, local, distance = closest
+        return self.arcLengthIndex.poseOnEdge(i, local)[0], self.arcLengthIndex.edges[i], distance
+
+    # Return (max, mean) distance in inches from the last generated simulation to the path, or None if there is none
+    def getSimulationDeviation(self) -> tuple:
+
+        if len(self.simulationList) == 0 or self.first.next is None:
+            return None
+
+        deviations = [self.getClosestPointOnPath(state.robotPosition)[2] for state in self.simulationList]
+        return max(deviations), sum(deviations) / len(deviations)
+
     # Skip start node. Skip any nodes that don't turn
     # Does not include custom commands
     def _getHoverablesCommands(self) -> Iterator[Command]:
@@ -352,31 +479,20 @@ class Program:
         return
         yield
 
+    # Draw the edges, then the nodes on top of them
     def drawPath(self, screen: pygame.Surface, state: SoftwareState):
+        self.pathRenderer.draw(screen, state)
 
-        # Draw the edges first
-        edge = self.first.next
-        while edge is not None:
-            edge.draw(screen, not state.mode == Mode.MOUSE_SELECT and not state.mode == Mode.PLAYBACK)
-            edge = edge.next.next
-
-        # Draw the nodes next
-        node = self.first
-        node.draw(screen)
-        while node.next is not None:
-            node = node.next.next
-            node.draw(screen)
+    # The scroller for whichever of the commands or the code is shown in the panel
+    def getScroller(self) -> Scroller:
+        return self.codeView.scroller if self.state.isCode else self.scroller
 
     def drawCommands(self, screen: pygame.Surface):
 
 
         # Draw the commands
         if self.state.isCode:
-            x = Utility.SCREEN_SIZE + 10
-            y = 10
-            for text in self.codeLines:
-                graphics.drawText(screen, graphics.FONTCODE, text, colors.BLACK, x, y, 0, 0.5)
-                y += 11
+            self.codeView.draw(screen)
         else:
 
             self.scroller.draw(screen)
@@ -402,6 +518,13 @@ class Program:
                 self.state.mode = self.modeBeforePlayback
                 return
 
+        # Draw the trail of where the robot has been so far, converting the whole trail at once only when pan or zoom changes
+        if self.simulationTrailScreen is None or self.simulationTrailVersion != ReferenceFrame.transform.version:
+            self.simulationTrailScreen = ReferenceFrame.transform.fieldToScreen(self.simulationTrail)
+            self.simulationTrailVersion = ReferenceFrame.transform.version
+        if self.simulationTick > 0:
+            pygame.draw.aalines(screen, colors.LINEGREY, False, self.simulationTrailScreen[:self.simulationTick+1])
+
         # Draw the robot at the simulation state
         simulationState: SimulationState = self.simulationList[self.simulationTick]
         robotImage.draw(screen, simulationState.robotPosition, simulationState.robotHeading)
@@ -439,6 +562,9 @@ class Program:
             currentState = simulator.simulateTick(ControllerInputState(0, 0, None))
             self.simulationList.append(currentState)
 
+        self.simulationTrail = np.array([state.robotPosition.fieldRef for state in self.simulationList])
+        self.simulationTrailScreen = None
+
         self.previousTickTime = timer()
         self.simulationTick = 0
         self.modeBeforePlayback = self.state.mode
@@ -27,5 +27,5 @@ class ResetButton(ClickButton):
         self.program.generateSavefile()
         self.program.reset()
 
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
-        self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
+        return self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
@@ -26,5 +26,5 @@ class RobotButton(FlipFlopButton):
     def toggleButton(self) -> None:
         self.state.showRobot = not self.state.showRobot
 
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
-        self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
+        return self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
@@ -5,11 +5,13 @@ import Utility, pygame, graphics, colors
 # vertical slider for scroll
 class Scroller(Draggable):
 
-    def __init__(self, program, x, y, width, height):
+    # onScroll is called whenever the content moves. By default, the commands are repositioned
+    def __init__(self, program, x, y, width, height, onScroll = None):
 
         super().__init__()
 
         self.program = program
+        self.onScroll = onScroll
 
         self.x = x
         self.y = y
@@ -18,13 +20,16 @@ class Scroller(Draggable):
 
         self.contentY = 0
         self.barY = 0
+        self.version = 0 # incremented whenever the bar or content moves or is resized
 
         self.prevSpeed = 0
+        self.MIN_SPEED = 0.5 # momentum below this many pixels per frame stops scrolling
 
         self.update(0)
 
     def update(self, contentHeight):
         self.contentHeight = contentHeight
+        self.version += 1
 
         if contentHeight == 0:
             ratio = 1
@@ -40,6 +45,9 @@ class Scroller(Draggable):
             return False
         return True
 
+    def getDrawBounds(self) -> tuple:
+        return self.x, self.y, self.x + self.width, self.y + self.displayHeight
+
     def startDragging(self, userInput: UserInput):
         self.mouseStartY = userInput.mousePosition.screenRef[1]
         self.startBarY = self.barY
@@ -54,19 +62,30 @@ class Scroller(Draggable):
             amount = max(amount, self.prevSpeed * 0.8)
         elif self.prevSpeed < 0 and amount <= 0 and amount > self.prevSpeed:
             amount = min(amount, self.prevSpeed * 0.8)
+        if abs(amount) < self.MIN_SPEED:
+            amount = 0
         self.prevSpeed = amount
 
         if amount != 0:
             self.barY += amount
             self._update()
 
+    # Whether the scroller is still gliding from momentum, and needs to be moved every frame
+    def isMoving(self) -> bool:
+        return self.prevSpeed != 0
+
     def _update(self):
+            self.version += 1
             self.barY = Utility.clamp(self.barY, 0, self.displayHeight - self.barHeight)
             if self.displayHeight == self.barHeight:
                 self.barY = 0
+                self.contentY = 0
             else:
                 self.contentY = (self.barY / (self.displayHeight - self.barHeight)) * (self.contentHeight - self.displayHeight)
-            self.program.recomputeCommands(True)
+            if self.onScroll is None:
+                self.program.recomputeCommands(True)
+            else:
+                self.onScroll()
 
     def draw(self, screen: pygame.Surface):
         pygame.draw.rect(screen, colors.BLACK, [self.x, self.y, self.width, self.displayHeight], 1)
@@ -2,7 +2,8 @@ from dataclasses import dataclass
 from typing import Tuple
 from Commands.StartNode import StartNode
 from Commands.TurnNode import TurnNode
-from Commands.Edge import StraightEdge
+from Commands.Edge import Edge, StraightEdge, BezierEdge
+from Commands.Command import StraightCommand, CurveCommand, BezierCommand
 from Commands.CustomCommand import *
 from SingletonState.ReferenceFrame import PointRef, Ref
 
@@ -127,10 +128,19 @@ class Segment:
     turnCommandCommented: bool
     afterPosition: Tuple[float, float] # field ref
 
+    # Only for bezier edges, which have the bezier command instead of the straight and curve ones. Saves from before
+    # bezier edges were added don't have these, so they read these defaults from the class
+    bezierControlVectors: Tuple[Tuple[float, float], Tuple[float, float]] = None # None for arcs
+    bezierCommandToggle: int = 0
+    bezierCommandSlider: float = None
+    bezierCommandCustom: list[CustomCommandData] = None
+    bezierCommandCommented: bool = False
+
 # Serializable class representing all the data for the path
 # startNode is the start of the entire path linked list
 class State:
 
+    # The custom commands after a command, or after the command of a CommandRecord
     def getCustom(self, command: CustomCommand) -> list[CustomCommandData]:
         code: list[CustomCommandData] = []
         while command.nextCustomCommand is not None:
@@ -162,8 +172,8 @@ class State:
         self.beforeStartCustom = self.getCustom(beforeStartCommand)
 
         # need to refactor properly v3.5
-        self.startCommented = startNode.command.commented
-        self.startCustom = self.getCustom(startNode.command)
+        self.startCommented = startNode.commandRecord.commented
+        self.startCustom = self.getCustom(startNode.commandRecord)
 
         while startNode.next is not None:
             self.addSegment(startNode.next)
@@ -171,37 +181,50 @@ class State:
 
     
 
-    # serialize the edge and the node attached to that edge as a Segment object
-    def addSegment(self, edge: StraightEdge):
+    # serialize the edge and the node attached to that edge as a Segment object. The parameters of the commands are
+    # read from their records, so commands that were never shown are not created
+    def addSegment(self, edge: Edge):
 
         node: TurnNode = edge.next
+        if isinstance(edge, BezierEdge):
+            straight, curve, bezier = StraightCommand.newRecord(), CurveCommand.newRecord(), edge.bezierRecord
+            controlVectors = (edge.controlVector1, edge.controlVector2)
+        else:
+            straight, curve, bezier = edge.straightRecord, edge.curveRecord, BezierCommand.newRecord()
+            controlVectors = None
+        shoot, turnToShoot, turn = node.shoot.shootRecord, node.shoot.turnRecord, node.commandRecord
 
         self.path.append(Segment(
             reversed = edge.reversed,
             beforeHeading = edge.beforeHeading,
-            straightCommandToggle = edge.straightCommand.toggle.activeOption,
-            straightCommandSpeedSlider = edge.straightCommand.speedSlider.getValue(),
-            straightCommandTimeSlider = edge.straightCommand.timeSlider.getValue(),
-            straightCommandCustom = self.getCustom(edge.straightCommand),
-            straightCommandCommented = edge.straightCommand.commented,
-            curveCommandToggle = edge.curveCommand.toggle.activeOption,
-            curveCommandSlider = edge.curveCommand.slider.getValue(),
-            curveCommandCustom = self.getCustom(edge.curveCommand),
-            curveCommandCommented = edge.curveCommand.commented,
+            straightCommandToggle = straight.toggle,
+            straightCommandSpeedSlider = straight.slider,
+            straightCommandTimeSlider = straight.slider2,
+            straightCommandCustom = self.getCustom(straight),
+            straightCommandCommented = straight.commented,
+            curveCommandToggle = curve.toggle,
+            curveCommandSlider = curve.slider,
+            curveCommandCustom = self.getCustom(curve),
+            curveCommandCommented = curve.commented,
             shootHeadingCorrection = node.shoot.headingCorrection,
             shootActive = node.shoot.active,
-            shootCommandSlider = node.shoot.shootCommand.slider.getValue(),
-            shootCommandNumSlider = node.shoot.shootCommand.numSlider.getValue(),
-            shootCommandCustom = self.getCustom(node.shoot.shootCommand),
-            shootCommandCommented = node.shoot.shootCommand.commented,
-            shootCommandToggle = node.shoot.shootCommand.toggle.activeOption,
-            shootTurnCommandToggle = node.shoot.turnToShootCommand.toggle.activeOption,
-            shootTurnCommandCustom = self.getCustom(node.shoot.turnToShootCommand),
-            shootTurnCommandCommented = node.shoot.turnToShootCommand.commented,
-            turnCommandToggle = node.command.toggle.activeOption,
-            turnCommandCustom = self.getCustom(node.command),
-            turnCommandCommented = node.command.commented,
-            afterPosition = node.position.fieldRef
+            shootCommandSlider = shoot.slider,
+            shootCommandNumSlider = shoot.slider2,
+            shootCommandCustom = self.getCustom(shoot),
+            shootCommandCommented = shoot.commented,
+            shootCommandToggle = shoot.toggle,
+            shootTurnCommandToggle = turnToShoot.toggle,
+            shootTurnCommandCustom = self.getCustom(turnToShoot),
+            shootTurnCommandCommented = turnToShoot.commented,
+            turnCommandToggle = turn.toggle,
+            turnCommandCustom = self.getCustom(turn),
+            turnCommandCommented = turn.commented,
+            afterPosition = node.position.fieldRef,
+            bezierControlVectors = controlVectors,
+            bezierCommandToggle = bezier.toggle,
+            bezierCommandSlider = bezier.slider,
+            bezierCommandCustom = self.getCustom(bezier),
+            bezierCommandCommented = bezier.commented
         ))
 
     # Build the entire linked list from the serialized state
@@ -215,8 +238,8 @@ class State:
         program.first.startHeading = self.startHeading
 
         try:
-            program.first.command.commented = self.startCommented
-            program.first.command.nextCustomCommand = self.loadCustom(program, self.startCustom)
+            program.first.commandRecord.commented = self.startCommented
+            program.first.commandRecord.nextCustomCommand = self.loadCustom(program, self.startCustom)
         except Exception as e:
             print("could not load custom commands after first turn command.")
             print(e)
@@ -225,27 +248,35 @@ class State:
 
         for segment in self.path:
             
-            edge: StraightEdge = StraightEdge(program, previous = previousNode, heading1 = segment.beforeHeading)
-            previousNode.next = edge
+            # commands are created from these records when they are first shown
+            if segment.bezierControlVectors is not None:
+                edge: BezierEdge = BezierEdge(program, previousNode, None, *segment.bezierControlVectors)
+                edge.bezierRecord.toggle = segment.bezierCommandToggle
+                edge.bezierRecord.slider = segment.bezierCommandSlider
+                edge.bezierRecord.nextCustomCommand = self.loadCustom(program, segment.bezierCommandCustom)
+                edge.bezierRecord.commented = segment.bezierCommandCommented
+
+            else:
+                edge: StraightEdge = StraightEdge(program, previous = previousNode, heading1 = segment.beforeHeading)
+                edge.straightRecord.toggle = segment.straightCommandToggle
+                edge.straightRecord.slider = segment.straightCommandSpeedSlider
+                edge.straightRecord.slider2 = segment.straightCommandTimeSlider
+                edge.straightRecord.nextCustomCommand = self.loadCustom(program, segment.straightCommandCustom)
+                try:
+                    edge.straightRecord.commented = segment.straightCommandCommented
+                except:
+                    pass
+
+                edge.curveRecord.toggle = segment.curveCommandToggle
+                edge.curveRecord.slider = segment.curveCommandSlider
+                edge.curveRecord.nextCustomCommand = self.loadCustom(program, segment.curveCommandCustom)
+                try:
+                    edge.curveRecord.commented = segment.curveCommandCommented
+                except:
+                    pass
 
+            previousNode.next = edge
             edge.reversed = segment.reversed
-            edge.straightCommand.toggle.activeOption = segment.straightCommandToggle
-            edge.straightCommand.speedSlider.setValue(segment.straightCommandSpeedSlider, disableCallback = True)
-            edge.straightCommand.timeSlider.setValue(segment.straightCommandTimeSlider, disableCallback = True)
-            edge.straightCommand.speedSlider.dy = -edge.straightCommand.DELTA_SLIDER_Y if (segment.straightCommandToggle == 3) else 0
-            edge.straightCommand.nextCustomCommand = self.loadCustom(program, segment.straightCommandCustom)
-            try:
-                edge.straightCommand.commented = segment.straightCommandCommented
-            except:
-                pass
-
-            edge.curveCommand.toggle.activeOption = segment.curveCommandToggle
-            edge.curveCommand.slider.setValue(segment.curveCommandSlider, disableCallback = True)
-            edge.curveCommand.nextCustomCommand = self.loadCustom(program, segment.curveCommandCustom)
-            try:
-                edge.curveCommand.commented = segment.curveCommandCommented
-            except:
-                pass
 
 
             position = PointRef(Ref.FIELD, segment.afterPosition)
@@ -255,33 +286,33 @@ class State:
             node.shoot.headingCorrection = segment.shootHeadingCorrection
             node.shoot.active = segment.shootActive
 
-            node.shoot.turnToShootCommand.toggle.activeOption = segment.shootTurnCommandToggle
-            node.shoot.turnToShootCommand.nextCustomCommand = self.loadCustom(program, segment.shootTurnCommandCustom)
+            node.shoot.turnRecord.toggle = segment.shootTurnCommandToggle
+            node.shoot.turnRecord.nextCustomCommand = self.loadCustom(program, segment.shootTurnCommandCustom)
             try:
-                node.shoot.turnToShootCommand.commented = segment.shootTurnCommandCommented
+                node.shoot.turnRecord.commented = segment.shootTurnCommandCommented
             except:
                 pass
 
-            node.shoot.shootCommand.slider.setValue(segment.shootCommandSlider, disableCallback = True)
-            node.shoot.shootCommand.nextCustomCommand = self.loadCustom(program, segment.shootCommandCustom)
+            node.shoot.shootRecord.slider = segment.shootCommandSlider
+            node.shoot.shootRecord.nextCustomCommand = self.loadCustom(program, segment.shootCommandCustom)
             try:
-                node.shoot.shootCommand.commented = segment.shootCommandCommented
+                node.shoot.shootRecord.commented = segment.shootCommandCommented
             except:
                 pass
             try:
-                node.shoot.shootCommand.numSlider.setValue(segment.shootCommandNumSlider, disableCallback = True)
+                node.shoot.shootRecord.slider2 = segment.shootCommandNumSlider
             except:
                 pass
 
             try:
-                node.shoot.shootCommand.toggle.activeOption = segment.shootCommandToggle
+                node.shoot.shootRecord.toggle = segment.shootCommandToggle
             except:
                 pass
 
-            node.command.toggle.activeOption = segment.turnCommandToggle
-            node.command.nextCustomCommand = self.loadCustom(program, segment.turnCommandCustom)
+            node.commandRecord.toggle = segment.turnCommandToggle
+            node.commandRecord.nextCustomCommand = self.loadCustom(program, segment.turnCommandCustom)
             try:
-                node.command.commented = segment.turnCommandCommented
+                node.commandRecord.commented = segment.turnCommandCommented
             except:
                 pass
 
@@ -2,8 +2,9 @@ from Commands.Node import *
 from MouseInterfaces.Draggable import Draggable
 
 def init():
-    global startImage
+    global startImage, startImageH
     startImage = graphics.getImage("Images/Buttons/PathButtons/start.png", 0.1)
+    startImageH = graphics.getLighterImage(startImage, 0.8)
 
 class StartHeadingPoint(Draggable):
 
@@ -25,6 +26,13 @@ class StartHeadingPoint(Draggable):
     def checkIfHovering(self, userInput: UserInput) -> bool:
         return Utility.distanceTuples(self.position.screenRef, userInput.mousePosition.screenRef) < self.hoverRadius
 
+    def getHoverBounds(self) -> tuple:
+        x, y = self.position.screenRef
+        return x - self.hoverRadius, y - self.hoverRadius, x + self.hoverRadius, y + self.hoverRadius
+
+    def getDrawBounds(self) -> tuple:
+        return graphics.getLineBounds(*self.node.position.screenRef, *self.position.screenRef, self.drawRadiusBig + 1)
+
     def beDraggedByMouse(self, userInput: UserInput):
         
         # heading from startNode to mouse
@@ -53,6 +61,8 @@ class StartHeadingPoint(Draggable):
 
 class StartNode(Node):
 
+    __slots__ = ("startHeading", "headingPoint", "rotatedImage", "rotatedImageH")
+
     def __init__(self, program, previous: 'Edge' = None, next: 'Edge' = None):
 
         defaultStartPosition: PointRef = PointRef(Ref.FIELD, (24, 48))
@@ -84,11 +94,13 @@ class StartNode(Node):
             self.direction = -1
         
 
-        if self.next is None:
-            self.rotatedImage = startImage
-        else:
-            self.rotatedImage = pygame.transform.rotate(startImage, self.startHeading * 180 / 3.1415)
-        self.rotatedImageH = graphics.getLighterImage(self.rotatedImage, 0.8)
+        angle = 0 if self.next is None else self.startHeading * 180 / 3.1415
+        self.rotatedImage = graphics.getRotatedImage(startImage, angle)
+        self.rotatedImageH = graphics.getRotatedImage(startImageH, angle)
+
+    def getDrawBounds(self) -> tuple:
+        rect = self.rotatedImage.get_rect(center = self.position.screenRef)
+        return graphics.unionBounds(super().getDrawBounds(), self.headingPoint.getDrawBounds(), (rect.left, rect.top, rect.right, rect.bottom))
 
     def draw(self, screen: pygame.Surface):
 
@@ -96,7 +108,7 @@ class StartNode(Node):
 
         self.headingPoint.draw(screen)
 
-        isHovering = self.isHovering or self.command.isAnyHovering()
+        isHovering = self.isHovering or self.isCommandHovering()
 
         image = self.rotatedImageH if isHovering else self.rotatedImage
         graphics.drawSurface(screen, image, *self.position.screenRef)
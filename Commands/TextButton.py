@@ -26,5 +26,5 @@ class TextButton(FlipFlopButton):
     def toggleButton(self) -> None:
         self.state.isCode = not self.state.isCode
 
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
-        self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
+        return self.tooltip.draw(screen, mousePosition)
\ No newline at end of file
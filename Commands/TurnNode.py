@@ -16,6 +16,10 @@ def init():
 # Draggable to adjust aim
 class Shoot(Draggable):
 
+    __slots__ = ("program", "parent", "turnRecord", "shootRecord", "_turnToShootCommand", "_shootCommand", "target", "active",
+        "headingCorrection", "heading", "headingStr", "magnitude", "hoverRadius", "position", "hoverPosition1",
+        "hoverPosition2", "direction", "goalHeading", "goalHeadingStr", "goalPosition", "goalPositionS", "isDragging")
+
     def __init__(self, program, parent: 'Node'):
 
         super().__init__()
@@ -23,8 +27,11 @@ class Shoot(Draggable):
         self.program = program
         self.parent: 'Node' = parent
 
-        self.turnToShootCommand: TurnCommand = TurnCommand(self, True)
-        self.shootCommand: ShootCommand = ShootCommand(self)
+        # The commands are only created once shooting is turned on. Until then their parameters are kept in the records
+        self.turnRecord: CommandRecord = TurnCommand.newRecord()
+        self.shootRecord: CommandRecord = ShootCommand.newRecord()
+        self._turnToShootCommand: TurnCommand = None
+        self._shootCommand: ShootCommand = None
 
         self.target: PointRef = PointRef(Ref.FIELD, point = Utility.RED_GOAL) # red goal center
 
@@ -34,6 +41,22 @@ class Shoot(Draggable):
         self.magnitude = 10 # magnitude of vector in pixels
         self.hoverRadius = 10
 
+    @property
+    def turnToShootCommand(self) -> TurnCommand:
+        if self._turnToShootCommand is None:
+            self._turnToShootCommand = TurnCommand(self, True, self.turnRecord)
+        return self._turnToShootCommand
+
+    @property
+    def shootCommand(self) -> ShootCommand:
+        if self._shootCommand is None:
+            self._shootCommand = ShootCommand(self, self.shootRecord)
+        return self._shootCommand
+
+    # Whether the shoot command is hovered, without creating it
+    def isCommandHovering(self) -> bool:
+        return self._shootCommand is not None and self._shootCommand.isHovering
+
     def compute(self):
         self.heading: float = (self.target - self.parent.position).theta() + self.headingCorrection
         self.headingStr = str(round(self.heading * 180 / 3.1415, 1)) + u"\u00b0"
@@ -75,6 +98,23 @@ class Shoot(Draggable):
             self.hoverRadius
         )
 
+    def getHoverBounds(self) -> tuple:
+        (x1, y1), (x2, y2) = self.hoverPosition1.screenRef, self.hoverPosition2.screenRef
+        r = self.hoverRadius
+        return min(x1, x2) - r, min(y1, y2) - r, max(x1, x2) + r, max(y1, y2) + r
+
+    # The vector, plus the guide line and target goal while it is highlighted
+    def getDrawBounds(self) -> tuple:
+        bounds = [graphics.getLineBounds(*self.parent.position.screenRef, *self.position.screenRef, 8)]
+        if self.isHovering or self.isCommandHovering():
+            x, y = self.goalPositionS
+            bounds.append(graphics.getGuideLineBounds(*self.position.screenRef, self.heading))
+            bounds.append((x - 11, y - 11, x + 11, y + 11))
+        return graphics.unionBounds(*bounds)
+
+    def getLinkedHoverables(self) -> list:
+        return [self.parent] + [command for command in (self._turnToShootCommand, self._shootCommand) if command is not None]
+
     # Adjust headingCorrection based on where the mouse is dragging the arrow
     def beDraggedByMouse(self, userInput: UserInput):
 
@@ -98,7 +138,7 @@ class Shoot(Draggable):
         thickness = 3
         a = 1.6
         
-        if thick or self.shootCommand.isHovering:
+        if thick or self.isCommandHovering():
             graphics.drawGuideLine(screen, (255,255,0), *self.position.screenRef, self.heading)
 
             # Draw target goal
@@ -111,6 +151,8 @@ class Shoot(Draggable):
 
 class TurnNode(Node):
 
+    __slots__ = ("shoot",)
+
     def __init__(self, program, position: PointRef, previous: 'Edge' = None, next: 'Edge' = None):
 
         super().__init__(program, position, 15, previous = previous, next = next)
@@ -141,7 +183,17 @@ class TurnNode(Node):
         else:
             self.direction = -1
 
-       
+
+    def getDrawBounds(self) -> tuple:
+        x, y = self.position.screenRef
+        r = max(turnCImage.get_width(), turnCImage.get_height()) / 2
+        bounds = [super().getDrawBounds(), (x - r, y - r, x + r, y + r)]
+        if self.shoot.active or self.isHovering:
+            bounds.append(self.shoot.getDrawBounds())
+        return graphics.unionBounds(*bounds)
+
+    def getLinkedHoverables(self) -> list:
+        return super().getLinkedHoverables() + [self.shoot]
 
     def draw(self, screen: pygame.Surface):
 
@@ -159,7 +211,7 @@ class TurnNode(Node):
 
 
 
-        isHovering = self.isHovering or self.command.isAnyHovering()
+        isHovering = self.isHovering or self.isCommandHovering()
 
         if self.direction == 0:
             # draw black node
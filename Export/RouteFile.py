@@ -0,0 +1,108 @@
+import Utility, struct, os
+
+"""
+A compact binary version of the generated code, so the robot can load a new route from its SD card instead of being
+recompiled. Export/RouteReader.h is the matching C++ reader, which loads the whole file with a single read.
+
+Layout (little-endian):
+    header   HEADER_FORMAT   magic "PGR1", format version, number of records, start x, start y, start heading
+    records  RECORD_FORMAT   16-byte records in program order, one per command except bezier curves, which are
+                             stored as the straight pieces they are driven as (see Command.getRouteRecords())
+    text     the text of CODE records, which point into it with (offset, length)
+
+Each record is (opcode, flags, speed, a, b, c). The opcode comes from the command's class, and the meaning of the
+other fields depends on the opcode (see Command.getRouteRecord() in each subclass). Values are stored in fixed point:
+distances in DISTANCE_SCALE units per inch, angles in ANGLE_SCALE units per radian (same heading convention as the
+generated code), speeds from -1 to 1 in SPEED_SCALE units, and times in milliseconds.
+"""
+
+MAGIC = b"PGR1"
+VERSION = 1
+ROUTE_FILENAME = "Route.pgr"
+
+HEADER_FORMAT = "<4sHHiii"
+RECORD_FORMAT = "<BBhiii"
+
+DISTANCE_SCALE = 1000 # thousandths of an inch
+ANGLE_SCALE = 10000 # ten-thousandths of a radian
+SPEED_SCALE = 1000 # thousandths of full speed
+
+# Opcodes, one per Command subclass
+OPCODE_TURN = 1
+OPCODE_STRAIGHT = 2
+OPCODE_CURVE = 3
+OPCODE_SHOOT = 4
+OPCODE_CODE = 10
+OPCODE_TIME = 11
+OPCODE_INTAKE = 12
+OPCODE_ROLLER = 13
+OPCODE_FLAP = 14
+OPCODE_DO_ROLLER = 15
+
+# Bits of the flags byte. The low bits hold the command's toggle option
+FLAG_ODOM = 0x40 # a and b are a target point instead of the usual values
+FLAG_COMMENTED = 0x80 # the command is commented out and should be skipped
+FLAG_OPTION_MASK = 0x3F
+
+
+def toDistance(inches: float) -> int:
+    return int(round(inches * DISTANCE_SCALE))
+
+def toAngle(radians: float) -> int:
+    return int(round((radians % (3.1415*2)) * ANGLE_SCALE))
+
+def toSpeed(speed: float) -> int:
+    return int(round(Utility.clamp(speed, -32, 32) * SPEED_SCALE))
+
+def toMilliseconds(seconds: float) -> int:
+    return int(round(seconds * 1000))
+
+
+# Return the route file contents for the given start position/heading and commands
+def getRouteBytes(startPosition: tuple, startHeading: float, commands: list) -> bytes:
+
+    records = []
+    text = b""
+
+    for command in commands:
+        for opcode, flags, speed, a, b, c in command.getRouteRecords():
+
+            # CODE records reference their text by offset and length in the text section
+            codeText = command.getRouteText()
+            if codeText is not None:
+                encoded = codeText.encode("utf-8")
+                a, b = len(text), len(encoded)
+                text += encoded
+
+            if command.commented:
+                flags |= FLAG_COMMENTED
+
+            records.append(struct.pack(RECORD_FORMAT, opcode, flags, speed, a, b, c))
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, len(records), toDistance(startPosition[0]), toDistance(startPosition[1]), toAngle(startHeading))
+    return header + b"".join(records) + text
+
+# Write the route for the program next to the generated code
+def saveRoute(program, commands: list) -> str:
+    filename = os.path.join(os.path.dirname(os.path.abspath(Utility.SAVE_TARGET)), ROUTE_FILENAME)
+    with open(filename, "wb") as file:
+        file.write(getRouteBytes(program.first.position.fieldRef, program.first.startHeading, commands))
+    return filename
+
+# Read a route file back into (header tuple, list of record tuples, text). Used for checking exported files
+def readRoute(data: bytes) -> tuple:
+
+    header = struct.unpack_from(HEADER_FORMAT, data, 0)
+    if header[0] != MAGIC:
+        raise ValueError("Not a route file")
+
+    offset = struct.calcsize(HEADER_FORMAT)
+    size = struct.calcsize(RECORD_FORMAT)
+    records = [struct.unpack_from(RECORD_FORMAT, data, offset + i * size) for i in range(header[2])]
+    text = data[offset + header[2] * size:]
+    return header, records, text
+
+
+# Testing code
+if __name__ == "__main__":
+    print("header bytes:", struct.calcsize(HEADER_FORMAT), "record bytes:", struct.calcsize(RECORD_FORMAT))
@@ -0,0 +1,105 @@
+// Reference reader for the binary route files written by Export/RouteFile.py
+// The whole file is loaded with a single fread, then the header and records are used in place.
+//
+//     Route route;
+//     if (loadRoute("/usd/Route.pgr", route)) {
+//         for (int i = 0; i < route.header->recordCount; i++) {
+//             const RouteRecord& r = route.records[i];
+//             if (r.flags & ROUTE_FLAG_COMMENTED) continue;
+//             ...
+//         }
+//         freeRoute(route);
+//     }
+#pragma once
+
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+
+// Fixed point scales, matching RouteFile.py
+const float ROUTE_DISTANCE_SCALE = 1000.0f; // units per inch
+const float ROUTE_ANGLE_SCALE = 10000.0f; // units per radian
+const float ROUTE_SPEED_SCALE = 1000.0f; // units per full speed
+
+enum RouteOpcode : uint8_t {
+    ROUTE_TURN = 1,       // a: heading
+    ROUTE_STRAIGHT = 2,   // speed, a: signed distance, b: heading, c: time (ms) for the timed option. Also bezier curves, one per piece
+    ROUTE_CURVE = 3,      // speed, a: signed radius, b: start heading, c: end heading
+    ROUTE_SHOOT = 4,      // a: number of disks, c: flywheel rpm. option 1 is catapult
+    ROUTE_CODE = 10,      // a: offset into the text section, b: length
+    ROUTE_TIME = 11,      // a: delay (ms)
+    ROUTE_INTAKE = 12,    // speed
+    ROUTE_ROLLER = 13,    // speed, 0 to brake
+    ROUTE_FLAP = 14,      // option 1 is up
+    ROUTE_DO_ROLLER = 15, // a: extra time (ms)
+};
+
+const uint8_t ROUTE_FLAG_ODOM = 0x40;      // a, b are a target point (x, y) instead
+const uint8_t ROUTE_FLAG_COMMENTED = 0x80; // skip this command
+const uint8_t ROUTE_FLAG_OPTION_MASK = 0x3F;
+
+#pragma pack(push, 1)
+struct RouteHeader {
+    char magic[4]; // "PGR1"
+    uint16_t version;
+    uint16_t recordCount;
+    int32_t startX, startY, startHeading;
+};
+
+struct RouteRecord {
+    uint8_t opcode;
+    uint8_t flags;
+    int16_t speed;
+    int32_t a, b, c;
+};
+#pragma pack(pop)
+
+static_assert(sizeof(RouteHeader) == 20, "RouteHeader must match RouteFile.HEADER_FORMAT");
+static_assert(sizeof(RouteRecord) == 16, "RouteRecord must match RouteFile.RECORD_FORMAT");
+
+struct Route {
+    char* data = nullptr;
+    const RouteHeader* header = nullptr;
+    const RouteRecord* records = nullptr;
+    const char* text = nullptr; // text of ROUTE_CODE records, not null terminated
+};
+
+inline void freeRoute(Route& route) {
+    free(route.data);
+    route = Route();
+}
+
+// Returns false if the file can't be read or isn't a route file
+inline bool loadRoute(const char* filename, Route& route) {
+
+    FILE* file = fopen(filename, "rb");
+    if (file == nullptr) return false;
+
+    fseek(file, 0, SEEK_END);
+    long size = ftell(file);
+    fseek(file, 0, SEEK_SET);
+
+    char* data = (char*) malloc(size);
+    bool ok = data != nullptr && size >= (long) sizeof(RouteHeader) && fread(data, 1, size, file) == (size_t) size;
+    fclose(file);
+
+    const RouteHeader* header = (const RouteHeader*) data;
+    ok = ok && memcmp(header->magic, "PGR1", 4) == 0 && header->version == 1
+        && size >= (long) (sizeof(RouteHeader) + header->recordCount * sizeof(RouteRecord));
+
+    if (!ok) {
+        free(data);
+        return false;
+    }
+
+    route.data = data;
+    route.header = header;
+    route.records = (const RouteRecord*) (data + sizeof(RouteHeader));
+    route.text = (const char*) (route.records + header->recordCount);
+    return true;
+}
+
+inline float routeDistance(int32_t value) { return value / ROUTE_DISTANCE_SCALE; }
+inline float routeAngle(int32_t value) { return value / ROUTE_ANGLE_SCALE; }
+inline float routeSpeed(int16_t value) { return value / ROUTE_SPEED_SCALE; }
@@ -0,0 +1,170 @@
+from Commands.ArcLengthIndex import ArcLengthIndex
+from Simulation.Simulator import Simulator
+from dataclasses import dataclass
+import Utility, os
+import numpy as np
+
+"""
+Precomputes the whole path as a time-indexed table the robot can step through at its control loop rate, instead of
+recomputing a motion profile on-board for every goForwardU/goCurveU call.
+
+The robot drives each edge with its own trapezoidal velocity profile, starting and ending at rest like the generated
+commands do, and turns in place at nodes where the heading changes between edges. The profiles are limited so neither
+wheel exceeds Simulator.MAX_VELOCITY, and accelerations use the simulator's limit (MAX_ACCEL per TIMESTEP). Each row
+is sampled every TIMESTEP seconds, and every piece of the motion is evaluated for all rows at once with numpy.
+
+Headings are in radians, in the same convention as the generated code. Shoot turns are not included.
+"""
+
+TIMESTEP = 0.01 # seconds between rows, the robot's control loop rate
+MAX_ACCEL = Simulator.MAX_ACCEL / Simulator.TIMESTEP # inches/sec^2
+
+
+# A trajectory sampled every timestep seconds. Every other field is an array with one entry per row
+@dataclass
+class Trajectory:
+    timestep: float
+    t: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    heading: np.ndarray
+    leftVelocity: np.ndarray
+    rightVelocity: np.ndarray
+
+    def __len__(self):
+        return len(self.t)
+
+
+# For trapezoidal profiles covering each distance with the given max velocities and acceleration,
+# return (accelTime, cruiseTime, peakVelocity) arrays. Short distances get triangular profiles that never reach max velocity
+def _getProfiles(distance: np.ndarray, maxVelocity: np.ndarray, accel: np.ndarray) -> tuple:
+    peakVelocity = np.minimum(maxVelocity, np.sqrt(distance * accel))
+    accelTime = peakVelocity / accel
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        cruiseTime = np.where(peakVelocity > 0, (distance - peakVelocity * accelTime) / peakVelocity, 0)
+    return accelTime, np.maximum(cruiseTime, 0), peakVelocity
+
+# Distance travelled and velocity at time tau into each profile
+def _evaluateProfiles(tau: np.ndarray, accelTime: np.ndarray, cruiseTime: np.ndarray, peakVelocity: np.ndarray, accel: np.ndarray) -> tuple:
+    decelStart = accelTime + cruiseTime
+    tau = np.clip(tau, 0, decelStart + accelTime)
+    decelTime = np.maximum(tau - decelStart, 0)
+
+    velocity = np.where(tau < accelTime, accel * tau, np.where(tau < decelStart, peakVelocity, peakVelocity - accel * decelTime))
+    distance = np.where(tau < accelTime, accel * tau * tau / 2,
+        peakVelocity * (tau - accelTime / 2) - accel * decelTime * decelTime / 2)
+    return distance, velocity
+
+# Sample the path in the arc length index with trapezoidal profiles every timestep seconds
+def generateTrajectory(index: ArcLengthIndex, trackWidth: float = Simulator.TRACK_WIDTH, maxVelocity: float = Simulator.MAX_VELOCITY,
+        maxAccel: float = MAX_ACCEL, timestep: float = TIMESTEP) -> Trajectory:
+
+    # Build the list of pieces: (isTurn, magnitude, edge index, start heading, direction, max curvature)
+    # magnitude is inches for edges and radians for turns. direction is the sign of robot motion or rotation
+    pieces = []
+    heading = None
+    for i, (edge, row) in enumerate(zip(index.edges, index.rows)):
+
+        startHeading = edge.beforeHeading + (3.1415 if edge.reversed else 0)
+        if heading is not None and not Utility.headingsEqual(heading, startHeading):
+            turn = Utility.deltaInHeading(startHeading, heading)
+            pieces.append((True, abs(turn), i, heading, 1 if turn > 0 else -1, 0))
+
+        pieces.append((False, row[0], i, startHeading, -1 if edge.reversed else 1, index.getMaxCurvature(i)))
+        heading = edge.afterHeading + (3.1415 if edge.reversed else 0)
+
+    if len(pieces) == 0:
+        empty = np.zeros(0)
+        return Trajectory(timestep, empty, empty, empty, empty, empty, empty)
+
+    isTurn, magnitude, edgeIndex, startHeading, direction, maxCurvature = (np.array(column) for column in zip(*pieces))
+    isTurn = isTurn.astype(bool)
+    edgeIndex = edgeIndex.astype(int)
+
+    # Limits for each piece. Turning in place, the wheels move trackWidth/2 per radian.
+    # On an arc the outer wheel moves (1 + |curvature| * trackWidth/2) times faster than the center of the robot, so
+    # edges whose curvature changes are limited by their tightest part
+    wheelScale = np.where(isTurn, trackWidth / 2, 1 + maxCurvature * trackWidth / 2)
+    pieceMaxVelocity = maxVelocity / wheelScale
+    pieceAccel = maxAccel / wheelScale
+
+    accelTime, cruiseTime, peakVelocity = _getProfiles(magnitude, pieceMaxVelocity, pieceAccel)
+    duration = 2 * accelTime + cruiseTime
+    startTime = np.concatenate(([0], np.cumsum(duration)[:-1]))
+    totalTime = startTime[-1] + duration[-1]
+
+    # Find which piece each row is in, and how far into it
+    t = np.arange(0, totalTime + timestep, timestep)
+    piece = np.clip(np.searchsorted(startTime, t, side = "right") - 1, 0, len(pieces) - 1)
+    progress, velocity = _evaluateProfiles(t - startTime[piece], accelTime[piece], cruiseTime[piece], peakVelocity[piece], pieceAccel[piece])
+
+    # Edges: follow the path at distance progress along the edge
+    start = np.array(index.start)
+    s = start[edgeIndex[piece]] + np.minimum(progress, magnitude[piece])
+    x, y, pathHeading = index.sampleAt(s)
+    linearVelocity = velocity * direction[piece]
+    angularVelocity = velocity * index.curvatureAt(s)
+
+    # Turns: stay at the start of the next edge and rotate towards its heading
+    turning = isTurn[piece]
+    turnX, turnY, _ = index.sampleAt(start[edgeIndex[piece]])
+    x = np.where(turning, turnX, x)
+    y = np.where(turning, turnY, y)
+    heading = np.where(turning, startHeading[piece] + direction[piece] * progress, pathHeading) % (3.1415 * 2)
+    linearVelocity = np.where(turning, 0, linearVelocity)
+    angularVelocity = np.where(turning, velocity * direction[piece], angularVelocity)
+
+    leftVelocity = linearVelocity - angularVelocity * trackWidth / 2
+    rightVelocity = linearVelocity + angularVelocity * trackWidth / 2
+    return Trajectory(timestep, t, x, y, heading, leftVelocity, rightVelocity)
+
+# Return the trajectory as a C++ header with one {t, x, y, heading, left, right} row per timestep
+def toHeader(trajectory: Trajectory, name: str = "TRAJECTORY") -> str:
+
+    rows = np.column_stack((trajectory.t, trajectory.x, trajectory.y, trajectory.heading, trajectory.leftVelocity, trajectory.rightVelocity))
+    lines = [f"    {{{', '.join(f'{value:.3f}f' for value in row)}}}," for row in rows]
+
+    return "\n".join([
+        "// Generated by Pathogen " + Utility.VERSION + ". Do not edit",
+        "// Rows of {time (s), x (in), y (in), heading (rad), left velocity (in/s), right velocity (in/s)}",
+        "#pragma once",
+        "",
+        f"const int {name}_LENGTH = {len(trajectory)};",
+        f"const float {name}_TIMESTEP = {trajectory.timestep}f;",
+        f"const float {name}[{max(len(trajectory), 1)}][6] = {{",
+        *lines,
+        "};",
+        ""
+    ])
+
+# Write the trajectory of the program's path as Trajectory.h next to the save target, and return the filename
+def saveTrajectoryHeader(program) -> str:
+    trajectory = generateTrajectory(program.arcLengthIndex)
+    filename = os.path.join(os.path.dirname(os.path.abspath(Utility.SAVE_TARGET)), "Trajectory.h")
+    with open(filename, "w") as file:
+        file.write(toHeader(trajectory))
+    print(f"Saved {len(trajectory)} row trajectory table to {filename}")
+    return filename
+
+
+# Testing code
+if __name__ == "__main__":
+    from Benchmarks.SyntheticPath import init, buildProgram
+
+    init()
+    program = buildProgram(20)
+    trajectory = generateTrajectory(program.arcLengthIndex)
+
+    # The table should end at the last node and never exceed the wheel velocity limit
+    last = program.last.position.fieldRef
+    print("rows:", len(trajectory), "duration:", round(trajectory.t[-1], 2), "s")
+    print("end error:", round(np.hypot(trajectory.x[-1] - last[0], trajectory.y[-1] - last[1]), 4))
+    print("max wheel velocity:", round(max(np.abs(trajectory.leftVelocity).max(), np.abs(trajectory.rightVelocity).max()), 3))
+
+    # Integrating the wheel velocities should approximately reproduce the positions in the table
+    velocity = (trajectory.leftVelocity + trajectory.rightVelocity) / 2
+    dx = np.cumsum(velocity[:-1] * np.cos(trajectory.heading[:-1])) * trajectory.timestep
+    dy = np.cumsum(velocity[:-1] * np.sin(trajectory.heading[:-1])) * trajectory.timestep
+    drift = np.hypot(trajectory.x[0] + dx - trajectory.x[1:], trajectory.y[0] + dy - trajectory.y[1:]).max()
+    print("max dead reckoning drift:", round(drift, 3))
+    print(toHeader(trajectory).split("\n")[4])
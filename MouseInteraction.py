@@ -2,13 +2,14 @@ from MouseInterfaces.Hoverable import Hoverable
 from SingletonState.SoftwareState import SoftwareState, Mode
 from SingletonState.UserInput import UserInput
 from SingletonState.FieldTransform import FieldTransform
-from SingletonState.ReferenceFrame import PointRef, Ref, VectorRef
+from SingletonState.ReferenceFrame import PointRef, Ref, VectorRef, ScalarRef
 from VisibleElements.FieldSurface import FieldSurface
 from MouseInterfaces.Draggable import Draggable
 from MouseInterfaces.Clickable import Clickable
 from Commands.Program import Program
 from Commands.StartNode import StartNode
-from Commands.Edge import StraightEdge
+from Commands.Edge import Edge
+from Commands.ArcLengthIndex import ArcLengthIndex
 from Commands.Node import Node
 from Commands.TurnNode import TurnNode
 import Commands.Serializer as Serializer
@@ -20,19 +21,20 @@ import pickle
 import pygame
 
 # Handle left clicks for dealing with the field
-def handleLeftClick(state: SoftwareState, fieldSurface: FieldSurface, userInput: UserInput, program: Program, segmentShadow: PointRef):
+def handleLeftClick(state: SoftwareState, fieldSurface: FieldSurface, userInput: UserInput, program: Program, segmentShadow: Tuple[PointRef, Edge]):
 
     if userInput.isMouseOnField:
 
+        # Insert a node at the shadow if the mouse is close enough to the path
+        if segmentShadow[0] is not None:
+            program.insertNode(segmentShadow[1], segmentShadow[0])
+
         # Add segment at mouse location if mouse if clicking at some area of the field
-        if state.objectHovering == fieldSurface:
+        elif state.objectHovering == fieldSurface:
             if state.mode == Mode.ADD_SEGMENT:
                 program.addNodeForward(userInput.mousePosition)
             elif state.mode == Mode.ADD_CURVE:
                 program.addNodeCurve(userInput.mousePosition)
-
-        elif segmentShadow is not None:
-            program.insertNode(state.objectHovering, segmentShadow)
     
 
 # Handle right clicks for dealing with the field
@@ -44,7 +46,7 @@ def handleRightClick(state: SoftwareState, userInput: UserInput):
             node: Node = state.objectHovering
             node.shoot.active = not node.shoot.active
             node.program.recompute()
-        elif type(state.objectHovering) == StraightEdge:
+        elif isinstance(state.objectHovering, Edge):
             state.objectHovering.toggleReversed() # toggle going forward/reverse on edge
         elif type(state.objectHovering) == FieldSurface:
             state.mode = state.mode.next()
@@ -73,7 +75,7 @@ def handleMousewheel(fieldSurface: FieldSurface, fieldTransform: FieldTransform,
             fieldSurface.updateScaledSurface()
             return True
     else:
-        program.scroller.move(-6 * userInput.mousewheelDelta)
+        program.getScroller().move(-6 * userInput.mousewheelDelta)
 
     return False
 
@@ -88,9 +90,18 @@ def handleDeleting(userInput: UserInput, state: SoftwareState, program: Program)
     # can only delete turn nodes
     if type(state.objectHovering) == TurnNode:
         program.deleteNode(state.objectHovering)
-    if type(state.objectHovering) == StraightEdge: # delete the node after the edge
+    if isinstance(state.objectHovering, Edge): # delete the node after the edge
         program.deleteNode(state.objectHovering.next)
 
+# If B was just pressed while hovering over an edge, turn it into a bezier curve, or a bezier curve back into an arc
+def handleBezierToggling(userInput: UserInput, state: SoftwareState, program: Program):
+
+    if userInput.isKeyPressed(pygame.K_b) and isinstance(state.objectHovering, Edge):
+        # the hovered edge is no longer part of the path, so hover its replacement instead
+        state.objectHovering.resetHoverableObject()
+        state.objectHovering = program.toggleBezier(state.objectHovering)
+        state.objectHovering.setHoveringObject()
+
 
 # Find the object that is hoverable, update that object's hoverable state, and return the object
 def handleHoverables(state: SoftwareState, userInput: UserInput, hoverablesGenerator: Iterator[Hoverable]):
@@ -147,20 +158,12 @@ def handleDragging(userInput: UserInput, state: SoftwareState, fieldSurface: Fie
             state.objectHovering = state.objectDragged
             state.objectHovering.setHoveringObject()
 
-# return (position, heading)
-def getPointOnEdge(state: SoftwareState, edge: StraightEdge, position: PointRef) -> Tuple[PointRef, float]:
-    
-    invert = 3.1415 if edge.reversed else 0
-    
-    # Straight. Find closest point on line
-    if edge.arc.isStraight:
-        return state.objectHovering.getClosestPoint(position), edge.beforeHeading + invert
-    else:
-        # Curved. Find closest point on arc
-        arc: Arc = edge.arc
-        theta = Utility.thetaTwoPoints(arc.center.fieldRef, position.fieldRef)
-        heading = theta + 3.1415/2 * (-1 if arc.parity else 1)
-        return arc.center + VectorRef(Ref.FIELD, magnitude = arc.radius.fieldRef, heading = theta), heading + invert
+# return (position, heading) of the point on the edge closest to position. The pose is taken on this edge, since at its
+# end, a distance along the whole path would be the start of the next edge
+def getPointOnEdge(state: SoftwareState, edge: Edge, position: PointRef) -> Tuple[PointRef, float]:
+    index: ArcLengthIndex = edge.program.arcLengthIndex
+    i = index.getEdgeIndex(edge)
+    return index.poseOnEdge(i, index.localDistanceAtPoint(i, *position.fieldRef))
 
 
 def handleHoverPath(userInput: UserInput, state: SoftwareState, program: Program) -> Tuple[PointRef, float]:
@@ -168,7 +171,7 @@ def handleHoverPath(userInput: UserInput, state: SoftwareState, program: Program
 
     if state.mode == Mode.MOUSE_SELECT:
 
-        if type(state.objectHovering) == StraightEdge:
+        if isinstance(state.objectHovering, Edge):
             return getPointOnEdge(state, state.objectHovering, userInput.mousePosition)
         elif type(state.objectHovering) == StartNode:
             if state.objectHovering.next is not None:
@@ -181,12 +184,22 @@ def handleHoverPath(userInput: UserInput, state: SoftwareState, program: Program
             return pos, heading
     return None, None
 
-def handleHoverPathAdd(userInput: UserInput, state: SoftwareState, program: Program) -> PointRef:
+# return (position, edge) of where a node would be inserted into the path, snapped onto the closest point of the path
+# within hovering distance of the mouse. Only when hovering over the field or an edge, so nodes and other objects take priority
+def handleHoverPathAdd(userInput: UserInput, state: SoftwareState, program: Program, fieldSurface: FieldSurface) -> Tuple[PointRef, Edge]:
 
     if state.mode == Mode.ADD_SEGMENT or state.mode == Mode.ADD_CURVE:
-        if type(state.objectHovering) == StraightEdge:
-            return getPointOnEdge(state, state.objectHovering, userInput.mousePosition)[0]
-    return None
+        if isinstance(state.objectHovering, Edge) or state.objectHovering == fieldSurface:
+            maxDistance = ScalarRef(Ref.SCREEN, 13).fieldRef # same hitbox thickness as Arc.isTouching()
+            position, edge, distance = program.getClosestPointOnPath(userInput.mousePosition, maxDistance)
+
+            # don't insert a node on top of an existing one
+            if position is not None:
+                for node in (edge.previous, edge.next):
+                    if Utility.distanceTuples(position.screenRef, node.position.screenRef) < node.hoverRadius:
+                        return None, None
+            return position, edge
+    return None, None
 
 # When a .pg3 save file dragged into the screen, load all the data into the program
 def handleLoadedFile(program: Program, filename):
@@ -10,6 +10,8 @@ Useful for Button."""
 
 class Clickable(Hoverable):
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
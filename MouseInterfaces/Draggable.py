@@ -11,6 +11,10 @@ Useful for FieldTransform, PathPoint, and Slider."""
 
 class Draggable(Hoverable):
 
+    # isDragging is declared by the __slots__ of subclasses instead, since a class like CustomCommand inherits from both
+    # Draggable and another class with __slots__, and only one of them can add slots
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         self.isDragging = False
@@ -0,0 +1,69 @@
+from MouseInterfaces.Hoverable import Hoverable
+from typing import Iterator
+import math
+
+"""
+A uniform grid over the screen that buckets Hoverable objects by their getHoverBounds() box, so that finding the
+hovered object only needs to call checkIfHovering() on the few objects near the mouse instead of every object.
+
+The hoverables are given in priority order (the order handleHoverables() would check them in), and getCandidates()
+yields the nearby ones in that same order, so the first one that reports hovering is the same object a linear scan
+would have found. Objects whose getHoverBounds() returns None are candidates everywhere. Bounding boxes are clipped
+to the region the grid covers, since the mouse can't hover anything outside of it.
+
+The grid does not know when the objects move. The owner passes a key describing the state the grid was built from
+(ex. geometry and FieldTransform versions) and calls rebuild() whenever isValid() returns false.
+"""
+
+class HoverGrid:
+
+    def __init__(self, width: int, height: int, cellSize: int = 50):
+        self.width = width
+        self.height = height
+        self.cellSize = cellSize
+
+        self.key = None
+        self.hoverables: list[Hoverable] = []
+        self.cells: dict[tuple, list[int]] = {} # (column, row) -> indices into self.hoverables in ascending order
+        self.unbounded: list[int] = [] # indices of hoverables that have no bounding box
+
+    # Whether the grid was built from the state described by key
+    def isValid(self, key) -> bool:
+        return self.key is not None and self.key == key
+
+    def rebuild(self, hoverables: Iterator[Hoverable], key):
+
+        self.key = key
+        self.hoverables = list(hoverables)
+        self.cells = {}
+        self.unbounded = []
+
+        for i, hoverable in enumerate(self.hoverables):
+
+            bounds = hoverable.getHoverBounds()
+            if bounds is None:
+                self.unbounded.append(i)
+                continue
+
+            x1, y1, x2, y2 = bounds
+            x1, y1 = max(x1, 0), max(y1, 0)
+            x2, y2 = min(x2, self.width), min(y2, self.height)
+            if x1 > x2 or y1 > y2: # entirely outside of the grid
+                continue
+
+            for column in range(math.floor(x1 / self.cellSize), math.floor(x2 / self.cellSize) + 1):
+                for row in range(math.floor(y1 / self.cellSize), math.floor(y2 / self.cellSize) + 1):
+                    self.cells.setdefault((column, row), []).append(i)
+
+    # Yield the hoverables that could be touching screen position (x,y), in priority order
+    def getCandidates(self, x: float, y: float) -> Iterator[Hoverable]:
+
+        cell = self.cells.get((math.floor(x / self.cellSize), math.floor(y / self.cellSize)), [])
+
+        if len(self.unbounded) == 0:
+            indices = cell
+        else:
+            indices = sorted(cell + self.unbounded)
+
+        for i in indices:
+            yield self.hoverables[i]
@@ -9,6 +9,11 @@ To manage all Hoverable objects, they will be stored in a list (not in this file
 """
 class Hoverable(ABC):
 
+    # Edges, nodes, their commands and arcs, and the PointRefs they hold are created in large numbers, so they declare
+    # __slots__ and don't carry a __dict__. The interfaces they inherit from do too. Subclasses that don't declare
+    # __slots__, like custom commands, still get a __dict__ as usual
+    __slots__ = ("isHovering",)
+
     def __init__(self):
         self.isHovering = False
 
@@ -26,4 +31,18 @@ class Hoverable(ABC):
         pass
 
     def onRightClick(self, userInput: UserInput):
-        pass
\ No newline at end of file
+        pass
+
+    # Screen-space bounding box (x1, y1, x2, y2) that contains every mouse position for which checkIfHovering() could
+    # return true. Used by HoverGrid to skip objects far from the mouse. None means the object must always be checked
+    def getHoverBounds(self) -> tuple:
+        return None
+
+    # Screen-space bounding box (x1, y1, x2, y2) of everything drawn by this object, so that only that part of the
+    # screen has to be redrawn when the object changes. None means unknown, and the whole screen is redrawn
+    def getDrawBounds(self) -> tuple:
+        return self.getHoverBounds()
+
+    # Other objects whose appearance depends on whether this object is hovered, like a path edge and its command
+    def getLinkedHoverables(self) -> list['Hoverable']:
+        return []
\ No newline at end of file
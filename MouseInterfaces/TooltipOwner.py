@@ -4,12 +4,14 @@ import pygame
 
 """
 Classes with the TooltipOwner interface have a tooltip when the mouse is hovered over. Those classes
-must implement drawTooltip() which calls the tooltip object's draw() method
+must implement drawTooltip() which calls the tooltip object's draw() method, and returns the rect it was drawn in
 """
 
 class TooltipOwner(ABC):
 
+    __slots__ = ()
+
     # Classes implementing TooltipOwner must implement this and draw the tooltip
     @abstractmethod
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
         pass
\ No newline at end of file
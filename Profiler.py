@@ -0,0 +1,148 @@
+import pygame, graphics, colors, Utility, os, time, math
+import numpy as np
+from collections import deque
+from contextlib import contextmanager
+
+"""
+Measures where frame time goes. Phases of a frame are timed with named scopes, either around a block of code or a
+whole function:
+
+    with Profiler.scope("drawPathLayer"):
+        drawPathLayer()
+
+    @Profiler.timed("recompute")
+    def recompute(self): ...
+
+Times of a scope that runs several times in a frame add up, and scopes can be nested, so a phase like
+"handleDragging" includes the "recompute" it triggers. endFrame() stores the frame's times, and the last HISTORY frames
+give the rolling average, p95 and p99 of each phase. Phases that did not run in a frame count as 0 ms for it.
+
+The overlay toggled with F3 shows those statistics. F4 starts and stops logging every frame's times to a CSV file in
+cache/, with one (frame, phase, milliseconds) row per phase that ran in the frame.
+"""
+
+HISTORY = 300 # number of frames the statistics are computed over
+OVERLAY_KEY = pygame.K_F3
+LOG_KEY = pygame.K_F4
+
+# Phase name -> milliseconds spent in it in the last HISTORY frames, in the order the phases were first timed
+history: dict[str, deque] = {}
+
+# Phase name -> milliseconds spent in it so far this frame
+current: dict[str, float] = {}
+
+frameStart = None
+frameNumber = 0
+isShown = False
+logFile = None
+
+@contextmanager
+def scope(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current[name] = current.get(name, 0) + (time.perf_counter() - start) * 1000
+
+# Decorator that times every call of the function under name
+def timed(name: str):
+    def decorator(function):
+        def wrapper(*args, **kwargs):
+            with scope(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Called when a frame starts doing work, after waiting for input
+def beginFrame():
+    global frameStart
+    frameStart = time.perf_counter()
+
+# Called when the frame is done. Store this frame's times and start the next frame with none
+def endFrame():
+    global frameNumber
+
+    if frameStart is not None:
+        current["frame"] = (time.perf_counter() - frameStart) * 1000
+
+    for name in current:
+        if name not in history:
+            history[name] = deque([0] * min(frameNumber, HISTORY), maxlen = HISTORY)
+    for name in history:
+        history[name].append(current.get(name, 0))
+
+    if logFile is not None:
+        for name in current:
+            logFile.write(f"{frameNumber},{name},{current[name]:.4f}\n")
+
+    current.clear()
+    frameNumber += 1
+
+# (average, p95, p99) in milliseconds of the phase over the last HISTORY frames
+def getStats(name: str) -> tuple:
+    times = np.array(history[name])
+    return times.mean(), np.percentile(times, 95), np.percentile(times, 99)
+
+# Handle the overlay and logging hotkeys
+def handleKeys(userInput):
+    global isShown
+
+    if userInput.isKeyPressed(OVERLAY_KEY):
+        isShown = not isShown
+    elif userInput.isKeyPressed(LOG_KEY):
+        if logFile is None:
+            startLog()
+        else:
+            stopLog()
+
+def startLog() -> str:
+    global logFile
+
+    if not os.path.exists("cache"):
+        os.makedirs("cache")
+
+    filename = f"cache/profile_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    logFile = open(filename, "w")
+    logFile.write("frame,phase,ms\n")
+    print(f"Logging frame timings to {filename}")
+    return filename
+
+def stopLog():
+    global logFile
+    logFile.close()
+    logFile = None
+    print("Stopped logging frame timings")
+
+# Draw the statistics of every phase in the top right corner of the field, and return the screen rect drawn in
+def draw(screen: pygame.Surface) -> pygame.Rect:
+
+    lines = ["phase: avg / p95 / p99 ms"]
+    for name in history:
+        average, p95, p99 = getStats(name)
+        lines.append(f"{name}: {average:.2f} / {p95:.2f} / {p99:.2f}")
+    lines.append(f"surfaces allocated: {graphics.allocationsLastFrame}")
+    if logFile is not None:
+        lines.append("logging to cache/ (F4 to stop)")
+
+    texts = [graphics.FONT15.render(line, True, colors.WHITE) for line in lines]
+    width = math.ceil((max(text.get_width() for text in texts) + 10) / 50) * 50 # so the background is rarely a new size
+    height = sum(text.get_height() for text in texts) + 10
+    x = Utility.SCREEN_SIZE - width - 5
+    y = 5
+
+    graphics.drawTransparentRectangle(screen, colors.BLACK, 170, x, y, width, height)
+    for text in texts:
+        screen.blit(text, (x + 5, y + 5))
+        y += text.get_height()
+
+    return pygame.Rect(x, 5, width, height)
+
+
+# Testing code
+if __name__ == "__main__":
+    for frame in range(100):
+        beginFrame()
+        with scope("sleep"):
+            time.sleep(0.001 if frame % 10 else 0.005)
+        endFrame()
+    print("sleep: avg %.2f, p95 %.2f, p99 %.2f ms" % getStats("sleep"))
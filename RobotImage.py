@@ -9,18 +9,14 @@ class RobotImage:
         self.transform = fieldTransform
         self.raw = graphics.getImage("Images/robot.png", 0.1)
         self.r = self.raw.get_rect()
-        self.prevZoom = -1
-        self.update()
 
-    def update(self):
-
-        size = (self.r.width * self.transform.zoom, self.r.height * self.transform.zoom)
-        self.scaled = pygame.transform.smoothscale(self.raw, size)
+    # Screen bounding box of the robot drawn at position with any heading
+    def getDrawBounds(self, position: PointRef) -> tuple:
+        x, y = position.screenRef
+        r = math.hypot(self.r.width, self.r.height) * self.transform.zoom / 2
+        return x - r, y - r, x + r, y + r
 
+    # The robot image scaled by the zoom and rotated to the heading comes from graphics.rotatedCache
     def draw(self, screen: pygame.Surface, position: PointRef, heading: float):
-
-        if not math.isclose(self.prevZoom, self.transform.zoom):
-            self.prevZoom = self.transform.zoom
-            self.update()
-        
-        graphics.drawSurface(screen, self.scaled, *position.screenRef, heading * 180 / 3.1415)
\ No newline at end of file
+        image = graphics.getRotatedImage(self.raw, heading * 180 / 3.1415, self.transform.zoom)
+        graphics.drawSurface(screen, image, *position.screenRef)
@@ -1,4 +1,5 @@
 import Utility
+import numpy as np
 
 """This class is used for storing the field transformations (zooming and panning) relative to the screen, as well as
 the image of the field itself.
@@ -12,12 +13,19 @@ To use, simply assign new values to pan and zoom as they have been overloaded:
     f = FieldTransform
     f.pan = (15, 25) -> for (panX, panY)
     f.zoom = 3.5 -> gets clamped back to 3
+
+Every time pan or zoom is assigned, self.version is incremented. Anything cached in screen coordinates can store the
+version it was computed at and recompute only when it no longer matches.
+
+fieldToScreen() and screenToField() do the same conversion as PointRef for a whole numpy array of points at once:
+    f.fieldToScreen(np.array([[0, 0], [72, 72]])) -> array of [x, y] screen coordinates
 """
 class FieldTransform:
 
     def __init__(self, fieldZoom: float = 1, xyFieldPanInPixels: tuple = (0,0)):
         self._zoom = fieldZoom
         self._panX, self._panY = xyFieldPanInPixels
+        self.version = 0
 
     # Restrict the panning range for the field as to keep the field in sight of the screen
     def _boundFieldPan(self):
@@ -32,6 +40,7 @@ class FieldTransform:
     def _setZoom(self, fieldZoom: float):
         self._zoom = Utility.clamp(fieldZoom, 1, 3) # limits to how much you can zoom in or out
         self._boundFieldPan()
+        self.version += 1
 
     # self.zoom property that is gettable and settable
     zoom = property(_getZoom, _setZoom)
@@ -43,6 +52,7 @@ class FieldTransform:
     def _setPan(self, xyFieldPanInPixels: tuple):
         self._panX, self._panY = xyFieldPanInPixels
         self._boundFieldPan()
+        self.version += 1
 
     # self.pan property that is gettable and settable
     pan = property(_getPan, _setPan)
@@ -52,6 +62,26 @@ class FieldTransform:
     def getPartialZoom(self, scalar):
         return (self.zoom - 1) * scalar + 1
 
+    # Convert an array of [x, y] points (shape (..., 2)) in the field reference frame to the screen reference frame
+    def fieldToScreen(self, points) -> np.ndarray:
+        points = np.asarray(points, dtype = float)
+        scalar = Utility.FIELD_SIZE_IN_PIXELS / Utility.FIELD_SIZE_IN_INCHES
+
+        screen = np.empty(points.shape)
+        screen[...,0] = (points[...,0] * scalar + Utility.PIXELS_TO_FIELD_CORNER) * self._zoom + self._panX
+        screen[...,1] = ((Utility.FIELD_SIZE_IN_INCHES - points[...,1]) * scalar + Utility.PIXELS_TO_FIELD_CORNER) * self._zoom + self._panY
+        return screen
+
+    # Convert an array of [x, y] points (shape (..., 2)) in the screen reference frame to the field reference frame
+    def screenToField(self, points) -> np.ndarray:
+        points = np.asarray(points, dtype = float)
+        scalar = Utility.FIELD_SIZE_IN_INCHES / Utility.FIELD_SIZE_IN_PIXELS
+
+        field = np.empty(points.shape)
+        field[...,0] = ((points[...,0] - self._panX) / self._zoom - Utility.PIXELS_TO_FIELD_CORNER) * scalar
+        field[...,1] = Utility.FIELD_SIZE_IN_INCHES - ((points[...,1] - self._panY) / self._zoom - Utility.PIXELS_TO_FIELD_CORNER) * scalar
+        return field
+
     def __str__(self):
         return "FieldTransform object\nzoom: {}\npan: ({},{})".format(self._zoom, self._panX, self._panY)
 
@@ -62,3 +92,6 @@ if __name__ == "__main__":
     f.zoom = 4
     f.pan = -10000, 1000
     print(f)
+    points = np.array([[0, 0], [72, 72], [144, 10]])
+    print(f.fieldToScreen(points))
+    print(f.screenToField(f.fieldToScreen(points)))
@@ -20,6 +20,9 @@ Now, through the automatic getter and setter methods, you can use the screen and
     print(p.fieldRef)
     p.fieldRef = (1,-1)
     print(p.screenRef)
+
+The screen coordinates are memoized along with the FieldTransform version they were computed at, so reading screenRef
+repeatedly in the same frame only converts once. Assigning either reference frame invalidates the memoized value.
 """
 
 class Ref(Enum):
@@ -28,9 +31,12 @@ class Ref(Enum):
 
 class PointRef:
 
+    __slots__ = ("transform", "_xf", "_yf", "_screen", "_screenVersion")
+
     def __init__(self, referenceMode: Ref = None, point: tuple = (0,0)):
         self.transform = transform
         self._xf, self._yf = None, None
+        self._screen, self._screenVersion = None, None
         if referenceMode == Ref.SCREEN:
             self.screenRef = point
         else:
@@ -47,9 +53,15 @@ class PointRef:
         # convert to field reference frame
         self._xf = (normalizedScreenX - Utility.PIXELS_TO_FIELD_CORNER) / Utility.FIELD_SIZE_IN_PIXELS * Utility.FIELD_SIZE_IN_INCHES
         self._yf = 144-(normalizedScreenY - Utility.PIXELS_TO_FIELD_CORNER) / Utility.FIELD_SIZE_IN_PIXELS * Utility.FIELD_SIZE_IN_INCHES
+        self._screenVersion = None
 
     # Given we only store the point in the field reference frame, we need to convert it to return as screen reference frame
     def _getScreenRef(self) -> tuple:
+
+        # reuse the last conversion if the field hasn't been zoomed or panned since
+        if self._screenVersion == self.transform.version:
+            return self._screen
+
         # convert to normalized (pre-zoom and pre-panning) coordinates
         normalizedScreenX = self._xf / Utility.FIELD_SIZE_IN_INCHES * Utility.FIELD_SIZE_IN_PIXELS + Utility.PIXELS_TO_FIELD_CORNER
         normalizedScreenY = (144-self._yf) / Utility.FIELD_SIZE_IN_INCHES * Utility.FIELD_SIZE_IN_PIXELS + Utility.PIXELS_TO_FIELD_CORNER
@@ -59,13 +71,16 @@ class PointRef:
         xs = normalizedScreenX * self.transform.zoom + panX
         ys = normalizedScreenY * self.transform.zoom + panY
 
-        return xs, ys
+        self._screen = xs, ys
+        self._screenVersion = self.transform.version
+        return self._screen
 
     # getter and setter for point in screen reference frame
     screenRef = property(_getScreenRef, _setScreenRef)
     
     def _setFieldRef(self, point: tuple) -> None:
         self._xf, self._yf = point
+        self._screenVersion = None
         
     def _getFieldRef(self) -> tuple:
         return self._xf, self._yf
@@ -79,15 +94,17 @@ class PointRef:
 
     # PointRef + VectorRef = PointRef
     def __add__(self, other: 'VectorRef') -> 'PointRef':
-        return PointRef(Ref.FIELD, Utility.addTuples(self.fieldRef, other.fieldRef))
+        x, y = other.fieldRef
+        return PointRef(Ref.FIELD, (self._xf + x, self._yf + y))
 
     # PointRef - VectorRef = PointRef
     # PointRef - PointRef = VectorRef
     def __sub__(self, other):
+        x, y = other.fieldRef
         if type(other) == PointRef:
-            return VectorRef(Ref.FIELD, Utility.subtractTuples(self.fieldRef, other.fieldRef))
+            return VectorRef(Ref.FIELD, (self._xf - x, self._yf - y))
         else: # other is of type VectorRef
-            return PointRef(Ref.FIELD, Utility.subtractTuples(self.fieldRef, other.fieldRef))
+            return PointRef(Ref.FIELD, (self._xf - x, self._yf - y))
 
     def __eq__(self, other):
 
@@ -113,6 +130,8 @@ VectorRef - VectorRef = VectorRef
 """
 class VectorRef:
 
+    __slots__ = ("transform", "_vxf", "_vyf")
+
     def __init__(self, referenceMode: Ref, vector: tuple = (0,0), magnitude: float = None, heading: float = None):
         self.transform: FieldTransform = transform
         self._vxf, self._vyf = None, None
@@ -145,7 +164,7 @@ class VectorRef:
         scalar = self.transform.zoom * Utility.FIELD_SIZE_IN_PIXELS / Utility.FIELD_SIZE_IN_INCHES
         return self._vxf * scalar, (144-self._vyf) * scalar
 
-    screenRef = property(_getScreenRef, _getScreenRef)
+    screenRef = property(_getScreenRef, _setScreenRef)
 
     # Return the magnitude of the vector based on the given reference frame
     def magnitude(self, referenceFrame: Ref) -> float:
@@ -173,21 +192,28 @@ class VectorRef:
 
     # Vector addition. Does not modify but returns new VectorRef
     def __add__(self, other: 'VectorRef') -> 'VectorRef':
-        return VectorRef(Ref.FIELD, Utility.addTuples(self.fieldRef, other.fieldRef))
+        x, y = other.fieldRef
+        return VectorRef(Ref.FIELD, (self._vxf + x, self._vyf + y))
 
     # Vector subtraction. Does not modify but returns new VectorRef
     def __sub__(self, other: 'VectorRef') -> 'VectorRef':
-        return VectorRef(Ref.FIELD, Utility.subtractTuples(self.fieldRef, other.fieldRef))
+        x, y = other.fieldRef
+        return VectorRef(Ref.FIELD, (self._vxf - x, self._vyf - y))
 
     # Scales vector by some scalar. Does not modify but returns new VectorRef
     def __mul__(self, scalar: float) -> 'VectorRef':
-        return VectorRef(Ref.FIELD, Utility.scaleTuple(self.fieldRef, scalar))
+        return VectorRef(Ref.FIELD, (self._vxf * scalar, self._vyf * scalar))
 
 class ScalarRef:
 
+    __slots__ = ("transform", "fieldRef")
+
     def __init__(self, referenceMode: Ref, value: float):
         self.transform: FieldTransform = transform
-        self.fieldRef = value
+        if referenceMode == Ref.SCREEN:
+            self.screenRef = value
+        else:
+            self.fieldRef = value
 
     # Given we only store the point in the field reference frame, convert to field reference frame before storing it
     def _setScreenRef(self, valueScreenRef: tuple):
@@ -199,7 +225,7 @@ class ScalarRef:
         scalar = self.transform.zoom * Utility.FIELD_SIZE_IN_PIXELS / Utility.FIELD_SIZE_IN_INCHES
         return self.fieldRef * scalar
 
-    screenRef = property(_getScreenRef, _getScreenRef)
+    screenRef = property(_getScreenRef, _setScreenRef)
 
 
 # Testing code
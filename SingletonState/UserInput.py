@@ -1,4 +1,4 @@
-import pygame, Utility
+import pygame, Utility, Profiler
 from SingletonState.ReferenceFrame import PointRef
 from SingletonState.FieldTransform import FieldTransform
     
@@ -25,6 +25,12 @@ class UserInput:
 
         # Key that was just pressed this frame
         self.keyJustPressed = None
+
+        # Whether there was any event this frame other than the mouse moving
+        self.isAnyEvent = False
+
+        # Whether there was any event at all this frame, including the mouse moving
+        self.isAnyInput = False
         
         # Amount of shift on the mousewheel
         self.mousewheelDelta = 0
@@ -61,6 +67,8 @@ class UserInput:
     # Reset user input state at the start of each frame
     def resetState(self):
         self.keyJustPressed = None
+        self.isAnyEvent = False
+        self.isAnyInput = False
         self.isQuit = False
 
         self.mousewheelDelta = 0
@@ -76,13 +84,29 @@ class UserInput:
         self.loadedFile = None
 
     # Update the UserInput state machine. keyJustPressed is the key pressed starting in this frame, or None if none exists.
-    # Call this at the start of every frame
-    def getUserInput(self):
+    # Call this at the start of every frame. If there are no events yet, block for up to waitMilliseconds for one
+    def getUserInput(self, waitMilliseconds: int = 0):
 
         # handle events
         self.resetState()
 
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if len(events) == 0 and waitMilliseconds > 0:
+            event = pygame.event.wait(waitMilliseconds)
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+
+        self._handleEvents(events)
+
+    # Update the state from this frame's events. Timed separately from waiting for them
+    @Profiler.timed("getUserInput")
+    def _handleEvents(self, events: list):
+
+        for event in events:
+
+            self.isAnyInput = True
+            if event.type != pygame.MOUSEMOTION:
+                self.isAnyEvent = True
 
             if event.type == pygame.QUIT:
                 self.isQuit = True
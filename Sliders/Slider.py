@@ -15,6 +15,9 @@ does not implement Tooltip owner because of custom functionality where tooltip i
 
 class Slider(Draggable, TooltipOwner):
 
+    __slots__ = ("x", "y", "width", "min", "max", "step", "color", "text", "onSet", "textX", "textY", "rounding", "default",
+        "val", "tooltip", "isDragging")
+
     def getRounding(self, num: str) -> int:
         if "." in num:
             index = num.index(".")
@@ -95,7 +98,7 @@ class Slider(Draggable, TooltipOwner):
         graphics.drawCircle(screen, self.getCircleX(), self.y, self.color, 8)
 
     # Draw tooltip for value
-    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> None:
+    def drawTooltip(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
 
-        self.tooltip.draw(screen, (mousePosition[0], self.y - 58))
+        return self.tooltip.draw(screen, (mousePosition[0], self.y - 58))
         
\ No newline at end of file
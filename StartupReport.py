@@ -0,0 +1,90 @@
+import builtins, sys, time
+from contextlib import contextmanager
+
+"""
+Times how long the program takes to show its first frame, so that slower startups are noticed. main.py imports this
+before anything else and calls trackImports(), which times the import of every module main.py imports (including the
+modules they import in turn). Assets like images and fonts are timed with timeAsset() when they are loaded, and
+finish() is called once the first frame is drawn.
+
+finish() always prints the time to the first frame. Running with --startup-report also prints the milliseconds of each
+import and asset, slowest first.
+"""
+
+startTime = time.perf_counter()
+firstFrameTime = None
+
+imports: list[tuple] = [] # (module name, milliseconds)
+assets: list[tuple] = [] # (asset name, milliseconds)
+
+_originalImport = builtins.__import__
+_importDepth = 0
+
+# Time imports made at the top level of the importing code, each including all the imports it triggers
+def _timedImport(name, *args, **kwargs):
+    global _importDepth
+
+    if _importDepth > 0 or name in sys.modules:
+        _importDepth += 1
+        try:
+            return _originalImport(name, *args, **kwargs)
+        finally:
+            _importDepth -= 1
+
+    _importDepth += 1
+    start = time.perf_counter()
+    try:
+        return _originalImport(name, *args, **kwargs)
+    finally:
+        _importDepth -= 1
+        imports.append((name, (time.perf_counter() - start) * 1000))
+
+def trackImports():
+    builtins.__import__ = _timedImport
+
+def stopTrackingImports():
+    builtins.__import__ = _originalImport
+
+@contextmanager
+def timeAsset(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if firstFrameTime is None:
+            assets.append((name, (time.perf_counter() - start) * 1000))
+
+# Called when the first frame has been drawn
+def finish():
+    global firstFrameTime
+
+    if firstFrameTime is not None:
+        return
+    firstFrameTime = time.perf_counter()
+    stopTrackingImports()
+
+    print(f"Started in {(firstFrameTime - startTime) * 1000:.0f} ms")
+    if "--startup-report" in sys.argv:
+        print(getReport())
+
+def getReport() -> str:
+
+    total = ((firstFrameTime or time.perf_counter()) - startTime) * 1000
+    lines = [f"Time to first frame: {total:.1f} ms"]
+
+    for title, times in [("Imports", imports), ("Assets", assets)]:
+        lines.append(f"{title} ({sum(ms for _, ms in times):.1f} ms total):")
+        for name, ms in sorted(times, key = lambda item: -item[1]):
+            lines.append(f"  {ms:8.2f} ms  {name}")
+
+    return "\n".join(lines)
+
+
+# Testing code
+if __name__ == "__main__":
+    trackImports()
+    import json, decimal
+    with timeAsset("sleep"):
+        time.sleep(0.01)
+    finish()
+    print(getReport())
@@ -0,0 +1,67 @@
+import pygame
+from collections import OrderedDict
+
+"""
+A bounded least-recently-used cache of surfaces. get(key, create) returns the cached surface for key, or calls create()
+to make it, stores it, and evicts the least recently used surfaces once there are more than maxEntries of them, or
+(if maxBytes is given) once they take up more than maxBytes of pixel memory.
+
+hits and misses count lookups, so the hit rate of a cache can be checked with getHitRate().
+"""
+
+class SurfaceCache:
+
+    def __init__(self, maxEntries: int, maxBytes: int = None):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+
+        self.surfaces: OrderedDict = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, create) -> pygame.Surface:
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = create()
+        self.surfaces[key] = surface
+        self.bytes += self._getBytes(surface)
+
+        while len(self.surfaces) > self.maxEntries or (self.maxBytes is not None and self.bytes > self.maxBytes and len(self.surfaces) > 1):
+            _, evicted = self.surfaces.popitem(last = False)
+            self.bytes -= self._getBytes(evicted)
+
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+
+    # Fraction of lookups that were already cached
+    def getHitRate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0
+
+    def _getBytes(self, surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def __str__(self):
+        return f"{len(self.surfaces)} surfaces, {self.bytes // 1024} KB, hit rate {round(self.getHitRate() * 100, 1)}%"
+
+
+# Testing code
+if __name__ == "__main__":
+    cache = SurfaceCache(3, maxBytes = 4 * 100 * 100 * 2)
+    for key in [1, 2, 1, 3, 4, 1, 5]:
+        cache.get(key, lambda: pygame.Surface((100, 100), pygame.SRCALPHA))
+    print(list(cache.surfaces.keys()), cache) # [1, 5], since the byte limit only fits two
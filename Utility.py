@@ -1,4 +1,5 @@
 import pygame, math, pygame.gfxdraw, platform, os
+import numpy as np
 
 pygame.font.init()
 
@@ -19,6 +20,9 @@ FIELD_SIZE_IN_INCHES = 144
 RED_GOAL = (129, 129)
 BLUE_GOAL = (15, 15)
 
+MAX_FPS = 60 # frame rate cap, reached while dragging, scrolling or playing back the simulation
+IDLE_WAIT_MS = 1000 # longest time to block waiting for input when nothing on the screen is moving
+
 def setTarget(target):
     global SAVE_TARGET, SAVE_TARGET_NAME
     SAVE_TARGET = target
@@ -113,6 +117,19 @@ def pointOnLineClosestToPoint(pointX: int, pointY: int, firstX: int, firstY: int
     scalar = (ax * bx + ay * by) / (bx * bx + by * by)
     return [firstX + scalar * bx, firstY + scalar * by]
 
+# Closest point to (x, y) on a polyline given as an (N,2) array, found for all segments at once
+# Returns the segment index, the fraction [0,1] along that segment, and the distance
+def closestPointOnPolyline(points, x: float, y: float) -> tuple:
+    a = points[:-1]
+    b = points[1:] - a
+    lengthSquared = (b * b).sum(axis = 1)
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        fraction = np.clip(((x - a[:,0]) * b[:,0] + (y - a[:,1]) * b[:,1]) / lengthSquared, 0, 1)
+    fraction = np.nan_to_num(fraction) # zero-length segments
+    distances = np.hypot(a[:,0] + fraction * b[:,0] - x, a[:,1] + fraction * b[:,1] - y)
+    index = int(np.argmin(distances))
+    return index, float(fraction[index]), float(distances[index])
+
 # Get the theta between positive x and the line from point A to point B
 def thetaTwoPoints(pointA: tuple, pointB: tuple) -> float:
     return (math.atan2(pointB[1] - pointA[1], pointB[0] - pointA[0])) % (3.1415*2)
@@ -0,0 +1,77 @@
+import Utility, pygame
+
+"""
+Collects the parts of the screen that changed this frame, so that only those are redrawn and sent to the display with
+pygame.display.update(rects) instead of flipping the whole window.
+
+Renderers report changed regions as screen bounding boxes (x1, y1, x2, y2), usually from Hoverable.getDrawBounds().
+A None box means the changed region is unknown, which falls back to redrawing the whole screen, as does
+invalidateAll() for things like panning, zooming, or adding and deleting nodes. If the dirty boxes end up covering more
+than FULL_REDRAW_FRACTION of the screen, it is cheaper to just redraw everything.
+"""
+
+FULL_REDRAW_FRACTION = 0.6
+CLIP_MARGIN = 8 # antialiased and thick lines are drawn slightly differently where they cross the clip's edge
+
+class DirtyRects:
+
+    def __init__(self):
+        self.screenRect = pygame.Rect(0, 0, Utility.SCREEN_SIZE + Utility.PANEL_WIDTH, Utility.SCREEN_SIZE)
+        self.previous: dict = {} # name -> whatever was remembered under that name last frame
+        self.clear()
+
+    # Start a new frame with nothing dirty
+    def clear(self):
+        self.rects: list[pygame.Rect] = []
+        self.isFull = False
+
+    def invalidateAll(self):
+        self.isFull = True
+
+    # Mark the bounding box (x1, y1, x2, y2) or pygame.Rect as changed. None marks the whole screen
+    def add(self, bounds):
+
+        if bounds is None:
+            self.invalidateAll()
+            return
+
+        if not isinstance(bounds, pygame.Rect):
+            # grow by a pixel on each side to cover antialiasing and rounding of the drawn shapes
+            x1, y1, x2, y2 = bounds
+            bounds = pygame.Rect(int(x1) - 1, int(y1) - 1, int(x2 - x1) + 3, int(y2 - y1) + 3)
+
+        bounds = bounds.clip(self.screenRect)
+        if bounds.width > 0 and bounds.height > 0:
+            self.rects.append(bounds)
+
+    # Return whether value differs from the one remembered under name last frame, and remember it for next frame
+    def hasChanged(self, name: str, value) -> bool:
+        changed = name not in self.previous or self.previous[name] != value
+        self.previous[name] = value
+        return changed
+
+    # For something drawn in the list of boxes bounds: if the boxes or key differ from last frame, mark both the old and
+    # new boxes, since whatever was drawn in the old ones has to be erased
+    def addIfChanged(self, name: str, bounds: list, key = None):
+        previous = self.previous.get(name)
+        if self.hasChanged(name, (bounds, key)):
+            for box in ([] if previous is None else previous[0]) + bounds:
+                self.add(box)
+
+    def isEmpty(self) -> bool:
+        return not self.isFull and len(self.rects) == 0
+
+    # The rects to pass to pygame.display.update(). The whole screen if everything is dirty, or if the dirty rects
+    # together are large enough that redrawing everything is cheaper
+    def getRects(self) -> list[pygame.Rect]:
+        if self.isFull or sum(r.width * r.height for r in self.rects) > FULL_REDRAW_FRACTION * self.screenRect.width * self.screenRect.height:
+            return [self.screenRect]
+        return self.rects
+
+    # A single rect containing every dirty rect, to set as the screen's clip while drawing. It has a margin around the
+    # dirty rects so that anything drawn differently at the edge of the clip is never sent to the display
+    def getClip(self) -> pygame.Rect:
+        rects = self.getRects()
+        if len(rects) == 0:
+            return pygame.Rect(0, 0, 0, 0)
+        return rects[0].unionall(rects[1:]).inflate(CLIP_MARGIN * 2, CLIP_MARGIN * 2).clip(self.screenRect)
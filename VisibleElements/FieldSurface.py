@@ -2,35 +2,76 @@ from SingletonState.FieldTransform import FieldTransform
 from SingletonState.ReferenceFrame import PointRef
 from SingletonState.UserInput import UserInput
 from MouseInterfaces.Draggable import Draggable
-import Utility, pygame
+import Utility, pygame, threading, time, StartupReport
 
 """A class that stores the scaled surface of the vex field, and contains a draw() method to draw it onto the screen.
 It implements Draggable, meaning that the mouse can drag the field to pan the screen. This is coupled with FieldTransform,
 in that panning the screen will change panning values in FieldTransform and therefore pan every other object on the field.
+
+Smoothscaling the whole field at every mousewheel tick is slow, so while the mousewheel is zooming, only the visible part
+of the nearest precomputed zoom level (built in the background at startup) is quickly scaled to the screen. Once the
+zoom stays the same for REFINE_DELAY seconds, the field is smoothscaled to the exact zoom again. Either way, only the
+part of the field that is visible on the screen is blitted.
 """
 
+LEVEL_ZOOMS = [1, 1.5, 2, 3] # zoom levels precomputed for previewing while zooming
+REFINE_DELAY = 0.15 # seconds without zooming before the field is smoothscaled to the exact zoom
+
 class FieldSurface(Draggable):
 
     def __init__(self, fieldTransform: FieldTransform):
         self.transform = fieldTransform
-        self.rawFieldSurface: pygame.Surface = pygame.image.load("Images/squarefield.png")
-        self.updateScaledSurface()
+        with StartupReport.timeAsset("Images/squarefield.png"):
+            self.rawFieldSurface: pygame.Surface = pygame.image.load("Images/squarefield.png")
+
+        self.version = 0 # incremented whenever the drawn field changes without the transform changing
+        self.zoomTime = None # when the field was last zoomed, if it is still being previewed
+
+        self.refineScaledSurface()
+
+        # zoom -> field smoothscaled to that zoom, filled in by a background thread
+        self.levels: dict[float, pygame.Surface] = {}
+        threading.Thread(target = self._buildLevels, daemon = True).start()
 
         self.startDragX, self.startDragY = None, None # For calculating mouse dragging delta to determine panning amount
         self.startPanX, self.startPanY = None, None
 
         super().__init__()
 
-    # Whenever the zoom is changed, this function should be called to scale the raw surface into the scaled one
+    # Whenever the zoom is changed, this function should be called. The field is previewed until zooming stops
     def updateScaledSurface(self):
-        self.scaledFieldSurface: pygame.Surface = pygame.transform.smoothscale(
-            self.rawFieldSurface, [Utility.SCREEN_SIZE * self.transform.zoom, Utility.SCREEN_SIZE * self.transform.zoom])
+        self.zoomTime = time.time()
+
+    # Smoothscale the raw surface to the current zoom
+    def refineScaledSurface(self):
+        self.scaledFieldSurface: pygame.Surface = self._smoothscale(self.transform.zoom)
+        self.scaledZoom = self.transform.zoom
+        self.zoomTime = None
+        self.version += 1
+
+    def isRefinePending(self) -> bool:
+        return self.zoomTime is not None
+
+    # Called every frame. Refine the field once zooming has stopped
+    def update(self):
+        if self.isRefinePending() and time.time() - self.zoomTime > REFINE_DELAY:
+            self.refineScaledSurface()
+
+    def _smoothscale(self, zoom: float) -> pygame.Surface:
+        return pygame.transform.smoothscale(self.rawFieldSurface, [Utility.SCREEN_SIZE * zoom, Utility.SCREEN_SIZE * zoom])
+
+    def _buildLevels(self):
+        for zoom in LEVEL_ZOOMS:
+            self.levels[zoom] = self._smoothscale(zoom)
 
 
     def checkIfHovering(self, userInput: UserInput) -> bool:
         return True
 
-    
+    # The field looks the same whether hovered or not, so hovering it changes nothing on the screen
+    def getDrawBounds(self) -> tuple:
+        return 0, 0, 0, 0
+
     # Called when the field was just pressed at the start of the drag.
     # Get the current mouse and pan position so that new pan based on changes in mouse position can be calculated
     def startDragging(self, userInput: UserInput):
@@ -51,9 +92,32 @@ class FieldSurface(Draggable):
     def stopDragging(self):
         pass
 
-    # Draw the scaled field with the stored pan
+    # Draw the visible part of the scaled field with the stored pan
     def draw(self, screen: pygame.Surface):
-        screen.blit(self.scaledFieldSurface, self.transform.pan)
+
+        if self.isRefinePending() or self.scaledZoom != self.transform.zoom:
+            self._drawPreview(screen)
+            return
+
+        # pan is never positive, and blitting at a fractional position truncates it
+        panX, panY = self.transform.pan
+        screen.blit(self.scaledFieldSurface, (0, 0), (-int(panX), -int(panY), Utility.SCREEN_SIZE, Utility.SCREEN_SIZE))
+
+    # Quickly scale the visible part of the smallest zoom level at least as large as the zoom onto the screen
+    def _drawPreview(self, screen: pygame.Surface):
+
+        zoom = self.transform.zoom
+        candidates = {self.rawFieldSurface.get_width() / Utility.SCREEN_SIZE: self.rawFieldSurface, **self.levels}
+        larger = [levelZoom for levelZoom in candidates if levelZoom >= zoom]
+        sourceZoom = min(larger) if len(larger) > 0 else max(candidates)
+        source = candidates[sourceZoom]
+
+        # the visible part of the field, in pixels of the source
+        scale = sourceZoom / zoom
+        panX, panY = self.transform.pan
+        region = pygame.Rect(-panX * scale, -panY * scale, Utility.SCREEN_SIZE * scale, Utility.SCREEN_SIZE * scale).clip(source.get_rect())
+
+        screen.blit(pygame.transform.scale(source.subsurface(region), (Utility.SCREEN_SIZE, Utility.SCREEN_SIZE)), (0, 0))
 
     def __str__(self):
         return "FieldSurface with transform: {}".format(self.transform)
\ No newline at end of file
@@ -0,0 +1,36 @@
+import pygame
+
+"""
+A cached drawing of one part of the screen, like the field or the command panel. Drawing a layer is a single blit of
+its cached surface; the expensive drawing only happens when the layer is rebuilt.
+
+Each layer remembers the key it was last drawn with, usually a tuple of version counters (FieldTransform.version,
+Program.pathVersion, Program.commandsVersion, Scroller.version) and whatever hover state changes its appearance.
+isValid(key) tells whether the cached surface is still up to date, and begin(key) returns the surface to redraw it on.
+Layers are drawn in screen coordinates, so the surface covers the screen from the top left corner down to the bottom
+right of the layer's rect, and only the rect is blitted.
+"""
+
+class Layer:
+
+    def __init__(self, rect: pygame.Rect):
+        self.rect = pygame.Rect(rect)
+        self.surface = pygame.Surface((self.rect.right, self.rect.bottom)).convert()
+        self.key = None
+        self.rebuilds = 0 # number of times the layer was redrawn, for profiling
+
+    def isValid(self, key) -> bool:
+        return self.key is not None and self.key == key
+
+    # Mark the layer as up to date for key, and return the surface it should be redrawn on
+    def begin(self, key) -> pygame.Surface:
+        self.key = key
+        self.rebuilds += 1
+        return self.surface
+
+    # Force the layer to be redrawn the next time it is used
+    def invalidate(self):
+        self.key = None
+
+    def draw(self, screen: pygame.Surface):
+        screen.blit(self.surface, self.rect, self.rect)
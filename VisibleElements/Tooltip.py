@@ -1,22 +1,35 @@
 import Utility, colors, graphics, pygame
+from SurfaceCache import SurfaceCache
 
 """
 Classes that have a self.tooltip instance variable storing a Tooltip object will have a tooltip displayed
 when the mouse is hovering over the object
+
+Making a Tooltip only stores its messages. The surface is rendered the first time the tooltip is drawn, and shared
+through tooltipCache by every tooltip with the same messages, so commands and sliders can make tooltips freely.
 """
 
 BACKGROUND_COLOR = [220, 220, 200]
 TEXT_COLOR = [0,0,0]
 
+# Rendered tooltip surfaces, keyed by the tuple of messages
+tooltipCache: SurfaceCache = SurfaceCache(128)
+
 class Tooltip:
 
     def __init__(self, *messages: str):
 
-        self.tooltip = self.getTooltipSurface(messages)
+        self.messages = messages
+
+    # The rendered tooltip, from the cache
+    def getSurface(self) -> pygame.Surface:
+        return tooltipCache.get(self.messages, lambda: self.getTooltipSurface(self.messages))
 
     # Return a tooltip surface based on message parameter(s). Each parameter is a new line
     def getTooltipSurface(self, messages):
 
+        graphics.countAllocation()
+
         # generate temporary text surfaces for each line to figure out width and height of text
         texts = [graphics.FONT15.render(message, True, TEXT_COLOR) for message in messages]
 
@@ -42,20 +55,22 @@ class Tooltip:
 
         return tooltipSurface
 
-    # Draw the tooltip approximately where the mouse position is
-    def draw(self, screen: pygame.Surface, mousePosition: tuple):
+    # Draw the tooltip approximately where the mouse position is, and return the screen rect it was drawn in
+    def draw(self, screen: pygame.Surface, mousePosition: tuple) -> pygame.Rect:
 
         Y_SEPARATION_FROM_MOUSE: int = -45
+
+        tooltip = self.getSurface()
         
         # Calculate tooltip position, preventing tooltip from going above or left of screen
-        x = max(0, int(mousePosition[0] - self.tooltip.get_width()/2))
-        y = max(0, int(mousePosition[1] - self.tooltip.get_height() - Y_SEPARATION_FROM_MOUSE))
+        x = max(0, int(mousePosition[0] - tooltip.get_width()/2))
+        y = max(0, int(mousePosition[1] - tooltip.get_height() - Y_SEPARATION_FROM_MOUSE))
 
         # prevent tooltip from spilling over right edge of screen
-        x = min(x, Utility.SCREEN_SIZE + Utility.PANEL_WIDTH - self.tooltip.get_width())
+        x = min(x, Utility.SCREEN_SIZE + Utility.PANEL_WIDTH - tooltip.get_width())
 
         # if y is spilling in the bottom, make tooltip above mouse instead
-        if y + self.tooltip.get_height() > Utility.SCREEN_SIZE:
-            y = int(mousePosition[1] - self.tooltip.get_height() - 10)
+        if y + tooltip.get_height() > Utility.SCREEN_SIZE:
+            y = int(mousePosition[1] - tooltip.get_height() - 10)
 
-        screen.blit(self.tooltip, (x,y))
\ No newline at end of file
+        return screen.blit(tooltip, (x,y))
\ No newline at end of file
@@ -1,6 +1,7 @@
 PANEL_GREY = (169, 169, 169)
 BORDER_GREY = (64, 64, 64)
 BLACK = (0,0,0)
+WHITE = (255,255,255)
 ORANGE = (150, 70, 0)
 BLUE = (0,0,230)
 DARKBLUE = (0,0,130)
@@ -1,4 +1,7 @@
-import pygame, math, Utility, colors, colorsys
+import pygame, math, Utility, colors, colorsys, StartupReport
+import numpy as np
+from SurfaceCache import SurfaceCache
+from AssetAtlas import AssetAtlas
 
 """
 A class that cycles through each hue gradually through next(), which returns a color
@@ -20,24 +23,146 @@ class ColorCycle:
 
 
 FONT_PATH = 'Corbel.ttf'
-FONT15 = pygame.font.Font(FONT_PATH, 15)
-FONT20 = pygame.font.Font(FONT_PATH, 20)
-FONT25 = pygame.font.Font(FONT_PATH, 25)
-FONT30 = pygame.font.Font(FONT_PATH, 30)
-FONT40 = pygame.font.Font(FONT_PATH, 40)
 
-FONTCODE = pygame.font.SysFont("arial", 8)
+# Fonts are loaded the first time they are used, like graphics.FONT15, through the module __getattr__ below.
+# Name -> (font file, or system font name if isSystemFont, size, isSystemFont)
+FONTS = {
+    "FONT15": (FONT_PATH, 15, False),
+    "FONT20": (FONT_PATH, 20, False),
+    "FONT25": (FONT_PATH, 25, False),
+    "FONT30": (FONT_PATH, 30, False),
+    "FONT40": (FONT_PATH, 40, False),
+    "FONTCODE": ("arial", 8, True), # finding system fonts can take a while, so this one especially is only loaded if needed
+}
+
+# Load a font in FONTS and store it as a module attribute, so later uses don't go through __getattr__
+def loadFont(name: str) -> pygame.font.Font:
+
+    if name in globals():
+        return globals()[name]
+
+    font, size, isSystemFont = FONTS[name]
+    with StartupReport.timeAsset(name):
+        globals()[name] = pygame.font.SysFont(font, size) if isSystemFont else pygame.font.Font(font, size)
+    return globals()[name]
+
+def __getattr__(name: str):
+    if name in FONTS:
+        return loadFont(name)
+    raise AttributeError(f"module 'graphics' has no attribute '{name}'")
+
+# Number of surfaces created by the drawing functions below, this frame and last frame. In steady state (nothing new
+# on screen), frames should allocate nothing, since text, alpha circles and rectangles come from caches and alpha
+# lines and polylines are drawn on a reused scratch surface
+allocations = 0
+allocationsLastFrame = 0
+
+def countAllocation():
+    global allocations
+    allocations += 1
+
+# Called once per frame after drawing
+def endFrame():
+    global allocations, allocationsLastFrame
+    allocationsLastFrame = allocations
+    allocations = 0
+
+# Translucent shapes that look the same every time they are drawn, like alpha circles and rectangles, keyed by their
+# shape, color and alpha
+spriteCache: SurfaceCache = SurfaceCache(256)
+
+# A transparent surface reused for drawing translucent shapes that differ every frame, like alpha lines. It only grows
+_scratchSurface: pygame.Surface = None
+
+# Return the scratch surface, at least width x height, with the area (0, 0, width, height) cleared to transparent and
+# set as its clip, so shapes are drawn exactly as on a new surface of that size. Only use it until the next call
+def getScratchSurface(width: int, height: int) -> pygame.Surface:
+    global _scratchSurface
+
+    width, height = max(1, int(width)), max(1, int(height))
+    if _scratchSurface is None or _scratchSurface.get_width() < width or _scratchSurface.get_height() < height:
+        countAllocation()
+        size = (width, height) if _scratchSurface is None else (max(width, _scratchSurface.get_width()), max(height, _scratchSurface.get_height()))
+        _scratchSurface = pygame.Surface(size, pygame.SRCALPHA)
+
+    _scratchSurface.set_clip((0, 0, width, height))
+    _scratchSurface.fill((0, 0, 0, 0))
+    return _scratchSurface
+
+# Rendered (and rotated) text surfaces, keyed by (font, string, color, angle in degrees). Labels are redrawn with the
+# same text almost every frame, so this skips font.render() for nearly all of them
+textCache: SurfaceCache = SurfaceCache(1024)
+TEXT_ANGLE_STEP = 1 # degrees. drawTextRotate() rounds angles to this so nearby angles share a surface
+
+# Return the rendered text surface from the cache, rotated counterclockwise by angle degrees. Do not modify it
+def getTextSurface(font: pygame.font.Font, string: str, color: tuple, angle: float = 0) -> pygame.Surface:
+
+    def render():
+        countAllocation()
+        text = font.render(string, True, color)
+        return text if angle == 0 else pygame.transform.rotate(text, angle)
+
+    return textCache.get((font, string, tuple(color), angle), render)
+
+# Scaled and rotated images, keyed by (image, zoom, angle in degrees). The robot and start node are drawn at the same
+# few angles over and over, so this skips most pygame.transform calls. Capped at 64 MB of pixels
+rotatedCache: SurfaceCache = SurfaceCache(2048, maxBytes = 64 * 1024 * 1024)
+ROTATE_ANGLE_STEP = 1 # degrees. getRotatedImage() rounds angles to this so nearby angles share a surface
+
+# Return image smoothscaled by zoom and rotated counterclockwise by angle degrees, from the cache. Do not modify it
+def getRotatedImage(image: pygame.Surface, angle: float, zoom: float = 1) -> pygame.Surface:
+
+    angle = round(angle / ROTATE_ANGLE_STEP) * ROTATE_ANGLE_STEP % 360
+    zoom = round(zoom, 3)
+
+    def scale():
+        countAllocation()
+        return pygame.transform.smoothscale(image, (image.get_width() * zoom, image.get_height() * zoom))
+
+    def rotate():
+        countAllocation()
+        return pygame.transform.rotate(getRotatedImage(image, 0, zoom), angle)
+
+    if angle == 0:
+        return image if zoom == 1 else rotatedCache.get((image, zoom, 0), scale)
+    return rotatedCache.get((image, zoom, angle), rotate)
 
 def getFont(size):
     if size < 25:
-        return FONT20
+        return loadFont("FONT20")
     elif size < 35:
-        return FONT30
+        return loadFont("FONT30")
     else:
-        return FONT40
+        return loadFont("FONT40")
 
-# Return an image given a filename
+# Every image loaded by getImage(), keyed by (filename, imageScale). Commands load the same few icons for every
+# instance, so each file is only decoded and scaled once and the surface is shared
+images: dict[tuple, pygame.Surface] = {}
+
+# The prebuilt images, loaded on the first getImage(). See AssetAtlas.py
+atlas: AssetAtlas = AssetAtlas()
+
+# Return an image given a filename, from the images registry. The surface is shared, so do not modify it
 def getImage(filename: str, imageScale: float = 1) -> pygame.Surface:
+
+    key = (filename, imageScale)
+    if key in images:
+        return images[key]
+
+    if not atlas.isLoaded:
+        with StartupReport.timeAsset("atlas"):
+            atlas.load()
+
+    with StartupReport.timeAsset(f"{filename} x{imageScale}"):
+        image = atlas.get(filename, imageScale)
+        if image is None:
+            image = loadImage(filename, imageScale)
+
+    images[key] = image
+    return image
+
+# Load an image from its file and scale it
+def loadImage(filename: str, imageScale: float = 1) -> pygame.Surface:
     unscaledImage = pygame.image.load(filename).convert_alpha()
     if imageScale == 1:
         return unscaledImage
@@ -66,7 +191,7 @@ def getDarkerImage(image: pygame.Surface, darkenPercent: float) -> pygame.Surfac
 def drawSurface(surface: pygame.Surface, drawnSurface: pygame.Surface, cx: int, cy: int, angle: float = 0):
     
     if angle != 0:
-        drawnSurface = pygame.transform.rotate(drawnSurface, angle)
+        drawnSurface = getRotatedImage(drawnSurface, angle)
 
     r = drawnSurface.get_rect()
     rect = drawnSurface.get_rect(center = (cx, cy))
@@ -76,7 +201,7 @@ def drawSurface(surface: pygame.Surface, drawnSurface: pygame.Surface, cx: int,
 # align = 0.5 -> align mid
 # align = 1 -> align right/bottom
 def drawText(surface: pygame.Surface, font: pygame.font, string: str, color: tuple, x: int, y: int, alignX: float = 0.5, alignY: float = 0.5):
-    text = font.render(string, True, color)
+    text = getTextSurface(font, string, color)
     x -= text.get_width()*alignX
     y -= text.get_height()*alignY
     surface.blit(text, (x,y))
@@ -88,9 +213,9 @@ def drawTextRotate(surface: pygame.Surface, font: pygame.font, string: str, colo
     if theta > 90 and theta < 270:
         theta -= 180
         theta %= 360
+    theta = round(theta / TEXT_ANGLE_STEP) * TEXT_ANGLE_STEP % 360
     
-    text = font.render(string, True, color)
-    text = pygame.transform.rotate(text, theta)
+    text = getTextSurface(font, string, color, theta)
 
     dx = 0.5 * math.cos(theta * 3.1415 / 180)
     dy = math.cos(theta * 3.1415 / 180) * 1.2
@@ -123,9 +248,14 @@ def drawCircle(screen: pygame.Surface, x: int, y: int, color: tuple, radius: int
         pygame.gfxdraw.aacircle(screen, x, y, radius, color)
         pygame.draw.circle(screen, color, (x,y), radius, width)
     else:
-        surface = pygame.Surface([radius*2, radius*2], pygame.SRCALPHA)
-        pygame.gfxdraw.aacircle(surface, radius, radius, radius, (*color, alpha))
-        pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius, width)
+        def render():
+            countAllocation()
+            surface = pygame.Surface([radius*2, radius*2], pygame.SRCALPHA)
+            pygame.gfxdraw.aacircle(surface, radius, radius, radius, (*color, alpha))
+            pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius, width)
+            return surface
+
+        surface = spriteCache.get(("circle", radius, width, tuple(color), alpha), render)
         screen.blit(surface, (x - radius, y - radius))
 
 def drawTriangle(screen, color,  x1, y1, x2, y2, x3, y3):
@@ -190,12 +320,47 @@ def drawLine(screen: pygame.Surface, color: tuple, x1: int, y1: int, x2: int, y2
         pygame.gfxdraw.aapolygon(screen, (UL, UR, BR, BL), color)
         pygame.gfxdraw.filled_polygon(screen, (UL, UR, BR, BL), color)
     else:
-        surface = pygame.Surface([dx, dy], pygame.SRCALPHA)
+        surface = getScratchSurface(dx, dy)
         
         pygame.gfxdraw.aapolygon(surface, (UL, UR, BR, BL), (*color, alpha))
         pygame.gfxdraw.filled_polygon(surface, (UL, UR, BR, BL), (*color, alpha))
 
-        screen.blit(surface, (mx, my))
+        screen.blit(surface, (mx, my), (0, 0, dx, dy))
+
+# Outlines of thick lines from starts[i] to ends[i] ((N,2) arrays of screen points), as an (N,4,2) array. Each outline
+# is the same (UL, UR, BR, BL) polygon that drawLine() draws
+def getThickLineQuads(starts: np.ndarray, ends: np.ndarray, thickness: int) -> np.ndarray:
+
+    thickness = round(thickness)
+
+    centers = (starts + ends) / 2
+    halfLengths = np.hypot(*(starts - ends).T) / 2
+    angles = np.arctan2(starts[:,1] - ends[:,1], starts[:,0] - ends[:,0])
+    cos, sin = np.cos(angles), np.sin(angles)
+
+    along = np.column_stack((halfLengths * cos, halfLengths * sin)) # half the line, from its center to its start
+    across = np.column_stack((-(thickness/2.) * sin, (thickness/2.) * cos)) # half the thickness, perpendicular to it
+
+    return np.stack((centers + along + across, centers - along + across, centers - along - across, centers + along - across), axis = 1)
+
+# Draw filled antialiased polygons, like the outlines from getThickLineQuads(), each with its own color
+def drawPolygons(screen: pygame.Surface, polygons: list, colors: list):
+    for points, color in zip(polygons, colors):
+        pygame.gfxdraw.aapolygon(screen, points, color)
+        pygame.gfxdraw.filled_polygon(screen, points, color)
+
+# A filled antialiased circle centered at (radius, radius) of a (2 * radius + 1) square surface, from spriteCache.
+# Drawing many of these with screen.blits() is faster than drawing each with drawCircle()
+def getDotSprite(color: tuple, radius: int) -> pygame.Surface:
+
+    def render():
+        countAllocation()
+        surface = pygame.Surface([radius*2 + 1, radius*2 + 1], pygame.SRCALPHA)
+        pygame.gfxdraw.aacircle(surface, radius, radius, radius, color)
+        pygame.draw.circle(surface, color, (radius, radius), radius)
+        return surface
+
+    return spriteCache.get(("dot", radius, tuple(color)), render)
 
 # Draw guideline at (x,y) at angle theta, bounded by the field screen
 def drawGuideLine(screen: pygame.Surface, color: tuple, x: int, y: int, theta: float):
@@ -207,6 +372,23 @@ def drawGuideLine(screen: pygame.Surface, color: tuple, x: int, y: int, theta: f
 
     drawThinLine(screen, color, x1, y1, x2, y2)
 
+# Screen bounding box (x1, y1, x2, y2) of the line drawn by drawGuideLine(), clipped to the field
+def getGuideLineBounds(x: int, y: int, theta: float) -> tuple:
+    x1 = x + math.cos(theta) * Utility.SCREEN_SIZE
+    y1 = y - math.sin(theta) * Utility.SCREEN_SIZE
+    return getLineBounds(max(0, min(x, x1)), max(0, min(y, y1)), min(Utility.SCREEN_SIZE, max(x, x1)), min(Utility.SCREEN_SIZE, max(y, y1)), 2)
+
+# Bounding box (x1, y1, x2, y2) of a line between two points, grown by margin on every side
+def getLineBounds(x1: float, y1: float, x2: float, y2: float, margin: float) -> tuple:
+    return min(x1, x2) - margin, min(y1, y2) - margin, max(x1, x2) + margin, max(y1, y2) + margin
+
+# Smallest bounding box containing all the given boxes. None boxes are skipped
+def unionBounds(*bounds: tuple) -> tuple:
+    bounds = [b for b in bounds if b is not None]
+    if len(bounds) == 0:
+        return None
+    return min(b[0] for b in bounds), min(b[1] for b in bounds), max(b[2] for b in bounds), max(b[3] for b in bounds)
+
 def drawVector(screen: pygame.Surface, color: tuple, x1: int, y1: int, x2: int, y2: int, thickness: int, a = 1.6):
 
     heading = Utility.thetaTwoPoints((x1,y1), (x2,y2))
@@ -246,27 +428,78 @@ def _aa_render_region(image, rect: pygame.Rect, color, rad):
     image.fill(color, rect.inflate(-2*rad,0))
     image.fill(color, rect.inflate(0,-2*rad))
 
-# manually draw an arc through linear approximation
+# Maximum distance in pixels between a tessellated arc and the true circle
+ARC_TOLERANCE = 0.25
+MAX_ARC_SEGMENTS = 500
+
+# Number of line segments needed for an arc of the given on-screen radius (in pixels) and sweep (in radians)
+# so that the polyline strays at most ARC_TOLERANCE pixels from the circle
+def getArcSegmentCount(screenRadius: float, sweep: float) -> int:
+
+    if screenRadius <= ARC_TOLERANCE:
+        return 1
+
+    maxStep = 2 * math.acos(1 - ARC_TOLERANCE / screenRadius) # angle of a chord whose sagitta is ARC_TOLERANCE
+    return int(Utility.clamp(math.ceil(abs(sweep) / maxStep), 1, MAX_ARC_SEGMENTS))
+
+# Return an (N,2) array of screen points approximating an arc with line segments
 # parity is the modular direction from theta1 -> theta2
-def drawArc(screen: pygame.Surface, color: tuple, center: tuple, radius: float, theta1: float, theta2: float, parity: bool, thickness: int = 1, alpha: int = 255):
+def getArcPoints(center: tuple, radius: float, theta1: float, theta2: float, parity: bool) -> np.ndarray:
 
     dt = Utility.deltaInHeadingParity(theta2, theta1, parity)
+    numberLines = getArcSegmentCount(radius, dt)
+
+    thetas = theta1 + dt * np.arange(numberLines + 1) / numberLines
+    return np.column_stack((center[0] + radius * np.cos(thetas), center[1] - radius * np.sin(thetas)))
 
-    K = 1 # constant for how many lines to draw (the more the smoother)
-    numberLines = min(500, int(K * abs(dt*radius)))
+# Draw a thick polyline through an (N,2) array of points as a single polygon
+# Joints are mitered, which is meant for smooth curves like tessellated arcs rather than sharp corners
+def drawPolyline(screen: pygame.Surface, color: tuple, points: np.ndarray, thickness: int = 1, alpha: int = 255):
 
-    x1, y1 = center[0] + radius * math.cos(theta1), center[1] - radius * math.sin(theta1)
-    for i in range(1, numberLines+1):
-        t2 = theta1 + dt * (i) / numberLines
-        x2, y2 = center[0] + radius * math.cos(t2), center[1] - radius * math.sin(t2)
+    if len(points) < 2:
+        return
 
-        drawLine(screen, color, x1, y1, x2, y2, thickness, alpha)
+    # unit normal of each segment
+    segments = np.diff(points, axis = 0)
+    lengths = np.hypot(segments[:,0], segments[:,1])
+    lengths[lengths == 0] = 1
+    normals = np.column_stack((-segments[:,1], segments[:,0])) / lengths[:,None]
 
-        x1 = x2
-        y1 = y2
+    # each vertex is offset along the average normal of the segments touching it
+    vertexNormals = np.empty_like(points)
+    vertexNormals[0] = normals[0]
+    vertexNormals[-1] = normals[-1]
+    vertexNormals[1:-1] = (normals[:-1] + normals[1:]) / 2
+    offsets = vertexNormals * (round(thickness) / 2)
+
+    outline = np.concatenate((points + offsets, (points - offsets)[::-1]))
+
+    if alpha == 255:
+        outline = outline.tolist()
+        pygame.gfxdraw.aapolygon(screen, outline, color)
+        pygame.gfxdraw.filled_polygon(screen, outline, color)
+    else:
+        mx, my = np.floor(outline.min(axis = 0))
+        width, height = np.ceil(outline.max(axis = 0) - (mx, my)) + 1
+        outline = (outline - (mx, my)).tolist()
+
+        surface = getScratchSurface(width, height)
+        pygame.gfxdraw.aapolygon(surface, outline, (*color, alpha))
+        pygame.gfxdraw.filled_polygon(surface, outline, (*color, alpha))
+        screen.blit(surface, (mx, my), (0, 0, width, height))
+
+# manually draw an arc through linear approximation
+# parity is the modular direction from theta1 -> theta2
+def drawArc(screen: pygame.Surface, color: tuple, center: tuple, radius: float, theta1: float, theta2: float, parity: bool, thickness: int = 1, alpha: int = 255):
+    drawPolyline(screen, color, getArcPoints(center, radius, theta1, theta2, parity), thickness, alpha)
 
 def drawTransparentRectangle(screen: pygame.Surface, color, alpha, x, y, width, height):
-    s = pygame.Surface((width,height))  # the size of your rect
-    s.set_alpha(alpha)                # alpha level
-    s.fill(color)           # this fills the entire surface
-    screen.blit(s, (x,y)) 
\ No newline at end of file
+
+    def render():
+        countAllocation()
+        s = pygame.Surface((width,height))  # the size of your rect
+        s.set_alpha(alpha)                # alpha level
+        s.fill(color)           # this fills the entire surface
+        return s
+
+    screen.blit(spriteCache.get(("rectangle", int(width), int(height), tuple(color), alpha), render), (x,y)) 
\ No newline at end of file
@@ -1,3 +1,6 @@
+import StartupReport # first, so that it can time all the other imports
+StartupReport.trackImports()
+
 import pygame, sys, os, os.path
 from SingletonState.FieldTransform import FieldTransform
 from SingletonState.ReferenceFrame import PointRef
@@ -5,12 +8,14 @@ import SingletonState.ReferenceFrame as ReferenceFrame
 from SingletonState.SoftwareState import SoftwareState, Mode
 from SingletonState.UserInput import UserInput
 from VisibleElements.FieldSurface import FieldSurface
+from VisibleElements.DirtyRects import DirtyRects
+from VisibleElements.Layer import Layer
 from MouseInteraction import *
 from MouseInterfaces.TooltipOwner import TooltipOwner
 from RobotImage import RobotImage
 
 from Commands.Program import Program
-from Commands.Edge import Edge
+from Commands.Edge import Edge, StraightEdge, HeadingPoint, ControlPoint
 from Commands.Command import *
 
 import Commands.Node as Node
@@ -28,8 +33,9 @@ import Commands.Between
 from MouseSelector.MouseSelector import MouseSelector
 
 import Utility, colors, math, time
-from typing import Iterator
-import graphics, Arc
+from typing import Iterator, Tuple
+import graphics, Arc, Profiler
+import Export.TrajectoryTable as TrajectoryTable
 import multiprocessing as mp 
 
 if __name__ == '__main__':
@@ -54,6 +60,12 @@ if __name__ == '__main__':
     program: Program = Program(state)
     mouseSelector: MouseSelector = MouseSelector(state, program)
     robotImage: RobotImage = RobotImage(fieldTransform)
+    dirtyRects: DirtyRects = DirtyRects()
+
+    # Cached layers of the screen, composited every frame
+    fieldLayer: Layer = Layer(pygame.Rect(0, 0, Utility.SCREEN_SIZE, Utility.SCREEN_SIZE))
+    pathLayer: Layer = Layer(pygame.Rect(0, 0, Utility.SCREEN_SIZE, Utility.SCREEN_SIZE))
+    panelLayer: Layer = Layer(pygame.Rect(Utility.SCREEN_SIZE, 0, Utility.PANEL_WIDTH, Utility.SCREEN_SIZE))
 
     odomButton: OdomButton = OdomButton(program)
     textButton: TextButton = TextButton(state)
@@ -99,39 +111,63 @@ def main():
     AUTOSAVE_SECONDS = 60
     lastSave = time.time()
 
+    clock = pygame.time.Clock()
+    isFirstFrame = True
+
     while True:
 
+        # When nothing on the screen moves by itself, block until there is input instead of spinning.
+        # Wake up in time for the next autosave
+        isAnimating = state.mode == Mode.PLAYBACK or program.getScroller().isMoving() or fieldSurface.isRefinePending()
+        if isAnimating:
+            waitMilliseconds = 0
+        else:
+            untilAutosave = AUTOSAVE_SECONDS - (time.time() - lastSave)
+            waitMilliseconds = int(Utility.clamp(untilAutosave * 1000, 1, Utility.IDLE_WAIT_MS))
+
+        userInput.getUserInput(waitMilliseconds)
+
         if time.time() - lastSave > AUTOSAVE_SECONDS:
             program.autosave()
             lastSave = time.time()
-        
-        userInput.getUserInput()
+
         if userInput.isQuit:
 
             program.generateSavefile() # save before quit
 
             pygame.quit()
             sys.exit()
+
+        # Nothing could have changed without input or animation, so skip finding hovered objects and drawing
+        if not isAnimating and not userInput.isAnyInput and not isFirstFrame:
+            continue
+        isFirstFrame = False
+        Profiler.beginFrame()
         
         # Handle zooming with mousewheel
         modified = handleMousewheel(fieldSurface, fieldTransform, userInput, program)
         
         # Find the hovered object out of all the possible hoverable objects
-        handleHoverables(state, userInput, getHoverables())
+        with Profiler.scope("handleHoverables"):
+            handleHoverables(state, userInput, getHoverables())
         
         # Now that the hovered object is computed, handle what object is being dragged and then actually dragging the object
-        handleDragging(userInput, state, fieldSurface)
+        with Profiler.scope("handleDragging"):
+            handleDragging(userInput, state, fieldSurface)
 
         # If the X key is pressed, delete hovered PathPoint/segment
         handleDeleting(userInput, state, program)
 
+        # If the B key is pressed, switch the hovered edge between an arc and a bezier curve
+        handleBezierToggling(userInput, state, program)
+
         handleCommandCommenting(userInput, state, program)
 
         # Handle dragging .pg3 file into program to load
         handleLoadedFile(program, userInput.loadedFile)
 
         shadowPos, shadowHeading = handleHoverPath(userInput, state, program)
-        segmentShadow = handleHoverPathAdd(userInput, state, program)
+        segmentShadow = handleHoverPathAdd(userInput, state, program, fieldSurface)
 
 
         # Handle all field left click functionality
@@ -143,29 +179,141 @@ def main():
         if userInput.isKeyPressed(pygame.K_p):
             print(program.code)
 
+        # Export the path as a precomputed trajectory table
+        if userInput.isKeyPressed(pygame.K_t):
+            TrajectoryTable.saveTrajectoryHeader(program)
+
+        # Toggle the frame profiler overlay (F3) and timing log (F4)
+        Profiler.handleKeys(userInput)
+
+        # Smoothscale the field again once zooming stops
+        fieldSurface.update()
+
+        # Render the code view if the code changed, or show code rendered in the background
+        program.codeView.update(state.isCode)
+
         # Draw everything on the screen
-        drawEverything(shadowPos, shadowHeading, segmentShadow)
+        with Profiler.scope("drawEverything"):
+            drawEverything(shadowPos, shadowHeading, segmentShadow)
+        graphics.endFrame()
+        Profiler.endFrame()
 
-                
+        # Print how long it took to show the first frame
+        StartupReport.finish()
 
-# Draw the vex field, full path, and panel
-def drawEverything(shadowPos: PointRef, shadowHeading: float, segmentShadow: PointRef) -> None:
-    
-    # Draw the vex field
-    fieldSurface.draw(screen)
+        # Cap the frame rate while dragging or animating
+        clock.tick(Utility.MAX_FPS)
 
-    if isinstance(state.objectHovering, Edge) or isinstance(state.objectHovering, Node.Node):
-        state.objectHovering.drawHovered(screen)
+                
 
-    # Draw path specified by commands
-    program.drawPath(screen, state)
+# Screen bounding box of every edge and node of the path
+def getPathDrawBounds() -> dict:
+
+    bounds = {program.first: program.first.getDrawBounds()}
+    edge = program.first.next
+    while edge is not None:
+        bounds[edge] = edge.getDrawBounds()
+        bounds[edge.next] = edge.next.getDrawBounds()
+        edge = edge.next.next
+    return bounds
+
+# Screen bounding boxes of the hovered object and everything highlighted along with it
+def getHoverFootprint(hoverable: Hoverable) -> list[tuple]:
+
+    if hoverable is None:
+        return []
+
+    objects = [hoverable]
+    i = 0
+    while i < len(objects):
+        for linked in objects[i].getLinkedHoverables():
+            if not any(linked is obj for obj in objects):
+                objects.append(linked)
+        i += 1
+
+    return [obj.getDrawBounds() for obj in objects]
+
+# Mark the parts of the screen that look different from last frame
+def findDirtyRects(shadowPos: PointRef, segmentShadow: Tuple[PointRef, Edge]) -> None:
+
+    dirtyRects.clear()
+
+    # Clicks, key presses, the mousewheel, panning, zooming and changing modes can change anything on the screen
+    if userInput.isAnyEvent or dirtyRects.hasChanged("screen", (fieldTransform.version, fieldSurface.version, state.mode, state.isCode, state.showRobot, state.useOdom)):
+        dirtyRects.invalidateAll()
+
+    # The simulated robot and the previews of new segments move every frame and span the whole field
+    isAddingShadow = state.mode != Mode.MOUSE_SELECT and state.objectHovering is fieldSurface
+    if state.mode == Mode.PLAYBACK or isAddingShadow or dirtyRects.hasChanged("addingShadow", isAddingShadow):
+        dirtyRects.invalidateAll()
+
+    # The panel changes whenever the commands are recomputed, which includes every change to the path
+    if dirtyRects.hasChanged("commands", (program.commandsVersion, program.hoveredBetween, program.codeView.version)):
+        dirtyRects.add((Utility.SCREEN_SIZE, 0, Utility.SCREEN_SIZE + Utility.PANEL_WIDTH, Utility.SCREEN_SIZE))
+
+    # Edges and nodes that moved since last frame, like a dragged node and its neighbors. Nodes next to a changed
+    # edge are redrawn too, since their turn direction depends on it
+    if dirtyRects.hasChanged("pathVersion", (program.pathVersion, fieldTransform.version)):
+        bounds = getPathDrawBounds()
+        previous = dirtyRects.previous.get("pathBounds")
+        dirtyRects.previous["pathBounds"] = bounds
+
+        # Dragging a heading point or control point can reshape its edge without changing the edge's bounds
+        reshaped = state.objectDragged.edge if isinstance(state.objectDragged, (HeadingPoint, ControlPoint)) else None
+
+        if previous is None or previous.keys() != bounds.keys():
+            dirtyRects.invalidateAll()
+        else:
+            for element in bounds:
+                if bounds[element] != previous[element] or element is reshaped:
+                    neighbors = [element.previous, element.next] if isinstance(element, Edge) else []
+                    for changed in [element] + neighbors:
+                        dirtyRects.add(previous[changed])
+                        dirtyRects.add(bounds[changed])
+
+    # The hovered object and everything highlighted with it, both this frame and last frame.
+    # Tooltip owners can change with every mouse movement, like which option of a toggle is hovered
+    key = (state.objectHovering, userInput.mousePosition.screenRef if isinstance(state.objectHovering, TooltipOwner) else None)
+    dirtyRects.addIfChanged("hover", getHoverFootprint(state.objectHovering), key)
+
+    # The robot shadow along the path, and the preview of a node inserted into a segment
+    shadows = []
+    if shadowPos is not None and state.showRobot:
+        shadows.append(robotImage.getDrawBounds(shadowPos))
+    if segmentShadow[0] is not None:
+        x, y = segmentShadow[0].screenRef
+        shadows.append((x - 5, y - 5, x + 5, y + 5))
+    dirtyRects.addIfChanged("shadows", shadows)
+
+    # The profiler overlay changes every frame, so keep redrawing it while it is shown
+    if dirtyRects.previous.get("profiler") is not None:
+        dirtyRects.add(dirtyRects.previous["profiler"])
+
+    # The tooltip is drawn again on top of anything redrawn, so erase it from where it was last frame
+    if not dirtyRects.isEmpty() and dirtyRects.previous.get("tooltip") is not None:
+        dirtyRects.add(dirtyRects.previous["tooltip"])
+
+# Draw the vex field, full path, and panel. Only the dirty parts of the screen are drawn and updated
+def drawEverything(shadowPos: PointRef, shadowHeading: float, segmentShadow: Tuple[PointRef, Edge]) -> None:
+
+    with Profiler.scope("findDirtyRects"):
+        findDirtyRects(shadowPos, segmentShadow)
+    if dirtyRects.isEmpty():
+        return
+
+    screen.set_clip(dirtyRects.getClip())
+    
+    # Draw the vex field and the path on top of it
+    with Profiler.scope("drawPathLayer"):
+        drawPathLayer()
+        pathLayer.draw(screen)
 
     # Draw robot if mouse is hovering over point or line
     if shadowPos is not None and state.showRobot:
         robotImage.draw(screen, shadowPos, shadowHeading)
 
-    if segmentShadow is not None:
-        graphics.drawCircle(screen, *segmentShadow.screenRef, colors.BLACK, 4)
+    if segmentShadow[0] is not None:
+        graphics.drawCircle(screen, *segmentShadow[0].screenRef, colors.BLACK, 4)
 
     drawShadow()
 
@@ -182,18 +330,65 @@ def drawEverything(shadowPos: PointRef, shadowHeading: float, segmentShadow: Poi
     robotButton.draw(screen)
     resetButton.draw(screen)
 
-    # Draw panel background
-    border = 5
-    pygame.draw.rect(screen, colors.PANEL_GREY, [Utility.SCREEN_SIZE + border, 0, Utility.PANEL_WIDTH - border, Utility.SCREEN_SIZE])
-    pygame.draw.rect(screen, colors.BORDER_GREY, [Utility.SCREEN_SIZE, 0, border, Utility.SCREEN_SIZE])
+    # Draw the panel with the commands
+    with Profiler.scope("drawPanelLayer"):
+        drawPanelLayer()
+        panelLayer.draw(screen)
 
-    program.drawCommands(screen)
+    screen.set_clip(None)
+    rects = list(dirtyRects.getRects())
 
-    # Draw a tooltip if there is one
+    # Draw a tooltip if there is one. It follows the mouse, so it is drawn wherever it ends up and erased next frame
+    tooltipRect = None
     if state.objectHovering is not None and isinstance(state.objectHovering, TooltipOwner):
-        state.objectHovering.drawTooltip(screen, userInput.mousePosition.screenRef)
+        tooltipRect = state.objectHovering.drawTooltip(screen, userInput.mousePosition.screenRef)
+        rects.append(tooltipRect)
+    dirtyRects.previous["tooltip"] = tooltipRect
+
+    # Draw the profiler overlay on top of everything
+    profilerRect = None
+    if Profiler.isShown:
+        profilerRect = Profiler.draw(screen)
+        rects.append(profilerRect)
+    dirtyRects.previous["profiler"] = profilerRect
         
-    pygame.display.update()
+    with Profiler.scope("display.update"):
+        pygame.display.update(rects)
+
+# Redraw the field layer if the field was panned or zoomed, and the path layer if either the field layer, the path, or
+# what is hovered changed. The path layer starts as a copy of the field layer, so they are stacked without any alpha
+def drawPathLayer():
+
+    if not fieldLayer.isValid((fieldTransform.version, fieldSurface.version)):
+        fieldSurface.draw(fieldLayer.begin((fieldTransform.version, fieldSurface.version)))
+
+    key = (fieldLayer.key, program.pathVersion, state.mode, state.objectHovering)
+    if pathLayer.isValid(key):
+        return
+    surface = pathLayer.begin(key)
+    fieldLayer.draw(surface)
+
+    if isinstance(state.objectHovering, Edge) or isinstance(state.objectHovering, Node.Node):
+        state.objectHovering.drawHovered(surface)
+
+    # Draw path specified by commands
+    program.drawPath(surface, state)
+
+# Redraw the panel layer if the commands, their scroll position, the view or what is hovered changed
+def drawPanelLayer():
+
+    hoveringOption = state.objectHovering.hoveringOption if isinstance(state.objectHovering, CommandToggle) else None
+    key = (program.commandsVersion, program.scroller.version, program.codeView.version, state.isCode, state.mode, state.objectHovering, hoveringOption, program.hoveredBetween)
+    if panelLayer.isValid(key):
+        return
+    surface = panelLayer.begin(key)
+
+    # Draw panel background
+    border = 5
+    pygame.draw.rect(surface, colors.PANEL_GREY, [Utility.SCREEN_SIZE + border, 0, Utility.PANEL_WIDTH - border, Utility.SCREEN_SIZE])
+    pygame.draw.rect(surface, colors.BORDER_GREY, [Utility.SCREEN_SIZE, 0, border, Utility.SCREEN_SIZE])
+
+    program.drawCommands(surface)
 
 def drawShadowSegment(fro: PointRef, to: PointRef):
     theta = Utility.thetaTwoPoints(fro.screenRef, to.screenRef)
@@ -264,13 +459,15 @@ def getHoverables() -> Iterator[Hoverable]:
         yield resetButton
 
         if not state.mode == Mode.PLAYBACK:
-            for hoverable in program.getHoverablesPath(state):
+            for hoverable in program.getHoverablesPathAt(state, userInput.mousePosition):
                 yield hoverable
 
         yield fieldSurface
     
     else:
-        if not state.isCode:
+        if state.isCode:
+            yield program.codeView.scroller
+        else:
             yield program.scroller
             for command in program.getHoverablesCommands():
                 for hoverable in command.getHoverables():
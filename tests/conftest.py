@@ -0,0 +1,11 @@
+import os, sys
+
+# The modules live at the top of the repository and are imported by name, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from SingletonState.FieldTransform import FieldTransform
+import SingletonState.ReferenceFrame as ReferenceFrame
+
+# PointRef needs a field transform, even for field coordinates
+ReferenceFrame.initFieldTransform(FieldTransform())
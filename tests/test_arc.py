@@ -0,0 +1,109 @@
+from SingletonState.ReferenceFrame import PointRef, Ref
+from Arc import Arc, computeArcs, arcLengthAndHeading, TWO_PI
+import Utility, math, pytest
+import numpy as np
+
+"""
+Compares the batch kernel computeArcs() and the scalar arcLengthAndHeading() against Arc.set(), which they replace on
+hot paths and must stay consistent with.
+"""
+
+TOLERANCE = 1e-6
+
+def angleClose(a: float, b: float) -> bool:
+    return abs(Utility.deltaInHeading(a, b)) < TOLERANCE
+
+def straightHeading(fro: tuple, to: tuple) -> float:
+    return Utility.thetaTwoPoints(fro, to)
+
+# Assert that entry i of the batch, and the scalar kernel, match the Arc built from the same (fro, to, heading1)
+def assertMatchesArc(arcs, i: int, fro: tuple, to: tuple, heading1: float):
+
+    arc = Arc(PointRef(Ref.FIELD, fro), PointRef(Ref.FIELD, to), heading1)
+
+    assert bool(arcs.isStraight[i]) == arc.isStraight
+    assert math.isclose(arcs.arcLength[i], arc.arcLengthField, rel_tol = TOLERANCE, abs_tol = TOLERANCE)
+    assert angleClose(arcs.heading2[i], arc.heading2)
+
+    length, heading2 = arcLengthAndHeading(*fro, *to, heading1)
+    assert math.isclose(length, arc.arcLengthField, rel_tol = TOLERANCE, abs_tol = TOLERANCE)
+    assert angleClose(heading2, arc.heading2)
+
+    if arc.isStraight:
+        assert np.isnan(arcs.radius[i]) and not arcs.parity[i]
+    else:
+        assert math.isclose(arcs.centerX[i], arc.center.fieldRef[0], rel_tol = TOLERANCE, abs_tol = TOLERANCE)
+        assert math.isclose(arcs.centerY[i], arc.center.fieldRef[1], rel_tol = TOLERANCE, abs_tol = TOLERANCE)
+        assert math.isclose(arcs.radius[i], arc.radius.fieldRef, rel_tol = TOLERANCE)
+        assert angleClose(arcs.theta1[i], arc.theta1)
+        assert angleClose(arcs.theta2[i], arc.theta2)
+        assert bool(arcs.parity[i]) == arc.parity
+
+    return arc
+
+# Check every (fro, to, heading1) in one batch, and return the Arcs
+def checkAll(fro: list, to: list, heading1: list) -> list[Arc]:
+    arcs = computeArcs(fro, to, heading1)
+    assert len(arcs) == len(heading1)
+    return [assertMatchesArc(arcs, i, tuple(map(float, fro[i])), tuple(map(float, to[i])), float(heading1[i])) for i in range(len(arcs))]
+
+@pytest.mark.parametrize("seed", range(5))
+def testRandomArcs(seed):
+    rng = np.random.default_rng(seed)
+    N = 500
+    fro = rng.uniform(0, 144, (N, 2))
+    to = rng.uniform(0, 144, (N, 2))
+    heading1 = rng.uniform(0, TWO_PI, N)
+    checkAll(fro, to, heading1)
+
+def testStraightArcs():
+    fro = [(0, 0), (10, 10), (50, 20), (20, 20), (70, 90)]
+    to = [(30, 0), (40, 40), (10, 20), (20, 100), (70, 10)]
+    heading1 = [straightHeading(a, b) for a, b in zip(fro, to)]
+    arcs = checkAll(fro, to, heading1)
+    assert all(arc.isStraight for arc in arcs)
+
+# Headings a tiny amount off the straight heading give huge but finite circles, which the kernels must still match
+@pytest.mark.parametrize("offset", [1e-6, -1e-6, 1e-4, -1e-4, 1e-2, -1e-2])
+def testNearlyStraightArcs(offset):
+    fro = [(0, 0), (10, 10), (50, 20), (20, 20), (144, 0)]
+    to = [(30, 0), (40, 40), (10, 20), (20, 100), (0, 144)]
+    heading1 = [(straightHeading(a, b) + offset) % TWO_PI for a, b in zip(fro, to)]
+    arcs = checkAll(fro, to, heading1)
+    assert not any(arc.isStraight for arc in arcs)
+
+# Turning to either side of the chord flips the parity, including headings that wrap around 0 and that point away from
+# the end so the arc sweeps almost all the way around
+def testParityFlips():
+    fro, to = [], []
+    heading1 = []
+    for chord in [(40, 0), (40, -1e-3), (0, 40), (-40, 0), (30, -30)]:
+        straight = straightHeading((0, 0), chord)
+        for offset in [0.3, -0.3, 1.5, -1.5, 3.1415 - 0.01, -(3.1415 - 0.01)]:
+            fro.append((0, 0))
+            to.append(chord)
+            heading1.append((straight + offset) % TWO_PI)
+
+    arcs = checkAll(fro, to, heading1)
+    parities = {arc.parity for arc in arcs}
+    assert parities == {True, False}
+
+    # the arc a heading just off pointing away from the end takes is much longer than the chord
+    for arc in arcs:
+        if abs(Utility.deltaInHeading(arc.heading1, straightHeading(arc.fro.fieldRef, arc.to.fieldRef))) > 3:
+            assert arc.arcLengthField > 3 * Utility.distanceTuples(arc.fro.fieldRef, arc.to.fieldRef)
+
+# An edge between two nodes at the same position has no circle through it, so it is straight with length 0
+@pytest.mark.parametrize("heading1", [0, 1, 3.1415, 5])
+def testZeroLengthArcs(heading1):
+    arcs = checkAll([(20, 30)], [(20, 30)], [heading1])
+    assert arcs[0].isStraight and arcs[0].arcLengthField == 0 and arcs[0].heading2 == heading1
+    assert arcLengthAndHeading(20, 30, 20, 30, heading1) == (0, heading1)
+
+def testBatchOfMixedArcs():
+    fro = [(0, 0), (5, 5), (0, 0), (10, 0)]
+    to = [(30, 0), (5, 5), (30, 10), (0, 10)]
+    heading1 = [0, 2, 1, straightHeading((10, 0), (0, 10))]
+    arcs = computeArcs(fro, to, heading1)
+    assert list(arcs.isStraight) == [True, True, False, True]
+    checkAll(fro, to, heading1)